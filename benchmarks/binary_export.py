@@ -0,0 +1,111 @@
+"""
+Compare les formats de sortie du mode batch pour un grand nombre de chaînes synthétiques (des profils précalculés sont
+réutilisés, seule l'écriture est mesurée): durée et pic de mémoire de l'écriture (tracemalloc, mesuré lors d'une
+seconde écriture), taille des fichiers, puis durée d'accès aux scores d'une chaîne (ouverture comprise) pour les
+formats columnar et binary.
+
+Utilisation (depuis la racine du projet):
+    python -m benchmarks.binary_export [--chains 100000] [--length 300] [--formats columnar binary jsonl]
+"""
+
+import argparse
+import glob
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from scripts.batch import WRITERS
+from scripts.export import BinaryExport
+from scripts.parallel import ChainProfile
+from scripts.profile_generation import HydrophobicityProfile
+
+# nombre de profils distincts réutilisés pour produire les chaînes
+DISTINCT_PROFILES = 100
+
+
+def synthetic_profiles(length: int, seed: int = 0) -> list:
+    """
+    Retourne DISTINCT_PROFILES profils synthétiques d'environ length scores, avec quelques pics.
+    """
+    rng = np.random.default_rng(seed)
+    profiles = []
+    for _ in range(DISTINCT_PROFILES):
+        scores = rng.normal(0, 1, rng.integers(length // 2, length * 3 // 2))
+        picks = [(int(start), 12, 0.5, 2.0) for start in rng.integers(4, len(scores), 3)]
+        profiles.append(HydrophobicityProfile.from_arrays(scores, 4, len(scores) + 8, float(scores.min()),
+                                                          float(scores.max()), picks))
+    return profiles
+
+
+def chains(count: int, profiles: list):
+    """
+    Génère count ChainProfile (entry, chain) en réutilisant les profils synthétiques.
+    """
+    for i in range(count):
+        entry, chain = f"{i // 4:05d}", "ABCD"[i % 4]
+        yield entry, chain, ChainProfile(f"{entry}.pdb", entry, chain, profiles[i % len(profiles)])
+
+
+def write(format_name: str, output: str, count: int, profiles: list) -> tuple:
+    """
+    Écrit count chaînes au format format_name et retourne la durée (s) et le pic de mémoire (octets).
+    """
+    def run():
+        writer = WRITERS[format_name](output)
+        for entry, chain, profile in chains(count, profiles):
+            writer.write(entry, chain, profile)
+        writer.close()
+
+    start = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def read_columnar(output: str, entry: str, chain: str) -> np.ndarray:
+    columns = np.load(f"{output}.npz")
+    mask = (columns['profiles_entry'] == entry) & (columns['profiles_chain'] == chain)
+    return columns['profiles_score'][mask]
+
+
+def read_binary(output: str, entry: str, chain: str) -> np.ndarray:
+    return np.array(BinaryExport(output).chain_scores(entry, chain))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--chains', type=int, default=100000)
+    parser.add_argument('--length', type=int, default=300)
+    parser.add_argument('--formats', nargs='+', default=['columnar', 'binary'], choices=sorted(WRITERS))
+    args = parser.parse_args()
+
+    profiles = synthetic_profiles(args.length)
+    entry, chain = f"{(args.chains - 1) // 4:05d}", "ABCD"[(args.chains - 1) % 4]
+    expected = profiles[(args.chains - 1) % len(profiles)].scores
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{'format':<10} {'write (s)':>10} {'peak (MiB)':>11} {'size (MB)':>10} {'read chain (ms)':>16}")
+        for format_name in args.formats:
+            output = os.path.join(directory, format_name)
+            seconds, peak = write(format_name, output, args.chains, profiles)
+            size = sum(os.path.getsize(path) for path in glob.glob(f"{output}*"))
+
+            read = ""
+            reader = {'columnar': read_columnar, 'binary': read_binary}.get(format_name)
+            if reader is not None:
+                start = time.perf_counter()
+                scores = reader(output, entry, chain)
+                read = f"{(time.perf_counter() - start) * 1000:.1f}"
+                assert np.array_equal(scores, expected)
+            print(f"{format_name:<10} {seconds:>10.2f} {peak / 2 ** 20:>11.1f} {size / 1e6:>10.1f} {read:>16}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Compare le débit du mode batch sur un répertoire de fichiers PDB selon leur stockage: fichiers non compressés, fichiers
+compressés avec gzip (.ent.gz) et archives tar.gz regroupant les mêmes entrées. Les fichiers synthétiques contiennent
+des enregistrements ATOM, comme ceux d'un miroir de la PDB: la lecture s'arrêtant au premier enregistrement de
+coordonnées, seul le début de chaque fichier compressé est décompressé.
+
+Utilisation (depuis la racine du projet):
+    python -m benchmarks.compressed_inputs [--entries 200] [--archives 4] [--workers 1 4] [--repeat 3]
+"""
+
+import argparse
+import gzip
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+
+from benchmarks.synthetic import write_pdb
+from scripts.batch import iter_pdb_paths
+from scripts.parallel import profile_files
+
+
+def build_inputs(directory: str, entries: int, archives: int) -> dict:
+    """
+    Écrit les mêmes entrées sous les trois formes et retourne le répertoire de chacune.
+    """
+    inputs = {name: os.path.join(directory, name) for name in ('plain', 'gzip', 'tar.gz')}
+    for path in inputs.values():
+        os.mkdir(path)
+
+    for i in range(entries):
+        plain = os.path.join(inputs['plain'], f"e{i:05d}.ent")
+        write_pdb(plain, chains=2, chain_length=300, atoms_per_residue=8, seed=i)
+        with open(plain, 'rb') as source, gzip.open(os.path.join(inputs['gzip'], f"e{i:05d}.ent.gz"), 'wb') as target:
+            shutil.copyfileobj(source, target)
+
+    names = sorted(os.listdir(inputs['plain']))
+    for a in range(archives):
+        with tarfile.open(os.path.join(inputs['tar.gz'], f"bundle{a}.tar.gz"), 'w:gz') as archive:
+            for name in names[a::archives]:
+                archive.add(os.path.join(inputs['plain'], name), arcname=name)
+    return inputs
+
+
+def run(directory: str, workers: int) -> int:
+    """
+    Calcule les profils de toutes les entrées d'un répertoire et retourne le nombre de chaînes profilées.
+    """
+    return sum(result.error is None
+               for result in profile_files(list(iter_pdb_paths([directory])), 0, 4, 1.0, workers=workers))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entries', type=int, default=200)
+    parser.add_argument('--archives', type=int, default=4)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, os.cpu_count()])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        inputs = build_inputs(directory, args.entries, args.archives)
+        plain_size = sum(os.path.getsize(os.path.join(inputs['plain'], name)) for name in os.listdir(inputs['plain']))
+        print(f"{args.entries} entries, {plain_size / 1e6:.1f} MB uncompressed")
+        print(f"{'input':<8} {'workers':>7} {'time (s)':>9} {'entries/s':>10} {'vs plain':>9}")
+        for workers in sorted(set(args.workers)):
+            reference = None
+            for name, path in inputs.items():
+                best = float('inf')
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    chains = run(path, workers)
+                    best = min(best, time.perf_counter() - start)
+                assert chains == 2 * args.entries, f"{name}: {chains} chains profiled"
+                reference = reference or best
+                print(f"{name:<8} {workers:>7} {best:>9.3f} {args.entries / best:>10.1f} {best / reference:>8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
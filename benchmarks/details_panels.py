@@ -0,0 +1,94 @@
+"""
+Mesure le temps de construction des panneaux de détails (jusqu'au premier affichage) et le nombre de contrôles Flet
+créés, avec les tuiles des pics construites paresseusement, puis après l'ouverture de toutes les tuiles (ce qui
+correspond à l'ancienne construction complète).
+
+Utilisation (depuis la racine du projet):
+    python -m benchmarks.details_panels [--chains 4 16 52] [--chain-length 3000] [--repeat 3]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import flet as ft
+
+from benchmarks.synthetic import write_pdb
+from scripts.interface import FletApp
+from scripts.pdb import PDBFile
+from scripts.profile_generation import HydrophobicityProfile
+
+
+class Expansion:
+    """
+    Événement d'ouverture d'une tuile, tel que transmis par Flet au gestionnaire on_change.
+    """
+
+    def __init__(self, control: ft.ExpansionTile):
+        self.control = control
+        self.data = "true"
+
+
+def count_controls(control) -> int:
+    """
+    Retourne le nombre de contrôles de l'arbre dont control est la racine.
+    """
+    return 1 + sum(count_controls(child) for child in control._get_children())
+
+
+def expand_all(control) -> None:
+    """
+    Ouvre récursivement toutes les tuiles de l'arbre, comme le ferait l'utilisateur.
+    """
+    for child in control._get_children():
+        if isinstance(child, ft.ExpansionTile) and child.on_change is not None:
+            # les tuiles ne sont pas rattachées à une page: la mise à jour est sans effet
+            child.update = lambda: None
+            child.on_change(Expansion(child))
+        expand_all(child)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--chains', type=int, nargs='+', default=[4, 16, 52])
+    parser.add_argument('--chain-length', type=int, default=3000)
+    parser.add_argument('--frame-size', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    app = FletApp.__new__(FletApp)
+    print(f"{'chains':>6} {'picks':>7} {'lazy (ms)':>10} {'controls':>9} {'expanded (ms)':>14} {'controls':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for chains in args.chains:
+            path = os.path.join(directory, f"{chains}.pdb")
+            write_pdb(path, chains=chains, chain_length=args.chain_length, atoms_per_residue=1)
+            pdb_file = PDBFile(path, sequence_only=True)
+            profile_list = [
+                (chain, HydrophobicityProfile(sequence, 0, args.frame_size, 1.0))
+                for chain, sequence in pdb_file.seqres.items()
+            ]
+            picks = sum(len(profile.picks) for _, profile in profile_list)
+
+            def build():
+                return app._build_details_panels(pdb_file, profile_list, "Kyte & Doolittle", args.frame_size, 1.0)
+
+            lazy = expanded = float('inf')
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                panels = build()
+                lazy = min(lazy, time.perf_counter() - start)
+                lazy_controls = count_controls(panels)
+
+                start = time.perf_counter()
+                panels = build()
+                expand_all(panels)
+                expanded = min(expanded, time.perf_counter() - start)
+                expanded_controls = count_controls(panels)
+
+            print(f"{chains:>6} {picks:>7} {lazy * 1000:>10.1f} {lazy_controls:>9} {expanded * 1000:>14.1f} "
+                  f"{expanded_controls:>9}")
+
+
+if __name__ == '__main__':
+    main()
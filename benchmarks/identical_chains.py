@@ -0,0 +1,77 @@
+"""
+Mesure le gain du regroupement des chaînes identiques sur une capside synthétique (toutes les chaînes ont la même
+séquence) par rapport à une structure de même taille dont toutes les chaînes sont différentes, ce qui correspond au coût
+du calcul sans regroupement: temps et pic de mémoire (tracemalloc) du mode batch et de la construction de la vue du
+profil, et nombre de points du graphique.
+
+Utilisation (depuis la racine du projet):
+    python -m benchmarks.identical_chains [--chains 60] [--length 2000] [--repeat 3]
+"""
+
+import argparse
+import os
+import tempfile
+
+from benchmarks.suite import HeadlessPage, measure
+from benchmarks.synthetic import write_pdb
+from scripts.parallel import profile_files
+from scripts.pdb import PDBFile
+from scripts.profile_generation import HydrophobicityProfile, encode_sequence, group_identical_chains
+
+
+def run_batch(path: str) -> int:
+    """
+    Profile toutes les chaînes d'un fichier dans le processus courant et retourne le nombre de chaînes profilées.
+    """
+    return sum(result.error is None for result in profile_files([path], 0, 4, 1.0, workers=1))
+
+
+def run_view(path: str) -> int:
+    """
+    Calcule les profils et construit la vue du profil comme _generate_chains, et retourne le nombre de points du
+    graphique.
+    """
+    from scripts.interface import FletApp, ProfileGeneration
+
+    app = FletApp.__new__(FletApp)
+    app.page = HeadlessPage()
+    generation = ProfileGeneration(path, 0, "Kyte & Doolittle", 4, 1.0)
+    generation.view = app._build_profile_view(generation)
+    generation.pdb_file = PDBFile(path, sequence_only=True)
+    generation.sequences = {chain: encode_sequence(sequence) for chain, sequence in generation.pdb_file.seqres.items()}
+    generation.chain_groups = group_identical_chains(generation.sequences)
+    for chain in generation.chain_groups:
+        app._add_chain(generation, chain, HydrophobicityProfile(generation.sequences[chain], 0, 4, 1.0))
+    app._finish_generation(generation)
+    return sum(len(data.data_points) for data in generation.data_list)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--chains', type=int, default=60)
+    parser.add_argument('--length', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = {}
+        for name, distinct in (('distinct', args.chains), ('identical', 1)):
+            paths[name] = os.path.join(directory, f"{name}.pdb")
+            write_pdb(paths[name], chains=args.chains, chain_length=args.length, atoms_per_residue=1,
+                      distinct=distinct)
+
+        print(f"{args.chains} chains of {args.length} residues")
+        print(f"{'stage':<6} {'chains':<10} {'time (ms)':>10} {'peak (MiB)':>11} {'result':>10}")
+        for stage, function in (('batch', run_batch), ('view', run_view)):
+            reference = None
+            for name, path in paths.items():
+                seconds, peak, result = measure(lambda: function(path), args.repeat)
+                print(f"{stage:<6} {name:<10} {seconds * 1000:>10.2f} {peak / (1024 * 1024):>11.2f} {result:>10}")
+                if reference is not None:
+                    print(f"{'':<6} {'gain':<10} {reference[0] / seconds:>9.1f}x {reference[1] / peak:>10.1f}x")
+                reference = (seconds, peak)
+        print("(result: chains profiled for batch, chart points for view)")
+
+
+if __name__ == '__main__':
+    main()
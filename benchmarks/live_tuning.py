@@ -0,0 +1,50 @@
+"""
+Mesure la latence d'un recalcul depuis les curseurs de paramètres de la vue du profil: nouveau profil à partir de la
+séquence déjà encodée, puis points sous-échantillonnés du graphique (hors envoi au client Flet). L'objectif est de
+rester sous 50 ms pour une chaîne de 5000 acides aminés.
+
+Utilisation (depuis la racine du projet):
+    python -m benchmarks.live_tuning [--lengths 1000 5000 30000] [--repeat 20]
+"""
+
+import argparse
+import time
+
+from benchmarks.synthetic import random_sequence
+from scripts.interface import DEFAULT_CHART_POINTS, build_chart_points
+from scripts.profile_generation import HydrophobicityProfile, encode_sequence
+
+# Objectif de latence (en millisecondes) pour une chaîne de 5000 acides aminés.
+TARGET_MS = 50
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lengths', type=int, nargs='+', default=[1000, 5000, 30000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'length':>7} {'score (ms)':>11} {'points (ms)':>12} {'total (ms)':>11}")
+    for length in args.lengths:
+        codes = encode_sequence(random_sequence(length))
+        score_times, point_times = [], []
+        for i in range(args.repeat):
+            # alterne les paramètres comme le ferait un mouvement des curseurs
+            frame_size, edge_proportion = 2 + i % 15, (i % 11) / 10
+
+            start = time.perf_counter()
+            profile = HydrophobicityProfile(codes, 0, frame_size, edge_proportion)
+            score_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            build_chart_points(profile, max_points=DEFAULT_CHART_POINTS)
+            point_times.append(time.perf_counter() - start)
+
+        score = sorted(score_times)[len(score_times) // 2] * 1000
+        points = sorted(point_times)[len(point_times) // 2] * 1000
+        print(f"{length:>7} {score:>11.2f} {points:>12.2f} {score + points:>11.2f}")
+    print(f"(médianes; objectif: moins de {TARGET_MS} ms pour 5000 acides aminés)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Compare la sélection d'entrées d'un miroir synthétique (fichiers compressés avec gzip) par lecture de chaque fichier
+avec PDBFile et par requête sur l'index SQLite: construction de l'index, mise à jour sans modification, mise à jour
+après modification d'une partie des fichiers, puis requête.
+
+Utilisation (depuis la racine du projet):
+    python -m benchmarks.mirror_index [--entries 1000] [--modified 0.05] [--workers N]
+"""
+
+import argparse
+import gzip
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import write_pdb
+from scripts.batch import iter_pdb_paths
+from scripts.index import MirrorIndex
+from scripts.pdb import PDBFile
+
+# condition de sélection mesurée
+QUERY = "classification LIKE '%MEMBRANE%' AND max_length >= 300 AND date >= '2020-01-01'"
+
+
+def build_mirror(directory: str, entries: int) -> list:
+    """
+    Écrit entries fichiers synthétiques compressés avec gzip et retourne leurs chemins.
+    """
+    source = os.path.join(directory, "source.pdb")
+    paths = []
+    for i in range(entries):
+        write_pdb(source, chains=2 + i % 4, chain_length=150 + 50 * (i % 5), atoms_per_residue=4, seed=i)
+        paths.append(os.path.join(directory, f"e{i:05d}.ent.gz"))
+        with open(source, 'rb') as f, gzip.open(paths[-1], 'wb', compresslevel=1) as target:
+            target.write(f.read())
+    os.remove(source)
+    return paths
+
+
+def scan(paths: list) -> list:
+    """
+    Sélection sans index: lit l'en-tête et les séquences de chaque fichier.
+    """
+    selected = []
+    for path in paths:
+        pdb_file = PDBFile(path, sequence_only=True)
+        if ("MEMBRANE" in pdb_file.header.classification
+                and max(len(sequence) for sequence in pdb_file.seqres.values()) >= 300):
+            selected.append(path)
+    return selected
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entries', type=int, default=1000)
+    parser.add_argument('--modified', type=float, default=0.05)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        mirror = os.path.join(directory, "mirror")
+        os.mkdir(mirror)
+        paths = build_mirror(mirror, args.entries)
+        index = MirrorIndex(os.path.join(directory, "index.sqlite"))
+
+        seconds, selected = timed(scan, paths)
+        print(f"{'scan with PDBFile':<28} {seconds * 1000:>10.1f} ms  ({len(selected)} selected)")
+
+        seconds, stats = timed(lambda: index.update(iter_pdb_paths([mirror]), workers=args.workers))
+        print(f"{'index build':<28} {seconds * 1000:>10.1f} ms  ({stats['indexed']} indexed)")
+
+        seconds, stats = timed(lambda: index.update(iter_pdb_paths([mirror]), workers=args.workers))
+        print(f"{'index update (unchanged)':<28} {seconds * 1000:>10.1f} ms  ({stats['indexed']} indexed)")
+
+        for path in paths[::max(int(1 / args.modified), 1)]:
+            os.utime(path, ns=(time.time_ns(), time.time_ns()))
+        seconds, stats = timed(lambda: index.update(iter_pdb_paths([mirror]), workers=args.workers))
+        print(f"{'index update (modified)':<28} {seconds * 1000:>10.1f} ms  ({stats['indexed']} indexed)")
+
+        seconds, indexed = timed(index.select, QUERY)
+        print(f"{'query':<28} {seconds * 1000:>10.1f} ms  ({len(indexed)} selected)")
+        assert indexed == sorted(selected)
+        index.close()
+
+
+if __name__ == '__main__':
+    main()
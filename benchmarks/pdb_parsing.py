@@ -0,0 +1,117 @@
+"""
+Compare le parseur PDB par blocs avec l'ancien parseur ligne par ligne sur des fichiers synthétiques de plusieurs Mo,
+ainsi que le pic de mémoire résidente (RSS) de chaque mode de lecture lorsque seules les séquences sont utilisées.
+
+Utilisation (depuis la racine du projet):
+    python -m benchmarks.pdb_parsing [--chains 4 16 64] [--repeat 3]
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import write_pdb
+from scripts.pdb import PDBFile
+
+
+def legacy_parse(path: str) -> dict:
+    """
+    Ancien parseur (lecture par readline jusqu'à une ligne END), conservé comme référence. Seules les séquences sont
+    retournées, les autres enregistrements étant accumulés comme auparavant.
+    """
+    seqres = {}
+    remarks = {}
+    authors = []
+    journal = ""
+    with open(path, 'r') as file:
+        line = file.readline().strip()
+        while line != "END":
+            if line[0:6] == "SEQRES":
+                if line[11] not in seqres:
+                    seqres[line[11]] = []
+                seqres[line[11]].extend(line[19:].split())
+            elif line[0:6] == "REMARK":
+                if line[7:10] not in remarks:
+                    remarks[line[7:10]] = ""
+                remarks[line[7:10]] += f"{line[11:].strip()}\n"
+            elif line[0:6] == "AUTHOR":
+                authors.extend(line[10:].strip().split(","))
+            elif line[0:6] == "JRNL  ":
+                journal += line + "\n"
+            line = file.readline().strip()
+    return seqres
+
+
+def best_time(function, repeat: int) -> float:
+    """
+    Retourne le meilleur temps d'exécution de function en secondes.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# modes de lecture comparés pour la mémoire résidente ('référence' mesure l'interpréteur seul)
+MODES = {
+    'référence': lambda path: None,
+    'ancien': lambda path: legacy_parse(path),
+    'blocs': lambda path: PDBFile(path).seqres,
+    'sequence_only': lambda path: PDBFile(path, sequence_only=True).seqres,
+    'memory_map': lambda path: PDBFile(path, sequence_only=True, memory_map=True).seqres,
+}
+
+
+def peak_rss(mode: str, path: str) -> int:
+    """
+    Retourne le pic de mémoire résidente (en Kio) d'un processus qui lit uniquement les séquences de path.
+    """
+    output = subprocess.run([sys.executable, '-m', 'benchmarks.pdb_parsing', '--measure-rss', mode, path],
+                            capture_output=True, text=True, check=True).stdout
+    return int(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--chains', type=int, nargs='+', default=[4, 16, 64])
+    parser.add_argument('--chain-length', type=int, default=400)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--measure-rss', nargs=2, metavar=('MODE', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure_rss:
+        # exécuté dans un sous-processus par peak_rss
+        mode, path = args.measure_rss
+        MODES[mode](path)
+        print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+        return
+
+    print(f"{'chaînes':>8} {'taille (Mo)':>12} {'ancien (ms)':>12} {'blocs (ms)':>11} {'sequence_only (ms)':>19}")
+    with tempfile.TemporaryDirectory() as directory:
+        for chains in args.chains:
+            path = os.path.join(directory, f"synthetic_{chains}.pdb")
+            write_pdb(path, chains=chains, chain_length=args.chain_length)
+
+            # vérifie que les deux parseurs lisent les mêmes séquences
+            assert legacy_parse(path) == PDBFile(path).seqres == PDBFile(path, sequence_only=True).seqres
+
+            legacy = best_time(lambda: legacy_parse(path), args.repeat)
+            streaming = best_time(lambda: PDBFile(path), args.repeat)
+            sequence_only = best_time(lambda: PDBFile(path, sequence_only=True), args.repeat)
+            print(f"{chains:>8} {os.path.getsize(path) / 1e6:>12.1f} {legacy * 1000:>12.1f} {streaming * 1000:>11.1f} "
+                  f"{sequence_only * 1000:>19.1f}")
+
+        # pic de mémoire résidente sur le plus gros fichier
+        print(f"\nPic RSS ({os.path.getsize(path) / 1e6:.1f} Mo):")
+        for mode in MODES:
+            print(f"{mode:>14}: {peak_rss(mode, path) / 1024:.1f} Mio")
+
+
+if __name__ == '__main__':
+    main()
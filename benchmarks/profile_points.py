@@ -0,0 +1,42 @@
+"""
+Mesure le coût, par chaîne, de la construction des points Flet par rapport au calcul seul du profil.
+
+Utilisation (depuis la racine du projet):
+    python -m benchmarks.profile_points [--lengths 300 3000 30000] [--repeat 5]
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.suite import measure
+from scripts.profile_generation import AMINO_ACIDS, HydrophobicityProfile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lengths', type=int, nargs='+', default=[300, 3000, 30000])
+    parser.add_argument('--frame-size', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    # l'import de Flet fait lui-même partie du coût évité en mode sans interface
+    start = time.perf_counter()
+    from scripts.interface import build_chart_points
+    print(f"Import de l'interface Flet: {(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+    print(f"{'longueur':>10} {'profil (ms)':>12} {'+ points (ms)':>14} {'profil (Kio)':>13} {'+ points (Kio)':>15}")
+    for length in args.lengths:
+        sequence = random.Random(length).choices(AMINO_ACIDS, k=length)
+
+        headless_time, headless_peak, _ = measure(
+            lambda: HydrophobicityProfile(sequence, 0, args.frame_size, 1.0), args.repeat)
+        chart_time, chart_peak, _ = measure(
+            lambda: build_chart_points(HydrophobicityProfile(sequence, 0, args.frame_size, 1.0)), args.repeat)
+
+        print(f"{length:>10} {headless_time * 1000:>12.2f} {chart_time * 1000:>14.2f} {headless_peak / 1024:>13.1f} "
+              f"{chart_peak / 1024:>15.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+Mesure le démarrage à froid de l'application: chaque mesure est faite dans un nouveau processus Python, qui importe
+main.py et démarre l'application sur une page Flet sans client. Les durées sont comptées depuis le début de l'exécution
+du processus enfant (après le démarrage de l'interpréteur):
+    - import: import de main.py (Flet et l'instrumentation)
+    - first_paint: premier affichage (indicateur de chargement)
+    - view: vue principale construite (interface, NumPy et modules de calcul importés)
+    - models: modèles chargés dans la liste déroulante
+    - process: durée totale du processus enfant, mesurée par le parent (démarrage de l'interpréteur compris)
+
+Utilisation (depuis la racine du projet):
+    python -m benchmarks.startup [--repeat 10] [--save REFERENCE.json] [--compare REFERENCE.json] [--tolerance 0.25]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+# étapes mesurées, dans l'ordre du démarrage
+STEPS = ('import', 'first_paint', 'view', 'models', 'process')
+
+
+class HeadlessStartupPage:
+    """
+    Page Flet minimale, sans client, qui enregistre l'instant du premier affichage et les threads lancés.
+    """
+    width = 1200
+    height = 800
+
+    def __init__(self):
+        self.views = []
+        self.overlay = []
+        self.first_paint = None
+        self.threads = []
+
+    def add(self, *controls):
+        self.update()
+
+    def update(self, *controls):
+        if self.first_paint is None:
+            self.first_paint = time.perf_counter()
+
+    def go(self, route: str):
+        self.route = route
+
+    def run_thread(self, function, *args):
+        thread = threading.Thread(target=function, args=args, daemon=True)
+        self.threads.append(thread)
+        thread.start()
+
+
+def child():
+    """
+    Exécutée dans le processus enfant: démarre l'application et écrit les durées (en secondes) en JSON.
+    """
+    start = time.perf_counter()
+    import main
+    imported = time.perf_counter()
+
+    page = HeadlessStartupPage()
+    main.main(page)
+    built = time.perf_counter()
+    for thread in page.threads:
+        thread.join()
+    ready = time.perf_counter()
+
+    print(json.dumps({'import': imported - start, 'first_paint': page.first_paint - start, 'view': built - start,
+                      'models': ready - start}))
+
+
+def measure_once() -> dict:
+    """
+    Démarre l'application dans un nouveau processus et retourne les durées de chaque étape.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', 'from benchmarks.startup import child; child()'], cwd=root,
+                            check=True, capture_output=True, text=True).stdout
+    durations = json.loads(output.splitlines()[-1])
+    durations['process'] = time.perf_counter() - start
+    return durations
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--save', metavar='REFERENCE', help="enregistre les résultats comme référence (JSON)")
+    parser.add_argument('--compare', metavar='REFERENCE', help="compare les résultats à une référence (JSON)")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="dépassement relatif toléré (défaut: 0.25)")
+    args = parser.parse_args(argv)
+
+    # une première exécution remplit les caches du système de fichiers (et les fichiers .pyc)
+    measure_once()
+    runs = [measure_once() for _ in range(args.repeat)]
+
+    results = {}
+    print(f"{'step':<12} {'median (ms)':>12} {'min (ms)':>10} {'max (ms)':>10}")
+    for step in STEPS:
+        values = [run[step] for run in runs]
+        results[f"startup/{step}"] = {'seconds': statistics.median(values), 'peak_bytes': 0}
+        print(f"{step:<12} {statistics.median(values) * 1000:>12.1f} {min(values) * 1000:>10.1f} "
+              f"{max(values) * 1000:>10.1f}")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'python': sys.version.split()[0], 'results': results}, f, indent=2)
+
+    if args.compare:
+        # import local: la suite importe NumPy et les modules de calcul
+        from benchmarks.suite import regressions
+
+        with open(args.compare) as f:
+            reference = json.load(f)['results']
+        messages = regressions(results, reference, args.tolerance)
+        for message in messages:
+            print(f"regression: {message}", file=sys.stderr)
+        if messages:
+            return 1
+        print(f"no regression beyond {args.tolerance * 100:.0f} %", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
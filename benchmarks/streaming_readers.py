@@ -0,0 +1,116 @@
+"""
+Mesure la lecture en flux des fichiers FASTA et mmCIF synthétiques:
+    - FASTA: débit de iter_fasta et pic de mémoire (tracemalloc, mesuré lors d'un second parcours) pour des fichiers
+        de tailles croissantes; le pic, borné par la taille des blocs lus, ne doit pas augmenter avec la taille du
+        fichier. Mesure aussi le débit de profile_fasta
+    - mmCIF: durée de lecture des séquences avec iter_mmcif, qui s'arrête au début des coordonnées, pour des fichiers
+        d'un nombre croissant d'atomes
+
+Utilisation (depuis la racine du projet):
+    python -m benchmarks.streaming_readers [--sequences 5000] [--length 350] [--workers N]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.suite import measure
+from scripts.fasta import iter_fasta
+from scripts.mmcif import iter_mmcif
+from scripts.parallel import profile_fasta
+from scripts.residues import AMINO_ACIDS, ONE_LETTER
+
+
+def write_fasta(path: str, sequences: int, length: int, seed: int = 0) -> None:
+    """
+    Écrit un fichier FASTA de sequences séquences aléatoires d'environ length résidus, en lignes de 60 caractères.
+    """
+    rng = random.Random(seed)
+    with open(path, 'w') as f:
+        for i in range(sequences):
+            sequence = "".join(rng.choices(ONE_LETTER[:20], k=rng.randint(length // 2, length * 3 // 2)))
+            f.write(f">seq{i:07d} synthetic protein {i}\n")
+            for start in range(0, len(sequence), 60):
+                f.write(sequence[start:start + 60] + "\n")
+
+
+def write_mmcif(path: str, chains: int, chain_length: int, atoms_per_residue: int, seed: int = 0) -> None:
+    """
+    Écrit un fichier mmCIF synthétique: une entité par chaîne (_entity_poly, _entity_poly_seq) puis les coordonnées
+    (_atom_site).
+    """
+    rng = random.Random(seed)
+    residues = AMINO_ACIDS[:20]
+    sequences = [[rng.choice(residues) for _ in range(chain_length)] for _ in range(chains)]
+    chain_ids = [chr(ord('A') + i) for i in range(chains)]
+    with open(path, 'w') as f:
+        f.write("data_9SYN\n#\n_entry.id 9SYN\n#\nloop_\n_entity_poly.entity_id\n_entity_poly.type\n"
+                "_entity_poly.pdbx_strand_id\n")
+        for i, chain in enumerate(chain_ids):
+            f.write(f"{i + 1} 'polypeptide(L)' {chain}\n")
+        f.write("#\nloop_\n_entity_poly_seq.entity_id\n_entity_poly_seq.num\n_entity_poly_seq.mon_id\n"
+                "_entity_poly_seq.hetero\n")
+        for i, sequence in enumerate(sequences):
+            for number, residue in enumerate(sequence, 1):
+                f.write(f"{i + 1} {number} {residue} n\n")
+        f.write("#\nloop_\n_atom_site.group_PDB\n_atom_site.id\n_atom_site.type_symbol\n_atom_site.label_atom_id\n"
+                "_atom_site.label_comp_id\n_atom_site.label_asym_id\n_atom_site.label_seq_id\n"
+                "_atom_site.Cartn_x\n_atom_site.Cartn_y\n_atom_site.Cartn_z\n")
+        serial = 0
+        for chain, sequence in zip(chain_ids, sequences):
+            for number, residue in enumerate(sequence, 1):
+                for atom in ("N", "CA", "C", "O", "CB", "CG")[:atoms_per_residue]:
+                    serial += 1
+                    f.write(f"ATOM {serial} {atom[0]} {atom} {residue} {chain} {number} "
+                            f"{rng.uniform(-50, 50):.3f} {rng.uniform(-50, 50):.3f} {rng.uniform(-50, 50):.3f}\n")
+        f.write("#\n")
+
+
+def count_residues(path: str) -> tuple:
+    """
+    Parcourt un fichier FASTA et retourne le nombre de séquences et de résidus.
+    """
+    sequences = residues = 0
+    for _, sequence in iter_fasta(path):
+        sequences += 1
+        residues += len(sequence)
+    return sequences, residues
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sequences', type=int, default=5000)
+    parser.add_argument('--length', type=int, default=350)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{'FASTA':<24} {'size (MB)':>10} {'time (s)':>10} {'MB/s':>8} {'peak (KiB)':>11}")
+        for factor in (1, 4, 16):
+            path = os.path.join(directory, f"synthetic{factor}.fasta")
+            write_fasta(path, args.sequences * factor, args.length)
+            size = os.path.getsize(path) / 1e6
+            seconds, peak, (sequences, _) = measure(lambda: count_residues(path), 1)
+            print(f"{f'iter_fasta ({sequences})':<24} {size:>10.1f} {seconds:>10.2f} {size / seconds:>8.1f} "
+                  f"{peak / 1024:>11.0f}")
+
+        path = os.path.join(directory, "synthetic1.fasta")
+        start = time.perf_counter()
+        profiled = sum(result.error is None for result in profile_fasta(path, 0, 19, 0.1, workers=args.workers))
+        seconds = time.perf_counter() - start
+        print(f"profile_fasta: {profiled} sequences in {seconds:.2f} s ({profiled / seconds:.0f} sequences/s)")
+
+        print(f"\n{'mmCIF':<24} {'size (MB)':>10} {'time (ms)':>10} {'peak (KiB)':>11} {'chains':>8}")
+        for atoms_per_residue in (1, 6):
+            path = os.path.join(directory, f"synthetic{atoms_per_residue}.cif")
+            write_mmcif(path, chains=8, chain_length=2000, atoms_per_residue=atoms_per_residue)
+            size = os.path.getsize(path) / 1e6
+            seconds, peak, chains = measure(lambda: list(iter_mmcif(path)), 1)
+            print(f"{f'iter_mmcif ({atoms_per_residue} atoms/res)':<24} {size:>10.1f} {seconds * 1000:>10.1f} "
+                  f"{peak / 1024:>11.0f} {len(chains):>8}")
+
+
+if __name__ == '__main__':
+    main()
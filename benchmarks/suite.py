@@ -0,0 +1,205 @@
+"""
+Suite de benchmarks reproductible des étapes de l'application: lecture des fichiers PDB (petit, gros et riche en
+enregistrements ATOM, générés synthétiquement), calcul des profils selon la longueur des séquences et la taille de la
+fenêtre, détection des pics et construction de l'arbre de contrôles Flet de la vue du profil.
+
+Pour chaque cas, la suite affiche le meilleur temps, le débit et le pic de mémoire allouée (tracemalloc). Les résultats
+peuvent être enregistrés comme référence dans un fichier JSON, puis comparés à cette référence: le programme se termine
+avec le code 1 si le temps ou le pic de mémoire d'un cas dépasse celui de la référence de plus de la tolérance.
+
+Utilisation (depuis la racine du projet):
+    python -m benchmarks.suite [--stages parse score detect render] [--repeat 5]
+                               [--save REFERENCE.json] [--compare REFERENCE.json] [--tolerance 0.25]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.synthetic import random_sequence, write_pdb
+from scripts.pdb import PDBFile
+from scripts.profile_generation import HydrophobicityProfile, detect_segments, encode_sequence, group_identical_chains
+
+# fichiers PDB synthétiques lus par l'étape parse: (chaînes, longueur des chaînes, lignes ATOM par résidu)
+PARSE_FILES = {
+    'small': (2, 300, 8),
+    'large': (16, 2000, 2),
+    'atom-heavy': (2, 1000, 40),
+}
+
+# longueurs des séquences et tailles de fenêtre de l'étape score
+SCORE_LENGTHS = (1000, 10000, 100000)
+SCORE_WINDOWS = (4, 10, 20)
+
+# nombre de scores de l'étape detect
+DETECT_SIZE = 1_000_000
+
+# chaînes (nombre, longueur) de la vue construite par l'étape render
+RENDER_CHAINS = (8, 3000)
+
+# tolérance par défaut avant de considérer un cas comme une régression (0.25 = 25 % plus lent ou plus gourmand)
+DEFAULT_TOLERANCE = 0.25
+
+
+def parse_cases(directory: str):
+    """
+    Cas de l'étape parse: lecture complète d'un fichier PDB, débit en Mo/s.
+    """
+    for name, (chains, chain_length, atoms_per_residue) in PARSE_FILES.items():
+        path = os.path.join(directory, f"{name}.pdb")
+        write_pdb(path, chains=chains, chain_length=chain_length, atoms_per_residue=atoms_per_residue)
+        yield f"parse/{name}", lambda path=path: PDBFile(path).seqres, os.path.getsize(path) / 1e6, 'MB'
+
+
+def score_cases(directory: str):
+    """
+    Cas de l'étape score: profil (fenêtres et pics) d'une séquence déjà encodée, débit en acides aminés/s.
+    """
+    for length in SCORE_LENGTHS:
+        codes = encode_sequence(random_sequence(length))
+        for frame_size in SCORE_WINDOWS:
+            yield (f"score/{length}/w{frame_size}",
+                   lambda codes=codes, frame_size=frame_size: HydrophobicityProfile(codes, 0, frame_size, 0.5),
+                   length, 'residues')
+
+
+def detect_cases(directory: str):
+    """
+    Cas de l'étape detect: détection des pics sur un tableau de scores, débit en scores/s.
+    """
+    scores = np.random.default_rng(0).normal(0.3, 0.6, DETECT_SIZE)
+    yield f"detect/{DETECT_SIZE}", lambda: detect_segments(scores), DETECT_SIZE, 'scores'
+
+
+class HeadlessPage:
+    """
+    Page Flet minimale, sans client, suffisante pour construire la vue du profil.
+    """
+    width = 1200
+    height = 800
+
+    def update(self, *controls):
+        pass
+
+
+def render_cases(directory: str):
+    """
+    Cas de l'étape render: construction de la vue du profil, ajout de chaque chaîne au graphique et construction des
+    détails, comme lors d'un calcul lancé depuis _generate_profile, débit en chaînes/s.
+    """
+    # l'import de Flet n'est nécessaire que pour cette étape
+    from scripts.interface import FletApp, ProfileGeneration
+
+    chains, chain_length = RENDER_CHAINS
+    path = os.path.join(directory, "render.pdb")
+    write_pdb(path, chains=chains, chain_length=chain_length, atoms_per_residue=1)
+    pdb_file = PDBFile(path, sequence_only=True)
+    profiles = {chain: HydrophobicityProfile(sequence, 0, 4, 1.0) for chain, sequence in pdb_file.seqres.items()}
+
+    app = FletApp.__new__(FletApp)
+    app.page = HeadlessPage()
+
+    def render():
+        generation = ProfileGeneration(path, 0, "Kyte & Doolittle", 4, 1.0)
+        generation.view = app._build_profile_view(generation)
+        generation.pdb_file = pdb_file
+        generation.sequences = {chain: encode_sequence(sequence) for chain, sequence in pdb_file.seqres.items()}
+        generation.chain_groups = group_identical_chains(generation.sequences)
+        for chain, profile in profiles.items():
+            app._add_chain(generation, chain, profile)
+        app._finish_generation(generation)
+
+    yield f"render/{chains}x{chain_length}", render, chains, 'chains'
+
+
+# étapes de la suite, dans l'ordre d'exécution
+STAGES = {
+    'parse': parse_cases,
+    'score': score_cases,
+    'detect': detect_cases,
+    'render': render_cases,
+}
+
+
+def measure(function, repeat: int) -> tuple:
+    """
+    Retourne le meilleur temps d'exécution (en secondes) de function sur repeat appels, son pic de mémoire allouée (en
+    octets) et le résultat de son dernier appel. Le pic est mesuré lors d'un appel supplémentaire, tracemalloc
+    ralentissant fortement l'exécution.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    result = function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def regressions(results: dict, reference: dict, tolerance: float) -> list:
+    """
+    Retourne la description des cas dont le temps ou le pic de mémoire dépasse la référence de plus de tolerance.
+    """
+    messages = []
+    for name, result in results.items():
+        if name not in reference:
+            continue
+        for key in ('seconds', 'peak_bytes'):
+            if reference[name][key] and result[key] > reference[name][key] * (1 + tolerance):
+                messages.append(f"{name}: {key} {result[key]:.6g} > {reference[name][key]:.6g} "
+                                f"(+{(result[key] / reference[name][key] - 1) * 100:.0f} %)")
+    return messages
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=list(STAGES))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save', metavar='REFERENCE', help="enregistre les résultats comme référence (JSON)")
+    parser.add_argument('--compare', metavar='REFERENCE', help="compare les résultats à une référence (JSON)")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f"dépassement relatif toléré (défaut: {DEFAULT_TOLERANCE})")
+    args = parser.parse_args(argv)
+
+    results = {}
+    print(f"{'case':<24} {'time (ms)':>10} {'throughput':>22} {'peak (MiB)':>11}")
+    with tempfile.TemporaryDirectory() as directory:
+        for stage in args.stages:
+            for name, function, amount, unit in STAGES[stage](directory):
+                seconds, peak, _ = measure(function, args.repeat)
+                results[name] = {'seconds': seconds, 'throughput': amount / seconds, 'unit': f"{unit}/s",
+                                 'peak_bytes': peak}
+                print(f"{name:<24} {seconds * 1000:>10.2f} {amount / seconds:>12.4g} {unit + '/s':<9} "
+                      f"{peak / (1024 * 1024):>11.2f}")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(), 'numpy': np.__version__,
+                       'results': results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            reference = json.load(f)['results']
+        messages = regressions(results, reference, args.tolerance)
+        for message in messages:
+            print(f"regression: {message}", file=sys.stderr)
+        if messages:
+            return 1
+        print(f"no regression beyond {args.tolerance * 100:.0f} % "
+              f"({len(results.keys() & reference.keys())} cases compared)", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
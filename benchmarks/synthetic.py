@@ -0,0 +1,53 @@
+"""
+Génération de fichiers PDB synthétiques pour les benchmarks, sans accès au réseau.
+"""
+
+import random
+
+from scripts.profile_generation import AMINO_ACIDS
+
+
+def random_sequence(length: int, seed: int = 0) -> list:
+    """
+    Retourne une séquence aléatoire (mais reproductible) de codes à trois lettres.
+    """
+    return random.Random(seed).choices(AMINO_ACIDS, k=length)
+
+
+def write_pdb(path: str, chains: int = 4, chain_length: int = 300, atoms_per_residue: int = 8, seed: int = 0,
+              distinct: int = None) -> None:
+    """
+    Écrit un fichier PDB contenant un en-tête, un bloc JRNL, des REMARK, les SEQRES de chains chaînes de chain_length
+    résidus et atoms_per_residue lignes ATOM par résidu. Avec distinct, les chaînes ne comptent que distinct séquences
+    différentes, répétées comme celles d'un homo-oligomère.
+    """
+    chain_ids = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+    distinct = distinct or chains
+    with open(path, 'w') as f:
+        f.write(f"{'HEADER    ' + 'MEMBRANE PROTEIN':<50}{'01-JAN-24':<12}9XYZ{'':14}\n")
+        f.write(f"{'AUTHOR    A.AUTHOR,B.AUTHOR':<80}\n")
+        f.write(f"{'JRNL        AUTH   A.AUTHOR,B.AUTHOR':<80}\n")
+        f.write(f"{'JRNL        TITL   A SYNTHETIC STRUCTURE':<80}\n")
+        f.write(f"{'JRNL        REF    J.SYNTH.BIOL.                 12   345 2024':<80}\n")
+        f.write(f"{'JRNL        PMID   12345678':<80}\n")
+        f.write(f"{'JRNL        DOI    10.0000/SYNTHETIC':<80}\n")
+        for number in range(1, 50):
+            f.write(f"{f'REMARK {number:>3} SYNTHETIC REMARK LINE':<80}\n")
+
+        sequences = [random_sequence(chain_length, seed + index % distinct) for index in range(chains)]
+        for index, sequence in enumerate(sequences):
+            chain = chain_ids[index % len(chain_ids)]
+            for line_number, start in enumerate(range(0, chain_length, 13), start=1):
+                residues = " ".join(sequence[start:start + 13])
+                # les numéros de ligne et la longueur sont tronqués à la largeur de leurs colonnes
+                f.write(f"{f'SEQRES {line_number % 1000:>3} {chain} {chain_length % 10000:>4}  {residues}':<80}\n")
+
+        serial = 1
+        for index, sequence in enumerate(sequences):
+            chain = chain_ids[index % len(chain_ids)]
+            for residue_number, residue in enumerate(sequence, start=1):
+                for atom in range(atoms_per_residue):
+                    f.write(f"ATOM  {serial % 100000:>5}  CA  {residue} {chain}{residue_number % 10000:>4}    "
+                            f"{atom:>8.3f}{residue_number:>8.3f}{index:>8.3f}  1.00  0.00           C  \n")
+                    serial += 1
+        f.write("END\n")
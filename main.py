@@ -1,6 +1,21 @@
-from scripts.interface import FletApp
 import flet as ft
 
+from scripts.instrumentation import span
+
+
+def main(page: ft.Page):
+    """ Affiche un indicateur de chargement dès l'ouverture de la fenêtre, puis importe l'interface (et avec elle NumPy
+    et les modules de calcul) et construit la vue principale. Les modèles sont chargés en arrière-plan par FletApp. """
+
+    with span("startup.first_paint"):
+        page.vertical_alignment = ft.MainAxisAlignment.CENTER
+        page.add(ft.Row([ft.ProgressRing()], alignment=ft.MainAxisAlignment.CENTER))
+
+    with span("startup.import_interface"):
+        from scripts.interface import FletApp
+    FletApp(page)
+
+
 if __name__ == '__main__':
     """ Point d'entrée de l'application"""
-    ft.app(target=FletApp)
+    ft.app(target=main)
@@ -0,0 +1,278 @@
+"""
+Mode batch sans interface graphique: calcule les profils d'hydrophobicité de tous les fichiers PDB d'un répertoire (ou
+correspondant à un motif glob) et écrit les profils et les pics détectés de chaque chaîne. Les fichiers compressés avec
+gzip (.pdb.gz, .ent.gz) et les archives tar (.tar, .tar.gz, .tgz...) de fichiers PDB sont lus sans extraction. Les
+fichiers mmCIF (.cif) et FASTA (.fasta, .fa, .faa), compressés ou non, sont aussi acceptés: pour un fichier FASTA,
+chaque séquence est profilée séparément (entry est son identifiant et chain est vide), en mémoire constante.
+
+Utilisation (depuis la racine du projet):
+    python -m scripts.batch ENTRÉES... --output SORTIE [--model NOM|INDICE] [--window 4] [--edge-proportion 1.0]
+                            [--format csv|jsonl|columnar|binary] [--workers N] [--chunksize N]
+                            [--cache-dir RÉPERTOIRE] [--cache-size Mio] [--no-cache]
+                            [--query CONDITION [--index INDEX.sqlite]]
+
+Avec --query, les fichiers de l'index SQLite (voir index.py) qui vérifient la condition SQL sont profilés, en plus des
+ENTRÉES éventuelles, sans relire les autres fichiers du miroir.
+
+Formats de sortie:
+    - csv: SORTIE_profiles.csv (une ligne par acide aminé) et SORTIE_picks.csv (une ligne par pic)
+    - jsonl: une ligne JSON par chaîne contenant les scores et les pics
+    - columnar: un fichier .npz contenant une colonne (tableau NumPy) par champ, pour les profils et pour les pics
+    - binary: SORTIE_scores.npy, SORTIE_picks.npy et SORTIE_manifest.json, écrits au fil du calcul et projetables en
+        mémoire (voir export.py)
+"""
+
+import argparse
+import csv
+import glob
+import itertools
+import json
+import os
+import sqlite3
+import sys
+import time
+
+import numpy as np
+
+from scripts.cache import DEFAULT_DIRECTORY, DEFAULT_MAX_BYTES, ResultCache
+from scripts.export import BinaryWriter
+from scripts.fasta import FASTA_EXTENSIONS, is_fasta
+from scripts.index import DEFAULT_DATABASE, MirrorIndex
+from scripts.mmcif import MMCIF_EXTENSIONS
+from scripts.parallel import ChainProfile, profile_fasta, profile_files
+from scripts.pdb import ARCHIVE_EXTENSIONS, PDB_EXTENSIONS
+from scripts.profile_generation import MODEL_REGISTRY
+
+# extensions des fichiers recherchés dans un répertoire
+INPUT_EXTENSIONS = PDB_EXTENSIONS + ARCHIVE_EXTENSIONS + MMCIF_EXTENSIONS + FASTA_EXTENSIONS
+
+
+def iter_pdb_paths(inputs: list):
+    """
+    Itère sur les chemins des fichiers (PDB, archives, mmCIF, FASTA) désignés par une liste de répertoires, de
+    fichiers ou de motifs glob.
+    """
+    for entry in inputs:
+        if os.path.isdir(entry):
+            for name in sorted(os.listdir(entry)):
+                if name.lower().endswith(INPUT_EXTENSIONS):
+                    yield os.path.join(entry, name)
+        elif os.path.isfile(entry):
+            yield entry
+        else:
+            yield from sorted(glob.glob(entry, recursive=True))
+
+
+class CsvWriter:
+    def __init__(self, output: str):
+        """
+        Écrit les profils dans OUTPUT_profiles.csv et les pics dans OUTPUT_picks.csv.
+        """
+        self._profiles_file = open(f"{output}_profiles.csv", 'w', newline='')
+        self._picks_file = open(f"{output}_picks.csv", 'w', newline='')
+        self._profiles = csv.writer(self._profiles_file)
+        self._picks = csv.writer(self._picks_file)
+        self._profiles.writerow(['entry', 'chain', 'position', 'score'])
+        self._picks.writerow(['entry', 'chain', 'start', 'end', 'length', 'minimum', 'maximum'])
+
+    def write(self, entry: str, chain: str, profile: ChainProfile) -> None:
+        """
+        Écrit le profil et les pics d'une chaîne.
+        """
+        self._profiles.writerows(
+            (entry, chain, position, score)
+            for position, score in zip(profile.positions.tolist(), profile.scores.tolist())
+        )
+        self._picks.writerows(
+            (entry, chain, pick.start, pick.start + pick.length, pick.length, pick.minimum, pick.maximum)
+            for pick in profile.picks
+        )
+
+    def close(self) -> None:
+        """
+        Ferme les fichiers de sortie.
+        """
+        self._profiles_file.close()
+        self._picks_file.close()
+
+
+class JsonLinesWriter:
+    def __init__(self, output: str):
+        """
+        Écrit une ligne JSON par chaîne dans OUTPUT.
+        """
+        self._file = open(output, 'w')
+
+    def write(self, entry: str, chain: str, profile: ChainProfile) -> None:
+        """
+        Écrit le profil et les pics d'une chaîne.
+        """
+        self._file.write(json.dumps({
+            'entry': entry,
+            'chain': chain,
+            'first_position': profile.first_position,
+            'scores': profile.scores.tolist(),
+            'picks': [
+                {'start': pick.start, 'end': pick.start + pick.length, 'length': pick.length,
+                 'minimum': pick.minimum, 'maximum': pick.maximum}
+                for pick in profile.picks
+            ]
+        }) + "\n")
+
+    def close(self) -> None:
+        """
+        Ferme le fichier de sortie.
+        """
+        self._file.close()
+
+
+class ColumnarWriter:
+    def __init__(self, output: str):
+        """
+        Accumule les profils et les pics par colonnes, puis les écrit dans un fichier .npz à la fermeture.
+        """
+        self._output = output
+        self._profiles = {'entry': [], 'chain': [], 'position': [], 'score': []}
+        self._picks = {'entry': [], 'chain': [], 'start': [], 'end': [], 'length': [], 'minimum': [], 'maximum': []}
+
+    def write(self, entry: str, chain: str, profile: ChainProfile) -> None:
+        """
+        Ajoute le profil et les pics d'une chaîne aux colonnes.
+        """
+        size = len(profile.scores)
+        self._profiles['entry'].append(np.full(size, entry))
+        self._profiles['chain'].append(np.full(size, chain))
+        self._profiles['position'].append(profile.positions)
+        self._profiles['score'].append(profile.scores)
+        for pick in profile.picks:
+            self._picks['entry'].append(entry)
+            self._picks['chain'].append(chain)
+            self._picks['start'].append(pick.start)
+            self._picks['end'].append(pick.start + pick.length)
+            self._picks['length'].append(pick.length)
+            self._picks['minimum'].append(pick.minimum)
+            self._picks['maximum'].append(pick.maximum)
+
+    def close(self) -> None:
+        """
+        Écrit toutes les colonnes dans le fichier de sortie.
+        """
+        columns = {
+            f"profiles_{name}": np.concatenate(values) if values else np.empty(0)
+            for name, values in self._profiles.items()
+        }
+        columns.update({f"picks_{name}": np.array(values) for name, values in self._picks.items()})
+        np.savez(self._output, **columns)
+
+
+# classes d'écriture associées à chaque format de sortie
+WRITERS = {
+    'csv': CsvWriter,
+    'jsonl': JsonLinesWriter,
+    'columnar': ColumnarWriter,
+    'binary': BinaryWriter,
+}
+
+
+def parse_model(value: str):
+    """
+    Interprète l'argument --model comme un indice s'il est numérique, sinon comme un nom de modèle.
+    """
+    return int(value) if value.isdigit() else value
+
+
+def main(argv: list = None) -> int:
+    """
+    Point d'entrée du mode batch.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('inputs', nargs='*', help="répertoires, fichiers (PDB, mmCIF, FASTA) ou motifs glob")
+    parser.add_argument('--output', '-o', required=True, help="fichier (ou préfixe pour csv) de sortie")
+    parser.add_argument('--model', '-m', type=parse_model, default=0, help="nom ou indice du modèle (défaut: 0)")
+    parser.add_argument('--window', '-w', type=int, default=4, help="taille de la fenêtre (défaut: 4)")
+    parser.add_argument('--edge-proportion', '-e', type=float, default=1.0,
+                        help="pondération aux extrémités entre 0 et 1 (défaut: 1.0)")
+    parser.add_argument('--format', '-f', choices=sorted(WRITERS), default='csv', help="format de sortie")
+    parser.add_argument('--workers', '-j', type=int, default=None,
+                        help="nombre de processus (défaut: nombre de cœurs, 1 pour tout calculer dans ce processus)")
+    parser.add_argument('--chunksize', type=int, default=4,
+                        help="nombre d'unités de travail envoyées à un processus à la fois (défaut: 4)")
+    parser.add_argument('--cache-dir', default=DEFAULT_DIRECTORY,
+                        help=f"répertoire du cache (défaut: {DEFAULT_DIRECTORY})")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help=f"taille maximale du cache en Mio (défaut: {DEFAULT_MAX_BYTES // (1024 * 1024)})")
+    parser.add_argument('--no-cache', action='store_true', help="ne consulte ni ne complète le cache")
+    parser.add_argument('--index', default=DEFAULT_DATABASE,
+                        help=f"index SQLite du miroir (défaut: {DEFAULT_DATABASE})")
+    parser.add_argument('--query', '-q',
+                        help="profile aussi les fichiers de l'index qui vérifient cette condition SQL")
+    args = parser.parse_args(argv)
+
+    if args.window < 1:
+        parser.error("--window must be greater than 0")
+    if not 0 <= args.edge_proportion <= 1:
+        parser.error("--edge-proportion must be between 0 and 1")
+    try:
+        # vérifié avant d'ouvrir (et de tronquer) les fichiers de sortie
+        MODEL_REGISTRY.get(args.model)
+    except (KeyError, IndexError):
+        parser.error(f"unknown --model '{args.model}'")
+    if not args.inputs and args.query is None:
+        parser.error("at least one input or --query is required")
+
+    selected = []
+    if args.query is not None:
+        index = MirrorIndex(args.index)
+        try:
+            selected = index.select(args.query)
+        except sqlite3.Error as e:
+            parser.error(f"invalid --query: {e}")
+        finally:
+            index.close()
+
+    cache = None if args.no_cache else ResultCache(args.cache_dir, args.cache_size * 1024 * 1024)
+    writer = WRITERS[args.format](args.output)
+    files = []
+    fasta_files = []
+    chains = skipped = 0
+    start = time.perf_counter()
+
+    def paths():
+        # conserve les chemins lus pour le rapport final; les fichiers FASTA sont profilés après les autres
+        for path in itertools.chain(iter_pdb_paths(args.inputs), selected):
+            files.append(path)
+            if is_fasta(path):
+                fasta_files.append(path)
+            else:
+                yield path
+
+    def results():
+        yield from profile_files(paths(), args.model, args.window, args.edge_proportion,
+                                 workers=args.workers, chunksize=args.chunksize, cache=cache)
+        for path in fasta_files:
+            yield from profile_fasta(path, args.model, args.window, args.edge_proportion,
+                                     workers=args.workers, chunksize=args.chunksize)
+
+    try:
+        for result in results():
+            if result.error is None:
+                writer.write(result.entry, result.chain, result)
+                chains += 1
+            elif result.chain is None:
+                print(f"{result.path}: {result.error}", file=sys.stderr)
+            else:
+                print(f"{result.path}: chain {result.chain} skipped: {result.error}", file=sys.stderr)
+                skipped += 1
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"{len(files)} files, {chains} chains profiled ({skipped} skipped) in {elapsed:.2f} s "
+          f"({chains / elapsed if elapsed else 0:.1f} chains/s)", file=sys.stderr)
+    if cache is not None:
+        print(cache.stats(), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+Cache persistant des résultats, adressé par le contenu des fichiers PDB.
+
+Chaque entrée est identifiée par l'empreinte SHA-256 du fichier PDB et par les paramètres du profil (modèle, taille de
+la fenêtre, pondération aux extrémités). Elle contient les informations du PDBFile et un tableau de scores par profil
+distinct, dans un fichier .npz non compressé: les chaînes de même séquence, qui partagent un profil, partagent aussi
+son tableau. La taille totale du cache est bornée: les entrées les moins récemment utilisées sont supprimées en
+premier.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from scripts.pdb import PDBFile
+from scripts.profile_generation import MODEL_REGISTRY, HydrophobicityProfile
+
+# répertoire par défaut du cache
+DEFAULT_DIRECTORY = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')),
+                                 'protein-hydrophobicity-profiler')
+
+# taille maximale par défaut du cache (en octets)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# taille des blocs lus pour calculer l'empreinte d'un fichier
+HASH_BLOCK_SIZE = 1 << 20
+
+# version des résultats mis en cache, à incrémenter lorsque leur calcul change (par exemple la détection des pics)
+CACHE_VERSION = 3
+
+
+class ResultCache:
+    def __init__(self, directory: str = DEFAULT_DIRECTORY, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Cache de résultats dans directory, limité à max_bytes octets.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def hash_file(path: str) -> str:
+        """
+        Retourne l'empreinte SHA-256 du contenu d'un fichier.
+        """
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            while block := f.read(HASH_BLOCK_SIZE):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _entry_path(self, file_hash: str, model_id, frame_size: int, edge_proportion: float) -> str:
+        """
+        Retourne le chemin de l'entrée correspondant à un fichier et à des paramètres. Le modèle est identifié par ses
+        valeurs, pour qu'une modification de models.json invalide les entrées concernées.
+        """
+        model = MODEL_REGISTRY.get(model_id)
+        model_hash = hashlib.sha256(model.table.tobytes()).hexdigest()
+        key = hashlib.sha256(
+            f"{CACHE_VERSION}:{file_hash}:{model_hash}:{int(frame_size)}:{float(edge_proportion)!r}".encode())
+        return os.path.join(self.directory, f"{key.hexdigest()}.npz")
+
+    def get(self, file_hash: str, model_id, frame_size: int, edge_proportion: float):
+        """
+        Retourne le couple (PDBFile, profils) en cache pour un fichier et des paramètres, ou None. profils est un
+        dictionnaire associant chaque chaîne à son HydrophobicityProfile; les chaînes enregistrées avec le même profil
+        partagent le même objet.
+        """
+        path = self._entry_path(file_hash, model_id, frame_size, edge_proportion)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                metadata = json.loads(data['metadata'].tobytes())
+                distinct = [
+                    HydrophobicityProfile.from_arrays(data[f"scores_{index}"], **profile_metadata)
+                    for index, profile_metadata in enumerate(metadata['profiles'])
+                ]
+                profiles = {chain: distinct[index] for chain, index in metadata['chains']}
+        except (OSError, ValueError, KeyError):
+            # entrée absente ou illisible
+            self.misses += 1
+            return None
+
+        # met à jour la date d'utilisation de l'entrée pour la politique LRU
+        os.utime(path)
+        self.hits += 1
+        return PDBFile.from_dict(metadata['pdb_file']), profiles
+
+    def put(self, file_hash: str, model_id, frame_size: int, edge_proportion: float, pdb_file: PDBFile,
+            profiles: dict) -> None:
+        """
+        Enregistre le PDBFile et les profils (dictionnaire chaîne -> HydrophobicityProfile) d'un fichier, puis
+        supprime les entrées les plus anciennes si le cache dépasse sa taille maximale. Un profil partagé par plusieurs
+        chaînes (le même objet) n'est enregistré qu'une fois.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        # indice de chaque profil distinct, dans l'ordre de première apparition
+        indices = {}
+        for profile in profiles.values():
+            indices.setdefault(id(profile), len(indices))
+        distinct = list({id(profile): profile for profile in profiles.values()}.values())
+        metadata = {
+            'pdb_file': pdb_file.to_dict(),
+            'profiles': [
+                {
+                    'frame_size': int(profile.abscissa_axe.min_value),
+                    'sequence_length': int(profile.abscissa_axe.max_value + profile.abscissa_axe.min_value),
+                    'minimum': profile.ordinate_axe.min_value,
+                    'maximum': profile.ordinate_axe.max_value,
+                    'picks': [(pick.start, pick.length, pick.minimum, pick.maximum) for pick in profile.picks],
+                }
+                for profile in distinct
+            ],
+            'chains': [(chain, indices[id(profile)]) for chain, profile in profiles.items()],
+        }
+        arrays = {f"scores_{index}": profile.scores for index, profile in enumerate(distinct)}
+
+        path = self._entry_path(file_hash, model_id, frame_size, edge_proportion)
+        # écrit dans un fichier temporaire pour qu'une entrée ne soit jamais lue à moitié écrite
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, 'wb') as f:
+            np.savez(f, metadata=np.frombuffer(json.dumps(metadata).encode(), dtype=np.uint8), **arrays)
+        os.replace(temporary_path, path)
+
+        self._evict()
+
+    def _evict(self) -> None:
+        """
+        Supprime les entrées les moins récemment utilisées jusqu'à ce que le cache respecte sa taille maximale.
+        """
+        entries = []
+        with os.scandir(self.directory) as iterator:
+            for entry in iterator:
+                if entry.name.endswith('.npz'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def stats(self) -> str:
+        """
+        Retourne le nombre de succès et d'échecs du cache sous forme de texte.
+        """
+        return f"cache: {self.hits} hits, {self.misses} misses"
@@ -0,0 +1,33 @@
+"""
+Sous-échantillonnage des profils pour l'affichage.
+
+La fonction min_max_indices découpe une série en seaux consécutifs et conserve, dans chaque seau, l'indice de la
+valeur minimale et celui de la valeur maximale (ainsi que le premier et le dernier point). La forme de la courbe, en
+particulier les pics, est donc préservée avec au plus 2 * buckets + 2 points, quel que soit le nombre de valeurs.
+"""
+
+import numpy as np
+
+
+def min_max_indices(values: np.ndarray, buckets: int) -> np.ndarray:
+    """
+    Retourne, triés, les indices des points à conserver pour afficher values avec buckets seaux. Si values contient
+    moins de 2 * buckets valeurs, tous les indices sont retournés.
+    """
+    size = len(values)
+    if buckets < 1 or size <= 2 * buckets:
+        return np.arange(size)
+
+    # complète la série avec sa dernière valeur pour obtenir des seaux de même taille
+    bucket_size = -(-size // buckets)
+    padded = np.empty(bucket_size * buckets, dtype=values.dtype)
+    padded[:size] = values
+    padded[size:] = values[-1]
+    grid = padded.reshape(buckets, bucket_size)
+
+    # indice du minimum et du maximum de chaque seau, dans la série complète
+    offsets = np.arange(buckets) * bucket_size
+    minima = np.minimum(grid.argmin(axis=1) + offsets, size - 1)
+    maxima = np.minimum(grid.argmax(axis=1) + offsets, size - 1)
+
+    return np.unique(np.concatenate(([0, size - 1], minima, maxima)))
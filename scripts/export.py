@@ -0,0 +1,170 @@
+"""
+Export binaire des profils, lisible sans analyse par les traitements en aval: les tableaux sont des fichiers .npy que
+numpy.load(..., mmap_mode='r') projette en mémoire sans les lire.
+
+Un export OUTPUT est formé de trois fichiers:
+    - OUTPUT_scores.npy: les scores de toutes les chaînes, mis bout à bout (float64, une dimension)
+    - OUTPUT_picks.npy: les pics de toutes les chaînes, mis bout à bout (tableau structuré PICK_DTYPE: start, end,
+        length, minimum, maximum)
+    - OUTPUT_manifest.json: version du format, noms des deux tableaux et colonnes des chaînes (une liste par colonne,
+        une valeur par chaîne dans l'ordre des tableaux): entry, chain, first_position, scores_offset, scores_count,
+        picks_offset et picks_count
+Les scores de la chaîne i sont scores[scores_offset[i]:scores_offset[i] + scores_count[i]] et ses positions sont
+consécutives à partir de first_position[i]; ses pics sont picks[picks_offset[i]:picks_offset[i] + picks_count[i]].
+
+Les tableaux sont écrits au fil du calcul, en un seul passage séquentiel: seul le manifeste est gardé en mémoire.
+L'en-tête de chaque fichier .npy est écrit avec une taille provisoire, puis réécrit en place à la fermeture (NumPy
+réserve dans l'en-tête la place nécessaire à toute taille).
+
+Utilisation:
+    - BinaryWriter(output) s'utilise comme les autres formats du mode batch (voir batch.py): write(entry, chain,
+        profile) pour chaque ChainProfile, puis close()
+    - BinaryExport(output) ouvre un export: ses attributs scores et picks sont projetés en mémoire, chains contient
+        les colonnes du manifeste, et les méthodes chain_scores et chain_picks retournent des vues (sans copie) sur les
+        données d'une chaîne
+"""
+
+import json
+import os
+
+import numpy as np
+
+# version du format, enregistrée dans le manifeste
+EXPORT_VERSION = 1
+
+# type des scores
+SCORE_DTYPE = np.dtype('<f8')
+
+# type d'un pic (positions du premier et du dernier acide aminé, length = end - start, comme pour Pick)
+PICK_DTYPE = np.dtype([('start', '<i8'), ('end', '<i8'), ('length', '<i8'), ('minimum', '<f8'), ('maximum', '<f8')])
+
+# taille du tampon d'écriture des tableaux (octets)
+BUFFER_SIZE = 1 << 20
+
+# colonnes des chaînes dans le manifeste
+MANIFEST_COLUMNS = ('entry', 'chain', 'first_position', 'scores_offset', 'scores_count', 'picks_offset',
+                    'picks_count')
+
+
+class _ArrayStream:
+    def __init__(self, path: str, dtype: np.dtype):
+        """
+        Fichier .npy à une dimension écrit par ajouts successifs.
+        """
+        self.path = path
+        self.dtype = dtype
+        self.count = 0
+        self._file = open(path, 'wb', buffering=BUFFER_SIZE)
+        self._write_header()
+        self._data_offset = self._file.tell()
+
+    def _write_header(self) -> None:
+        np.lib.format.write_array_header_1_0(self._file, {
+            'descr': np.lib.format.dtype_to_descr(self.dtype),
+            'fortran_order': False,
+            'shape': (self.count,),
+        })
+
+    def write(self, array: np.ndarray) -> None:
+        """
+        Ajoute les éléments d'un tableau (déjà du type du fichier et contigu) à la fin du fichier.
+        """
+        self._file.write(array.data)
+        self.count += len(array)
+
+    def close(self) -> None:
+        """
+        Réécrit l'en-tête avec la taille finale et ferme le fichier.
+        """
+        self._file.seek(0)
+        self._write_header()
+        if self._file.tell() != self._data_offset:
+            raise ValueError(f"{self.path}: array header size changed")
+        self._file.close()
+
+
+class BinaryWriter:
+    def __init__(self, output: str):
+        """
+        Écrit les scores dans OUTPUT_scores.npy, les pics dans OUTPUT_picks.npy et le manifeste dans
+        OUTPUT_manifest.json.
+        """
+        self._output = output
+        self._scores = _ArrayStream(f"{output}_scores.npy", SCORE_DTYPE)
+        self._picks = _ArrayStream(f"{output}_picks.npy", PICK_DTYPE)
+        self._chains = {name: [] for name in MANIFEST_COLUMNS}
+
+    def write(self, entry: str, chain: str, profile) -> None:
+        """
+        Ajoute le profil et les pics d'une chaîne (un ChainProfile, voir parallel.py) à la fin des tableaux.
+        """
+        scores = np.ascontiguousarray(profile.scores, dtype=SCORE_DTYPE)
+        picks = np.array([(pick.start, pick.start + pick.length, pick.length, pick.minimum, pick.maximum)
+                          for pick in profile.picks], dtype=PICK_DTYPE)
+        row = (entry, chain, profile.first_position, self._scores.count, len(scores), self._picks.count, len(picks))
+        for values, value in zip(self._chains.values(), row):
+            values.append(value)
+        self._scores.write(scores)
+        self._picks.write(picks)
+
+    def close(self) -> None:
+        """
+        Termine les tableaux et écrit le manifeste.
+        """
+        self._scores.close()
+        self._picks.close()
+        with open(f"{self._output}_manifest.json", 'w') as f:
+            # json.dumps utilise l'encodeur C, bien plus rapide que json.dump pour un grand manifeste
+            f.write(json.dumps({
+                'version': EXPORT_VERSION,
+                'scores': os.path.basename(self._scores.path),
+                'picks': os.path.basename(self._picks.path),
+                'chains': self._chains,
+            }))
+
+
+class BinaryExport:
+    def __init__(self, output: str):
+        """
+        Ouvre l'export OUTPUT: lit le manifeste et projette les tableaux en mémoire.
+        """
+        directory = os.path.dirname(output)
+        with open(f"{output}_manifest.json") as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('version') != EXPORT_VERSION:
+            raise ValueError(f"{output}: unsupported export version {self.manifest.get('version')}")
+        self.chains = self.manifest['chains']
+        self.scores = np.load(os.path.join(directory, self.manifest['scores']), mmap_mode='r')
+        self.picks = np.load(os.path.join(directory, self.manifest['picks']), mmap_mode='r')
+        self._index = None
+
+    def __len__(self) -> int:
+        return len(self.chains['entry'])
+
+    def row(self, entry: str, chain: str) -> int:
+        """
+        Retourne l'indice d'une chaîne dans les colonnes du manifeste (KeyError si elle n'a pas été exportée). Si la
+        même chaîne a été exportée plusieurs fois (plusieurs fichiers de même identifiant), le premier est retourné.
+        """
+        if self._index is None:
+            # construit au premier appel: un traitement qui parcourt les colonnes n'en a pas besoin
+            self._index = {}
+            for i, key in enumerate(zip(self.chains['entry'], self.chains['chain'])):
+                self._index.setdefault(key, i)
+        return self._index[(entry, chain)]
+
+    def chain_scores(self, entry: str, chain: str) -> np.ndarray:
+        """
+        Retourne les scores d'une chaîne, sans copie.
+        """
+        i = self.row(entry, chain)
+        offset = self.chains['scores_offset'][i]
+        return self.scores[offset:offset + self.chains['scores_count'][i]]
+
+    def chain_picks(self, entry: str, chain: str) -> np.ndarray:
+        """
+        Retourne les pics d'une chaîne (tableau structuré PICK_DTYPE), sans copie.
+        """
+        i = self.row(entry, chain)
+        offset = self.chains['picks_offset'][i]
+        return self.picks[offset:offset + self.chains['picks_count'][i]]
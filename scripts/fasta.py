@@ -0,0 +1,55 @@
+"""
+Lecture en flux des fichiers FASTA (multi-séquences, de taille quelconque, éventuellement compressés avec gzip).
+
+Utilisation:
+    - iter_fasta est un générateur qui produit un couple (identifiant, séquence) par enregistrement, au fil de la
+        lecture: seul l'enregistrement en cours est gardé en mémoire, un fichier de plusieurs dizaines de Go peut donc
+        être parcouru en mémoire constante
+        - identifiant: le premier mot de la ligne d'en-tête (après '>'), par exemple sp|P69905|HBA_HUMAN
+        - séquence: une EncodedSequence (voir residues.py), comme les chaînes de PDBFile.seqres, utilisable
+            directement par HydrophobicityProfile. Les codes à une lettre inconnus sont codés comme UNK et l'astérisque
+            final (codon stop) est ignoré
+    - La source peut être un chemin ou un flux déjà ouvert, texte ou binaire
+    - is_fasta indique si un chemin désigne un fichier FASTA, d'après FASTA_EXTENSIONS
+"""
+
+from scripts.pdb import open_text, read_lines
+from scripts.residues import EncodedSequence, encode_one_letter
+
+# extensions des fichiers FASTA, compressés ou non
+FASTA_EXTENSIONS = ('.fasta', '.fa', '.faa', '.fasta.gz', '.fa.gz', '.faa.gz')
+
+
+def is_fasta(path: str) -> bool:
+    """
+    Indique si un chemin désigne un fichier FASTA, d'après son extension.
+    """
+    return path.lower().endswith(FASTA_EXTENSIONS)
+
+
+def iter_fasta(source):
+    """
+    Génère un couple (identifiant, EncodedSequence) pour chaque enregistrement d'un fichier FASTA. Les lignes qui
+    précèdent le premier en-tête et les lignes de commentaire (';') sont ignorées.
+    """
+    identifier = None
+    lines = []
+    with open_text(source) as file:
+        for line in read_lines(file):
+            if line.startswith('>'):
+                if identifier is not None:
+                    yield identifier, _encode(lines)
+                words = line[1:].split(maxsplit=1)
+                identifier = words[0] if words else ""
+                lines = []
+            elif identifier is not None and not line.startswith(';'):
+                lines.append(line.strip())
+    if identifier is not None:
+        yield identifier, _encode(lines)
+
+
+def _encode(lines: list) -> EncodedSequence:
+    """
+    Code les lignes de séquence d'un enregistrement.
+    """
+    return EncodedSequence(encode_one_letter("".join(lines).rstrip('*')))
@@ -0,0 +1,242 @@
+"""
+Index SQLite d'un miroir local de la PDB, pour sélectionner les entrées à profiler sans relire les fichiers.
+
+Chaque fichier PDB (éventuellement compressé avec gzip) est lu une seule fois, jusqu'au premier enregistrement de
+coordonnées, en parallèle sur un pool de processus. L'index conserve pour chaque fichier:
+    - table entries: path (chemin absolu), mtime_ns, size, id, classification, date (AAAA-MM-JJ), title, authors
+        (séparés par des virgules), doi, pmid, chain_count, min_length, max_length et error (raison pour laquelle le
+        fichier n'a pas pu être lu, ou NULL)
+    - table chains: path, chain, length et sequence_hash (empreinte de la séquence, voir residues.sequence_hash)
+Une mise à jour ne relit que les fichiers nouveaux ou dont la date de modification ou la taille a changé, et retire de
+l'index les fichiers supprimés. Seuls les fichiers PDB sont indexés (ni les archives tar, ni les fichiers mmCIF ou
+FASTA).
+
+Utilisation (depuis la racine du projet):
+    python -m scripts.index MIROIR... [--database INDEX.sqlite] [--workers N] [--chunksize 16]
+    python -m scripts.index --query "classification LIKE '%MEMBRANE%' AND max_length >= 300"
+
+La requête est une condition SQL (clause WHERE) sur les colonnes de la table entries; les chaînes peuvent être
+filtrées par une sous-requête, par exemple:
+    path IN (SELECT path FROM chains WHERE sequence_hash = '...')
+Le mode batch accepte la même condition avec --query (voir batch.py).
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from scripts.cache import DEFAULT_DIRECTORY
+from scripts.pdb import PDB_EXTENSIONS, PDBFile, is_archive
+from scripts.residues import sequence_hash
+
+# chemin par défaut de l'index, à côté du cache des résultats
+DEFAULT_DATABASE = os.path.join(DEFAULT_DIRECTORY, 'index.sqlite')
+
+# version du schéma de l'index, à incrémenter lorsque les tables ou leur contenu changent
+INDEX_VERSION = 2
+
+# nombre de fichiers enregistrés entre deux validations de la transaction
+COMMIT_INTERVAL = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    id TEXT,
+    classification TEXT,
+    date TEXT,
+    title TEXT,
+    authors TEXT,
+    doi TEXT,
+    pmid TEXT,
+    chain_count INTEGER,
+    min_length INTEGER,
+    max_length INTEGER,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS chains (
+    path TEXT NOT NULL,
+    chain TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    sequence_hash TEXT NOT NULL,
+    PRIMARY KEY (path, chain)
+);
+CREATE INDEX IF NOT EXISTS entries_id ON entries (id);
+CREATE INDEX IF NOT EXISTS chains_sequence_hash ON chains (sequence_hash);
+"""
+
+
+def _iso_date(date: str):
+    """
+    Convertit une date d'en-tête PDB (JJ-MMM-AA) au format AAAA-MM-JJ, ou retourne None.
+    """
+    try:
+        return datetime.strptime(date, '%d-%b-%y').date().isoformat()
+    except ValueError:
+        return None
+
+
+def _index_file(item: tuple) -> tuple:
+    """
+    Lit un fichier et retourne la ligne de la table entries et les lignes de la table chains correspondantes.
+    """
+    path, mtime_ns, size = item
+    try:
+        pdb_file = PDBFile(path, sequence_only=True)
+    except (OSError, EOFError, UnicodeDecodeError, IndexError) as e:
+        return (path, mtime_ns, size, None, None, None, None, None, None, None, None, None, None, str(e)), []
+
+    header = pdb_file.header
+    journal = pdb_file.journal
+    lengths = [len(sequence) for sequence in pdb_file.seqres.values()]
+    entry = (
+        path, mtime_ns, size,
+        header.id if header is not None else None,
+        header.classification if header is not None else None,
+        _iso_date(header.date) if header is not None else None,
+        journal.title or None,
+        ", ".join(author.strip() for author in pdb_file.authors if author.strip()) or None,
+        journal.digital_object_identifier or None,
+        journal.pubmed_id or None,
+        len(lengths),
+        min(lengths, default=None),
+        max(lengths, default=None),
+        None,
+    )
+    chains = [(path, chain, len(sequence), sequence_hash(sequence.codes))
+              for chain, sequence in pdb_file.seqres.items()]
+    return entry, chains
+
+
+class MirrorIndex:
+    def __init__(self, path: str = DEFAULT_DATABASE):
+        """
+        Ouvre (ou crée) l'index SQLite path. Un index d'une autre version est reconstruit.
+        """
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+            self.connection.executescript(f"DROP TABLE IF EXISTS entries; DROP TABLE IF EXISTS chains; "
+                                          f"PRAGMA user_version = {INDEX_VERSION};")
+        self.connection.executescript(_SCHEMA)
+
+    def update(self, paths, workers: int = None, chunksize: int = 16) -> dict:
+        """
+        Indexe les fichiers paths nouveaux ou modifiés (date de modification ou taille différente) et retire de
+        l'index les fichiers qui n'existent plus. Les fichiers sont lus en parallèle (dans ce processus avec
+        workers=1). Les chemins sont enregistrés sous forme absolue: l'index ne dépend pas du répertoire courant.
+        Retourne le nombre de fichiers indexés, inchangés, retirés et illisibles.
+        """
+        known = {path: (mtime_ns, size)
+                 for path, mtime_ns, size in self.connection.execute("SELECT path, mtime_ns, size FROM entries")}
+        stats = {'indexed': 0, 'unchanged': 0, 'removed': 0, 'errors': 0}
+
+        changed = []
+        for path in paths:
+            if is_archive(path) or not path.lower().endswith(PDB_EXTENSIONS):
+                continue
+            path = os.path.abspath(path)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if known.get(path) == (stat.st_mtime_ns, stat.st_size):
+                stats['unchanged'] += 1
+            else:
+                changed.append((path, stat.st_mtime_ns, stat.st_size))
+
+        removed = [(path,) for path in known if not os.path.exists(path)]
+        with self.connection:
+            self.connection.executemany("DELETE FROM chains WHERE path = ?", removed)
+            self.connection.executemany("DELETE FROM entries WHERE path = ?", removed)
+        stats['removed'] = len(removed)
+
+        if workers == 1 or len(changed) <= 1:
+            self._store(map(_index_file, changed), stats)
+        else:
+            with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+                self._store(pool.map(_index_file, changed, chunksize=chunksize), stats)
+        return stats
+
+    def _store(self, results, stats: dict) -> None:
+        """
+        Enregistre les résultats de _index_file, en validant la transaction tous les COMMIT_INTERVAL fichiers.
+        """
+        try:
+            for entry, chains in results:
+                self.connection.execute("DELETE FROM chains WHERE path = ?", (entry[0],))
+                self.connection.execute(f"INSERT OR REPLACE INTO entries VALUES ({', '.join('?' * len(entry))})",
+                                        entry)
+                self.connection.executemany("INSERT INTO chains VALUES (?, ?, ?, ?)", chains)
+                stats['indexed'] += 1
+                stats['errors'] += entry[-1] is not None
+                if stats['indexed'] % COMMIT_INTERVAL == 0:
+                    self.connection.commit()
+        finally:
+            self.connection.commit()
+
+    def select(self, where: str = "1", parameters: tuple = ()) -> list:
+        """
+        Retourne, dans l'ordre alphabétique, le chemin des fichiers lisibles de l'index qui vérifient la condition SQL
+        where sur les colonnes de la table entries.
+        """
+        return [path for path, in self.connection.execute(
+            f"SELECT path FROM entries WHERE error IS NULL AND ({where}) ORDER BY path", parameters)]
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def main(argv: list = None) -> int:
+    """
+    Point d'entrée de l'indexation.
+    """
+    # import local: batch importe ce module pour son option --query
+    from scripts.batch import iter_pdb_paths
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('inputs', nargs='*', help="répertoires, fichiers PDB ou motifs glob à indexer")
+    parser.add_argument('--database', '-d', default=DEFAULT_DATABASE,
+                        help=f"index SQLite (défaut: {DEFAULT_DATABASE})")
+    parser.add_argument('--workers', '-j', type=int, default=None,
+                        help="nombre de processus (défaut: nombre de cœurs, 1 pour tout lire dans ce processus)")
+    parser.add_argument('--chunksize', type=int, default=16,
+                        help="nombre de fichiers envoyés à un processus à la fois (défaut: 16)")
+    parser.add_argument('--query', '-q', help="affiche les fichiers qui vérifient cette condition SQL")
+    args = parser.parse_args(argv)
+
+    if not args.inputs and args.query is None:
+        parser.error("at least one input or --query is required")
+
+    index = MirrorIndex(args.database)
+    try:
+        if args.inputs:
+            start = time.perf_counter()
+            stats = index.update(iter_pdb_paths(args.inputs), workers=args.workers, chunksize=args.chunksize)
+            print(f"{stats['indexed']} files indexed ({stats['errors']} unreadable), {stats['unchanged']} unchanged, "
+                  f"{stats['removed']} removed in {time.perf_counter() - start:.2f} s", file=sys.stderr)
+
+        if args.query is not None:
+            start = time.perf_counter()
+            try:
+                paths = index.select(args.query)
+            except sqlite3.Error as e:
+                print(f"Invalid query: {e}", file=sys.stderr)
+                return 1
+            for path in paths:
+                print(path)
+            print(f"{len(paths)} files selected in {(time.perf_counter() - start) * 1000:.1f} ms", file=sys.stderr)
+    finally:
+        index.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
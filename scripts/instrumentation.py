@@ -0,0 +1,194 @@
+"""
+Instrumentation optionnelle des étapes de l'application par des intervalles nommés (spans).
+
+Utilisation:
+    - Activer l'instrumentation avec enable(), ou en définissant la variable d'environnement HYDROPHOBICITY_TRACE avec
+        le chemin d'un fichier de trace: la trace y est alors écrite à la fin du programme et le tableau récapitulatif
+        est affiché sur la sortie d'erreur
+    - Entourer une étape avec span:
+        with span("PDBFile.__init__", path=path):
+            ...
+    - Chaque intervalle enregistre sa durée réelle, le temps CPU du thread et la variation de la mémoire allouée
+        (tracemalloc, démarré par enable)
+    - export_chrome_trace écrit les intervalles au format Chrome trace (JSON), lisible par chrome://tracing, Perfetto et
+        speedscope, et summary retourne un tableau récapitulatif par nom d'intervalle
+    - Lorsque l'instrumentation est désactivée, span retourne un objet partagé qui ne fait rien: le coût se limite à un
+        appel de fonction
+    - Seuls les intervalles du processus courant sont enregistrés (pas ceux des processus de parallel.py)
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+# variable d'environnement qui active l'instrumentation et désigne le fichier de trace écrit à la fin du programme
+TRACE_ENVIRONMENT_VARIABLE = 'HYDROPHOBICITY_TRACE'
+
+_enabled = False
+_records = []
+_lock = threading.Lock()
+# origine des horodatages de la trace
+_origin = time.perf_counter_ns()
+
+
+class SpanRecord:
+    __slots__ = ('name', 'thread', 'start', 'duration', 'cpu', 'memory', 'args')
+
+    def __init__(self, name: str, thread: int, start: int, duration: int, cpu: int, memory: int, args: dict):
+        """
+        Intervalle terminé: début et durée réelle, temps CPU (en nanosecondes) et variation de la mémoire allouée (en
+        octets).
+        """
+        self.name = name
+        self.thread = thread
+        self.start = start
+        self.duration = duration
+        self.cpu = cpu
+        self.memory = memory
+        self.args = args
+
+
+class _Span:
+    __slots__ = ('name', 'args', 'start', 'cpu', 'memory')
+
+    def __init__(self, name: str, args: dict):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.memory = tracemalloc.get_traced_memory()[0]
+        self.cpu = time.thread_time_ns()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *_):
+        end = time.perf_counter_ns()
+        cpu = time.thread_time_ns() - self.cpu
+        memory = tracemalloc.get_traced_memory()[0] - self.memory
+        record = SpanRecord(self.name, threading.get_ident(), self.start - _origin, end - self.start, cpu, memory,
+                            self.args)
+        with _lock:
+            _records.append(record)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        return False
+
+
+# intervalle partagé retourné lorsque l'instrumentation est désactivée
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, **args):
+    """
+    Retourne un gestionnaire de contexte qui enregistre l'intervalle name (avec les arguments args, affichés dans la
+    trace) si l'instrumentation est activée.
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, args)
+
+
+def enable() -> None:
+    """
+    Active l'instrumentation et démarre le suivi des allocations.
+    """
+    global _enabled
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _enabled = True
+
+
+def disable() -> None:
+    """
+    Désactive l'instrumentation. Les intervalles déjà enregistrés sont conservés.
+    """
+    global _enabled
+    _enabled = False
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def records() -> list:
+    """
+    Retourne une copie des intervalles enregistrés.
+    """
+    with _lock:
+        return list(_records)
+
+
+def clear() -> None:
+    """
+    Oublie les intervalles enregistrés.
+    """
+    with _lock:
+        _records.clear()
+
+
+def export_chrome_trace(path: str) -> None:
+    """
+    Écrit les intervalles enregistrés au format Chrome trace (événements complets, horodatages en microsecondes).
+    """
+    pid = os.getpid()
+    events = [
+        {
+            'name': record.name,
+            'ph': 'X',
+            'ts': record.start / 1000,
+            'dur': record.duration / 1000,
+            'pid': pid,
+            'tid': record.thread,
+            'args': {'cpu_ms': record.cpu / 1e6, 'allocated_bytes': record.memory,
+                     **{key: str(value) for key, value in record.args.items()}},
+        }
+        for record in records()
+    ]
+    with open(path, 'w') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+def summary() -> str:
+    """
+    Retourne un tableau récapitulatif par nom d'intervalle (nombre, durées réelle totale et maximale, temps CPU total
+    et variation totale de la mémoire allouée), trié par durée totale décroissante.
+    """
+    totals = {}
+    for record in records():
+        count, wall, longest, cpu, memory = totals.get(record.name, (0, 0, 0, 0, 0))
+        totals[record.name] = (count + 1, wall + record.duration, max(longest, record.duration), cpu + record.cpu,
+                               memory + record.memory)
+
+    width = max([len(name) for name in totals] + [4])
+    lines = [f"{'span':<{width}} {'count':>7} {'wall (ms)':>11} {'max (ms)':>10} {'cpu (ms)':>10} {'alloc (KiB)':>12}"]
+    for name, (count, wall, longest, cpu, memory) in sorted(totals.items(), key=lambda item: -item[1][1]):
+        lines.append(f"{name:<{width}} {count:>7} {wall / 1e6:>11.2f} {longest / 1e6:>10.2f} {cpu / 1e6:>10.2f} "
+                     f"{memory / 1024:>12.1f}")
+    return "\n".join(lines)
+
+
+def _write_trace_at_exit(path: str) -> None:
+    """
+    Écrit la trace dans path et affiche le tableau récapitulatif à la fin du programme.
+    """
+    export_chrome_trace(path)
+    print(summary(), file=sys.stderr)
+
+
+if os.environ.get(TRACE_ENVIRONMENT_VARIABLE):
+    enable()
+    atexit.register(_write_trace_at_exit, os.environ[TRACE_ENVIRONMENT_VARIABLE])
@@ -1,13 +1,131 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import flet as ft
 
-from scripts.profile_generation import HydrophobicityProfile
+from scripts.cache import ResultCache
+from scripts.downsampling import min_max_indices
+from scripts.instrumentation import span
+from scripts.profile_generation import (HydrophobicityProfile, ModelFormatError, encode_sequence,
+                                       group_identical_chains)
 from scripts.pdb import PDBFile
 
+# Cache des résultats partagé par toutes les fenêtres de l'application.
+RESULT_CACHE = ResultCache()
+
+# Nombre de points affichés par série si la largeur de la page est inconnue.
+DEFAULT_CHART_POINTS = 1000
+
+# Exécuteur partagé qui calcule les profils des chaînes en dehors du thread de l'interface.
+PROFILE_EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# Délai (en secondes) sans mouvement des curseurs de paramètres avant de recalculer les profils.
+TUNING_DELAY = 0.03
+
+# Taille de fenêtre maximale proposée par le curseur de la vue du profil.
+MAX_TUNING_WINDOW = 100
+
+
+def build_chart_points(profile: HydrophobicityProfile, start: int = None, stop: int = None,
+                       max_points: int = None) -> list:
+    """ Construit les points du graphique d'un profil entre les acides aminés start (inclus) et stop (exclu). Seuls les
+    points effectivement affichés sont créés: au-delà de max_points, la série est sous-échantillonnée en conservant le
+    minimum et le maximum de chaque intervalle. """
+
+    # convertit les bornes en indices dans les tableaux du profil
+    first = 0 if start is None else max(int(start) - int(profile.abscissa_axe.min_value), 0)
+    last = len(profile.scores) if stop is None else max(int(stop) - int(profile.abscissa_axe.min_value), 0)
+    positions = profile.positions[first:last]
+    scores = profile.scores[first:last]
+
+    # sous-échantillonne la série si elle a plus de points que l'espace disponible à l'écran
+    if max_points is not None and len(scores) > max_points:
+        indices = min_max_indices(scores, max_points // 2)
+        positions = positions[indices]
+        scores = scores[indices]
+
+    return [
+        ft.LineChartDataPoint(position, value, tooltip=str(round(value, 4)))
+        for position, value in zip(positions.tolist(), scores.tolist())
+    ]
+
+
+class ProfileGeneration:
+    def __init__(self, path: str, model_id: int, model_name: str, window_size: int, weighting: float):
+        """ État d'un calcul de profils lancé depuis l'interface: paramètres, résultats déjà calculés, demande
+        d'annulation et références vers les contrôles de la vue du profil. """
+
+        self.path = path
+        self.model_id = model_id
+        self.model_name = model_name
+        self.window_size = window_size
+        self.weighting = weighting
+        self.cancelled = threading.Event()
+
+        self.pdb_file = None
+        self.sequences = {}  # Séquences encodées de chaque chaîne, conservées pour recalculer les profils.
+        self.chain_groups = {}  # Chaînes de même séquence, par chaîne représentante: un seul profil et une seule série.
+        self.profiles = {}  # Profils déjà calculés, dans l'ordre où ils ont été terminés.
+        self.scale_profiles = {}  # Profils des autres échelles, par (chaîne, indice du modèle), calculés à la demande.
+        self.shown_scales = set()  # Indices des modèles dont les profils sont superposés au graphique.
+        self.hidden_chains = set()  # Chaînes représentantes masquées avec les commutateurs (un par groupe).
+        self.data_list = []  # Séries du graphique principal.
+        self.visible_range = None  # Intervalle (début, fin) d'acides aminés affiché, None pour tout le profil.
+
+        # Derniers paramètres demandés avec les curseurs, recalcul différé et verrou qui sérialise les recalculs.
+        self.requested = (window_size, weighting)
+        self.tuning_timer = None
+        self.tuning_lock = threading.Lock()
+
+        # Références aux éléments d'interface qui seront actualisés ou manipulés.
+        self.view = None
+        self.title = ft.Ref[ft.Text]()
+        self.export_button = ft.Ref[ft.IconButton]()
+        self.progress_row = ft.Ref[ft.Row]()
+        self.progress = ft.Ref[ft.ProgressBar]()
+        self.progress_text = ft.Ref[ft.Text]()
+        self.cancel_button = ft.Ref[ft.TextButton]()
+        self.switches = ft.Ref[ft.ListView]()
+        self.chart_panel = ft.Ref[ft.Column]()
+        self.chart = ft.Ref[ft.LineChart]()
+        self.range_slider = ft.Ref[ft.RangeSlider]()
+        self.tuning_row = ft.Ref[ft.Row]()
+        self.scales_row = ft.Ref[ft.Row]()
+        self.window_slider = ft.Ref[ft.Slider]()
+        self.weighting_slider = ft.Ref[ft.Slider]()
+        self.details = ft.Ref[ft.ListView]()
+
+    def cancel(self):
+        """ Demande l'arrêt du calcul: les chaînes pas encore commencées ne seront pas calculées. """
+        self.cancelled.set()
+        if self.tuning_timer is not None:
+            self.tuning_timer.cancel()
+
+    def ordered_profiles(self) -> dict:
+        """ Retourne les profils calculés dans l'ordre des chaînes du fichier PDB. """
+        return {chain: self.profiles[chain] for chain in self.pdb_file.seqres if chain in self.profiles}
+
+    def series_profile(self, key) -> HydrophobicityProfile:
+        """ Retourne le profil d'une série du graphique: key est une chaîne pour le modèle choisi, ou un couple
+        (chaîne, indice du modèle) pour une autre échelle. """
+        return self.profiles[key] if isinstance(key, str) else self.scale_profiles[key]
+
+    def visible_profiles(self) -> list:
+        """ Retourne les profils des séries affichées, pour ajuster les axes du graphique. """
+        profiles = [self.profiles[chain] for chain in self.chain_groups
+                    if chain in self.profiles and chain not in self.hidden_chains]
+        profiles.extend(profile for (chain, model), profile in self.scale_profiles.items()
+                        if chain not in self.hidden_chains and model in self.shown_scales)
+        return profiles or list(self.profiles.values())
+
 
 class FletApp:
     def __init__(self, page):
         # Initialisation de l'instance avec la page de l'application.
         self.page = page
+        # Calcul de profils en cours ou affiché (aucun au démarrage).
+        self.generation = None
         # Définir le titre de la page web.
         self.page.title = "Protein Hydrophobicity Profiler"
         # Centrer les contrôles dans la page verticalement.
@@ -36,13 +154,21 @@ class FletApp:
             )
         )
 
-        # Obtenir les noms des modèles d'hydrophobicité disponibles pour le choix de l'utilisateur.
-        models_name = HydrophobicityProfile.get_models_names()
+        # Boîte de dialogue pour choisir le fichier d'export des profils affichés.
+        self.export_dialog = ft.Ref[ft.FilePicker]()
+        self.page.overlay.append(
+            ft.FilePicker(
+                on_result=self._export_result,
+                ref=self.export_dialog
+            )
+        )
 
         # Définir une fonction callback pour gérer le retour en arrière dans l'interface.
         self.page.on_view_pop = self.view_pop
 
-        # Ajouter une vue principale avec divers contrôles.
+        # Ajouter une vue principale avec divers contrôles, à la place de l'indicateur de chargement affiché au
+        # démarrage.
+        self.page.views.clear()
         self.page.views.append(
             ft.View(
                 "/",  # Route de la vue principale.
@@ -71,7 +197,7 @@ class FletApp:
                                         text="Select a PDB file to begin",
                                         on_click=lambda _: pick_files_dialog.current.pick_files(
                                             allow_multiple=False,
-                                            allowed_extensions=["pdb"],
+                                            allowed_extensions=["pdb", "ent", "gz"],
                                             dialog_title="Select a PDB file to begin",
                                             file_type=ft.FilePickerFileType.CUSTOM,
                                         )
@@ -121,15 +247,14 @@ class FletApp:
                                     on_change=lambda e: self._check_parameters(validate_button, weighting, window_size,
                                                                                model)
                                 ),
-                                # Liste déroulante pour choisir le modèle hydrophobicité.
+                                # Liste déroulante pour choisir le modèle hydrophobicité, remplie par _load_models.
                                 ft.Dropdown(
                                     border_radius=20,
                                     ref=model,
                                     label="Model",
-                                    hint_text="Choose a model",
-                                    options=[
-                                        ft.dropdown.Option(str(i), models_name[i]) for i in range(len(models_name))
-                                    ],
+                                    hint_text="Loading models...",
+                                    options=[],
+                                    disabled=True,
                                     color=ft.colors.ON_SECONDARY_CONTAINER,
                                     filled=True,
                                     on_change=lambda _: self._check_parameters(validate_button, weighting, window_size,
@@ -174,10 +299,33 @@ class FletApp:
         # Charger la route initiale.
         self.page.go("/")
 
+        # Charger et valider les modèles en arrière-plan: la vue principale est affichée sans les attendre.
+        self.page.run_thread(self._load_models, model)
+
+    def _load_models(self, model: ft.Ref[ft.Dropdown]):
+        """ Charge les modèles d'hydrophobicité disponibles et les ajoute à la liste déroulante, ou y affiche l'erreur
+        rencontrée dans models.json. """
+
+        with span("FletApp.load_models"):
+            try:
+                models_name = HydrophobicityProfile.get_models_names()
+            except (OSError, ValueError, ModelFormatError) as e:
+                model.current.hint_text = "No model available"
+                model.current.error_text = str(e)
+            else:
+                model.current.options = [ft.dropdown.Option(str(i), name) for i, name in enumerate(models_name)]
+                model.current.hint_text = "Choose a model"
+                model.current.disabled = False
+            self.page.update()
+
     def view_pop(self, _: ft.ViewPopEvent):
         """Cette méthode gère l'événement de retour arrière dans l'application. Elle supprime la vue actuelle de la
         pile et charge la vue précédente."""
 
+        # Annule le calcul de profils en cours si l'on quitte sa vue.
+        if self.generation is not None and self.page.views[-1] is self.generation.view:
+            self.generation.cancel()
+
         self.page.views.pop()   # Retire la vue actuelle de la pile.
         self.page.go(self.page.views[-1].route)  # Navigue à la vue précédente.
 
@@ -256,39 +404,133 @@ class FletApp:
     def _generate_profile(self, page_dialog: ft.Ref[ft.AlertDialog], weighting: ft.Ref[ft.TextField],
                           window_size: ft.Ref[ft.TextField], model: ft.Ref[ft.Dropdown],
                           validate_button: ft.Ref[ft.FilledButton], err_dialog: ft.Ref[ft.SnackBar]):
-        """ Génère un profil d'hydrophobicité à partir des paramètres choisis. """
+        """ Génère un profil d'hydrophobicité à partir des paramètres choisis. La vue du profil est affichée
+        immédiatement et les profils sont calculés en arrière-plan. """
 
         # Copie des valeurs des contrôles d'entrée pour assurer l'utilisation de types de données corrects.
         model_copy = int(model.current.value)  # Convertit la valeur du modèle en entier.
         window_size_copy = int(window_size.current.value)  # Convertit la taille de la fenêtre en entier.
         weighting_copy = float(weighting.current.value) / 100  # Convertit le poids en flottant et normalise par 100.
+        model_name = model.current.options[model_copy].text  # Nom du modèle, affiché dans les paramètres.
 
         # Ferme la boîte de dialogue de paramètres une fois que les valeurs sont récupérées.
         self._switch_dialog(page_dialog, weighting, window_size, model, validate_button)
 
-        # Crée une instance de PDBFile pour traiter le fichier PDB sélectionné.
-        pdb_file = PDBFile(self.path)
+        # Annule un éventuel calcul précédent encore en cours.
+        if self.generation is not None:
+            self.generation.cancel()
+        generation = ProfileGeneration(self.path, model_copy, model_name, window_size_copy, weighting_copy)
+        self.generation = generation
+
+        # Affiche la vue du profil, vide, puis lance le calcul en arrière-plan.
+        with span("_generate_profile.build_view"):
+            generation.view = self._build_profile_view(generation)
+            self.page.views.append(generation.view)
+            self.page.go("/profile")
+        self.page.run_thread(self._run_generation, generation, err_dialog)
+
+    def _run_generation(self, generation: "ProfileGeneration", err_dialog: ft.Ref[ft.SnackBar]):
+        """ Calcule les profils en arrière-plan et affiche l'erreur éventuelle à la place de la progression. """
+
+        try:
+            with span("_generate_profile.generate_chains", path=generation.path):
+                self._generate_chains(generation, err_dialog)
+        except Exception as e:
+            self._set_progress(generation, None, f"Error: {e}", done=True)
+
+    def _generate_chains(self, generation: "ProfileGeneration", err_dialog: ft.Ref[ft.SnackBar]):
+        """ Lit le fichier et calcule les profils. Chaque chaîne est ajoutée au graphique dès que son profil est
+        calculé. """
+
+        # Consulte le cache avant de lire le fichier et de calculer les profils.
+        self._set_progress(generation, None, "Reading the PDB file...")
+        with span("_generate_profile.cache_lookup"):
+            file_hash = RESULT_CACHE.hash_file(generation.path)
+            cached = RESULT_CACHE.get(file_hash, generation.model_id, generation.window_size, generation.weighting)
+        if cached is not None:
+            pdb_file, profiles = cached
+        else:
+            # Crée une instance de PDBFile pour traiter le fichier PDB sélectionné.
+            pdb_file = PDBFile(generation.path, sequence_only=True)
+            profiles = None
 
         # Vérifie si la taille de la séquence est adéquate pour la taille de fenêtre choisie.
         for chain, sequence in pdb_file.seqres.items():
-            if len(sequence) < window_size_copy:
-                # Si une séquence est trop courte, affiche une erreur et cesse le traitement.
-                err_dialog.current.open = True
-                err_dialog.current.update()
+            if len(sequence) < generation.window_size:
+                # Si une séquence est trop courte, revient à l'accueil, affiche une erreur et cesse le traitement.
+                self._abort_generation(generation, err_dialog)
                 return
 
-        profile_list = []
-        # Génère des profils pour chaque chaîne de protéine trouvée dans le fichier PDB.
-        for chain, sequence in pdb_file.seqres.items():
-            profile = HydrophobicityProfile(sequence, model_copy, window_size_copy, weighting_copy)
-            profile_list.append((chain, profile))
+        generation.pdb_file = pdb_file
+        # Encode les séquences une seule fois: elles servent aussi aux recalculs depuis les curseurs de paramètres.
+        generation.sequences = {chain: encode_sequence(sequence) for chain, sequence in pdb_file.seqres.items()}
+        # Les chaînes de même séquence (homo-oligomères, capsides...) partagent un seul profil.
+        generation.chain_groups = group_identical_chains(generation.sequences)
+        generation.title.current.value = f"{pdb_file.journal.title}"
+
+        if profiles is not None:
+            # Tous les profils sont déjà disponibles dans le cache.
+            for chain in generation.chain_groups:
+                self._add_chain(generation, chain, profiles[chain])
+        else:
+            # Génère, en parallèle, un profil pour chaque séquence distincte trouvée dans le fichier PDB.
+            futures = {
+                PROFILE_EXECUTOR.submit(HydrophobicityProfile, generation.sequences[chain], generation.model_id,
+                                        generation.window_size, generation.weighting): chain
+                for chain in generation.chain_groups
+            }
+            self._set_progress(generation, 0, f"0 / {len(generation.sequences)} chains")
+            for future in as_completed(futures):
+                if generation.cancelled.is_set():
+                    # Annule les chaînes qui n'ont pas encore commencé.
+                    for pending in futures:
+                        pending.cancel()
+                    break
+                self._add_chain(generation, futures[future], future.result())
+
+            if generation.cancelled.is_set():
+                self._set_progress(generation, None, f"Cancelled after {len(generation.profiles)} / "
+                                                     f"{len(generation.sequences)} chains", done=True)
+                return
+
+            # Met les profils en cache, dans l'ordre des chaînes du fichier.
+            with span("_generate_profile.cache_store"):
+                RESULT_CACHE.put(file_hash, generation.model_id, generation.window_size, generation.weighting,
+                                 pdb_file, generation.ordered_profiles())
 
-        data_list = []
-        # Prépare les données pour le graphique de ligne de chaque profil généré.
-        for chain, profile in profile_list:
-            data_list.append(
+        self._finish_generation(generation)
+
+    def _abort_generation(self, generation: "ProfileGeneration", err_dialog: ft.Ref[ft.SnackBar]):
+        """ Retire la vue du profil et affiche la boîte d'erreur sur la vue principale. """
+
+        if self.page.views[-1] is generation.view:
+            self.page.views.pop()
+            self.page.go(self.page.views[-1].route)
+        err_dialog.current.open = True
+        err_dialog.current.update()
+
+    def _set_progress(self, generation: "ProfileGeneration", value, text: str, done: bool = False):
+        """ Met à jour la barre de progression (value à None pour une progression indéterminée). """
+
+        generation.progress.current.value = value
+        generation.progress_text.current.value = text
+        generation.cancel_button.current.visible = not done
+        if done:
+            generation.progress.current.value = 0 if value is None else value
+        self.page.update()
+
+    def _add_chain(self, generation: "ProfileGeneration", chain: str, profile: HydrophobicityProfile):
+        """ Ajoute le profil d'une chaîne représentante au graphique, en une seule série, et un commutateur pour le
+        groupe des chaînes de même séquence, qui affiche ou masque cette série. """
+
+        with span("_generate_profile.add_chain", chain=chain):
+            members = generation.chain_groups.get(chain, [chain])
+            for member in members:
+                generation.profiles[member] = profile
+            start, stop = generation.visible_range or (None, None)
+            generation.data_list.append(
                 ft.LineChartData(
-                    data_points=profile.points,
+                    data_points=build_chart_points(profile, start, stop, self._chart_points_count()),
                     stroke_width=2,
                     curved=True,
                     stroke_cap_round=True,
@@ -299,296 +541,635 @@ class FletApp:
                 )
             )
 
-        # Références aux éléments d'interface qui seront actualisés ou manipulés.
-        switch_ref = ft.Ref[ft.Row]()
-        line_chart_ref = ft.Ref[ft.LineChart]()
-        list_view_ref = ft.Ref[ft.ListView]()
+            # Élargit les axes du graphique pour inclure la nouvelle chaîne.
+            self._fit_axes(generation)
 
-        # Ajoute une nouvelle vue au gestionnaire de vue qui affiche les résultats.
-        self.page.views.append(
-            ft.View(
-                route="/profile",
-                controls=[
-                    # Barre d'applications avec le titre du journal.
-                    ft.AppBar(title=ft.Text(value=f"{pdb_file.journal.title}")),
+            generation.switches.current.controls.append(
+                ft.Switch(
+                    label=(f"Show chains {', '.join(members)} (same sequence)" if len(members) > 1
+                           else f"Show chain {chain}"),
+                    active_color=self._get_color_by_chain(chain),
+                    value=True,
+                    data=chain,
+                    on_change=lambda e: self._show_hide_chains(e, generation)
+                )
+            )
 
-                    ft.Column(
-                        [
+            total = len(generation.pdb_file.seqres)
+            self._set_progress(generation, len(generation.profiles) / total,
+                               f"{len(generation.profiles)} / {total} chains")
 
-                            # Conteneur pour la barre de navigation.
-                            ft.Container(
-                                content=ft.NavigationBar(
-                                    destinations=[
-                                        # Option de profil d'hydrophobicité.
-                                        ft.NavigationDestination(icon=ft.icons.STACKED_LINE_CHART_ROUNDED,
-                                                                 label="Hydrophobicity Profile"),
-
-                                        # Option de détails.
-                                        ft.NavigationDestination(icon=ft.icons.INFO_ROUNDED,
-                                                                 label="Details")
-                                    ],
-                                    on_change=lambda e: self._switch_content(e, line_chart_ref, switch_ref,
-                                                                             list_view_ref),
-                                    width=self.page.width / 2
-                                ),
-                                border_radius=20
-                            ),
+    def _finish_generation(self, generation: "ProfileGeneration"):
+        """ Construit les détails une fois tous les profils calculés et masque la barre de progression. """
+
+        with span("_generate_profile.finish"):
+            generation.details.current.controls = [
+                self._build_details_panels(generation.pdb_file, list(generation.ordered_profiles().items()),
+                                           generation.model_name, generation.window_size, generation.weighting)
+            ]
+            generation.progress_row.current.visible = False
+
+            # Active l'export des profils, qui sont désormais tous calculés.
+            generation.export_button.current.disabled = False
+
+            # Active le curseur de zoom sur l'intervalle complet des profils.
+            self._fit_range_slider(generation)
+
+            # Active les curseurs de paramètres, la fenêtre étant limitée par la plus courte des chaînes.
+            shortest = min(len(sequence) for sequence in generation.sequences.values())
+            window_slider = generation.window_slider.current
+            window_slider.max = max(min((shortest - 1) // 2, MAX_TUNING_WINDOW), generation.window_size, 2)
+            window_slider.divisions = window_slider.max - 1
+            window_slider.value = generation.window_size
+            generation.weighting_slider.current.value = generation.weighting * 100
+            generation.tuning_row.current.visible = True
+
+            # Commutateurs qui superposent au graphique les profils des autres échelles d'hydrophobicité.
+            generation.scales_row.current.controls = [
+                ft.Switch(
+                    label=name,
+                    value=False,
+                    on_change=lambda e, index=index: self._toggle_scale(e, generation, index)
+                ) for index, name in enumerate(HydrophobicityProfile.get_models_names())
+                if index != generation.model_id
+            ]
+            generation.scales_row.current.visible = True
+            self.page.update()
+
+    def _fit_axes(self, generation: "ProfileGeneration"):
+        """ Ajuste les axes du graphique aux profils affichés (l'axe des abscisses seulement en l'absence de zoom). """
+
+        profiles = generation.visible_profiles()
+        chart = generation.chart.current
+        chart.min_y = min(profile.ordinate_axe.min_value for profile in profiles)
+        chart.max_y = max(profile.ordinate_axe.max_value for profile in profiles)
+        if generation.visible_range is None:
+            chart.min_x = min(profile.abscissa_axe.min_value for profile in profiles)
+            chart.max_x = max(profile.abscissa_axe.max_value for profile in profiles)
+        else:
+            chart.min_x, chart.max_x = generation.visible_range[0], generation.visible_range[1] - 1
+
+    def _fit_range_slider(self, generation: "ProfileGeneration"):
+        """ Ajuste les bornes du curseur de zoom à l'intervalle complet des profils, en conservant le zoom courant
+        s'il reste compris dans ces bornes. """
+
+        profiles = generation.profiles.values()
+        first = min(profile.abscissa_axe.min_value for profile in profiles)
+        last = max(profile.abscissa_axe.max_value for profile in profiles)
+        slider = generation.range_slider.current
+        if first >= last:
+            slider.visible = False
+            return
+
+        slider.min, slider.max = first, last
+        if generation.visible_range is None:
+            slider.start_value, slider.end_value = first, last
+        else:
+            start, stop = generation.visible_range
+            slider.start_value = min(max(start, first), last)
+            slider.end_value = min(max(stop - 1, slider.start_value), last)
+            generation.visible_range = (int(slider.start_value), int(slider.end_value) + 1)
+        slider.visible = True
+
+    def _toggle_scale(self, e: ft.ControlEvent, generation: "ProfileGeneration", model_index: int):
+        """ Affiche ou masque les profils d'une autre échelle. Au premier affichage, les profils de toutes les échelles
+        sont calculés en une passe par chaîne: les changements suivants ne font que modifier la visibilité. """
+
+        with generation.tuning_lock:
+            if e.control.value:
+                generation.shown_scales.add(model_index)
+            else:
+                generation.shown_scales.discard(model_index)
+
+            if e.control.value and not generation.scale_profiles:
+                self._score_scales(generation)
+                start, stop = generation.visible_range or (None, None)
+                for chain, model in generation.scale_profiles:
+                    generation.data_list.append(
+                        ft.LineChartData(
+                            data_points=build_chart_points(generation.scale_profiles[(chain, model)], start, stop,
+                                                           self._chart_points_count()),
+                            stroke_width=1,
+                            curved=True,
+                            color=self._get_color_by_chain(chain),
+                            dash_pattern=[2 + 3 * model, 3],
+                            data=(chain, model),
+                        )
+                    )
+
+            self._apply_visibility(generation)
+            self._fit_axes(generation)
+            self.page.update()
+
+    def _score_scales(self, generation: "ProfileGeneration"):
+        """ Calcule, en une passe par séquence distincte, les profils de toutes les échelles autres que le modèle
+        choisi. """
+
+        for chain in generation.chain_groups:
+            multi_scale = HydrophobicityProfile.multi_scale(generation.sequences[chain], generation.window_size,
+                                                            generation.weighting)
+            for model in multi_scale.models:
+                if model.index != generation.model_id:
+                    generation.scale_profiles[(chain, model.index)] = multi_scale.profile(model.index)
+
+    @staticmethod
+    def _apply_visibility(generation: "ProfileGeneration"):
+        """ Affiche les séries des chaînes non masquées: celles du modèle choisi et celles des échelles affichées. """
+
+        for data in generation.data_list:
+            chain, model = (data.data, None) if isinstance(data.data, str) else data.data
+            data.visible = chain not in generation.hidden_chains and (model is None or model in generation.shown_scales)
+
+    def _tune(self, generation: "ProfileGeneration"):
+        """ Enregistre les paramètres choisis avec les curseurs et diffère le recalcul: les mouvements rapprochés des
+        curseurs sont regroupés en un seul calcul. """
+
+        generation.requested = (int(generation.window_slider.current.value),
+                                round(generation.weighting_slider.current.value) / 100)
+        if generation.tuning_timer is not None:
+            generation.tuning_timer.cancel()
+        generation.tuning_timer = threading.Timer(TUNING_DELAY, self._retune, (generation,))
+        generation.tuning_timer.daemon = True
+        generation.tuning_timer.start()
+
+    def _retune(self, generation: "ProfileGeneration"):
+        """ Recalcule les profils avec les derniers paramètres demandés, à partir des séquences déjà encodées: seuls le
+        calcul des fenêtres et la détection des pics sont refaits. Le graphique est mis à jour avant les détails. """
+
+        with generation.tuning_lock, span("_retune"):
+            # Les paramètres sont lus sous le verrou: un recalcul en attente utilise toujours les plus récents.
+            window_size, weighting = generation.requested
+            if generation.cancelled.is_set() or (window_size, weighting) == (generation.window_size,
+                                                                               generation.weighting):
+                return
+
+            # Un seul profil par séquence distincte, partagé par les chaînes de même séquence.
+            profiles = {}
+            for chain, members in generation.chain_groups.items():
+                profile = HydrophobicityProfile(generation.sequences[chain], generation.model_id, window_size,
+                                                weighting)
+                profiles.update(dict.fromkeys(members, profile))
+            generation.profiles = profiles
+            generation.window_size, generation.weighting = window_size, weighting
+            if generation.scale_profiles:
+                self._score_scales(generation)
+
+            self._fit_range_slider(generation)
+            start, stop = generation.visible_range or (None, None)
+            for data in generation.data_list:
+                data.data_points = build_chart_points(generation.series_profile(data.data), start, stop,
+                                                      self._chart_points_count())
+            self._fit_axes(generation)
+            self.page.update()
+
+            generation.details.current.controls = [
+                self._build_details_panels(generation.pdb_file, list(generation.ordered_profiles().items()),
+                                           generation.model_name, window_size, weighting)
+            ]
+            self.page.update()
+
+    def _chart_points_count(self) -> int:
+        """ Nombre de points affichés par série: environ un par pixel de largeur de la page. """
+        return int(self.page.width) if self.page.width else DEFAULT_CHART_POINTS
+
+    def _zoom(self, e: ft.ControlEvent, generation: "ProfileGeneration"):
+        """ Affiche l'intervalle sélectionné avec le curseur de zoom: les points de cet intervalle sont recalculés, à
+        pleine résolution s'il est assez étroit. """
+
+        start, stop = int(round(e.control.start_value)), int(round(e.control.end_value))
+        full_range = (start, stop) == (e.control.min, e.control.max)
+
+        # Le verrou évite de mélanger le zoom avec un recalcul des profils lancé depuis les curseurs de paramètres.
+        with generation.tuning_lock:
+            generation.visible_range = None if full_range else (start, stop + 1)
+            for data in generation.data_list:
+                data.data_points = build_chart_points(generation.series_profile(data.data), start, stop + 1,
+                                                      self._chart_points_count())
+            generation.chart.current.min_x = start
+            generation.chart.current.max_x = stop
+            generation.chart.current.update()
+
+    def _build_profile_view(self, generation: "ProfileGeneration") -> ft.View:
+        """ Construit la vue du profil, sans aucune chaîne: les chaînes sont ajoutées au fur et à mesure. """
+
+        return ft.View(
+            route="/profile",
+            controls=[
+                # Barre d'applications avec le titre du journal et le bouton d'export (actif une fois les profils
+                # calculés).
+                ft.AppBar(
+                    title=ft.Text(value="", ref=generation.title),
+                    actions=[
+                        ft.IconButton(
+                            ref=generation.export_button,
+                            icon=ft.icons.SAVE_ALT_ROUNDED,
+                            tooltip="Export the profiles (NumPy arrays and JSON manifest)",
+                            disabled=True,
+                            on_click=lambda _: self.export_dialog.current.save_file(
+                                dialog_title="Export the profiles",
+                                file_name=f"{os.path.basename(generation.path).split('.')[0]}_profiles"
+                            )
+                        )
+                    ]
+                ),
 
-                            # Liste de commutateurs pour afficher/masquer les chaînes.
-                            ft.ListView(
-                                [ft.Switch(
-                                    label=f"Show chain {chain}",
-                                    active_color=self._get_color_by_chain(chain),
-                                    value=True,
-                                    on_change=lambda e: self._show_hide_chains(e, data_list)
-                                ) for chain, _ in profile_list],
-                                ref=switch_ref,
-                                horizontal=True,
-                                height=0.1 * self.page.height,
+                ft.Column(
+                    [
+
+                        # Conteneur pour la barre de navigation.
+                        ft.Container(
+                            content=ft.NavigationBar(
+                                destinations=[
+                                    # Option de profil d'hydrophobicité.
+                                    ft.NavigationDestination(icon=ft.icons.STACKED_LINE_CHART_ROUNDED,
+                                                             label="Hydrophobicity Profile"),
+
+                                    # Option de détails.
+                                    ft.NavigationDestination(icon=ft.icons.INFO_ROUNDED,
+                                                             label="Details")
+                                ],
+                                on_change=lambda e: self._switch_content(e, generation.chart_panel, generation.switches,
+                                                                         generation.details),
+                                width=self.page.width / 2
                             ),
+                            border_radius=20
+                        ),
 
-                            # Graphique de ligne pour afficher le profil d'hydrophobicité.
-                            ft.LineChart(
-                                data_series=data_list,
-                                tooltip_bgcolor=ft.colors.with_opacity(0.8, ft.colors.BLUE_GREY),
-                                min_y=min(profile.ordinate_axe.min_value for _, profile in profile_list),
-                                max_y=max(profile.ordinate_axe.max_value for _, profile in profile_list),
-                                min_x=min(profile.abscissa_axe.min_value for _, profile in profile_list),
-                                max_x=max(profile.abscissa_axe.max_value for _, profile in profile_list),
-                                horizontal_grid_lines=ft.ChartGridLines(
-                                    interval=1, color=ft.colors.with_opacity(0.2, ft.colors.ON_SURFACE), width=1
+                        # Progression du calcul des profils, avec un bouton d'annulation.
+                        ft.Row(
+                            [
+                                ft.ProgressBar(ref=generation.progress, width=self.page.width / 3),
+                                ft.Text(ref=generation.progress_text),
+                                ft.TextButton(
+                                    ref=generation.cancel_button,
+                                    text="Cancel",
+                                    icon=ft.icons.CANCEL_ROUNDED,
+                                    on_click=lambda _: generation.cancel()
+                                )
+                            ],
+                            ref=generation.progress_row,
+                            alignment=ft.MainAxisAlignment.CENTER
+                        ),
+
+                        # Liste de commutateurs pour afficher/masquer les chaînes.
+                        ft.ListView(
+                            [],
+                            ref=generation.switches,
+                            horizontal=True,
+                            height=0.1 * self.page.height,
+                        ),
+
+                        # Graphique du profil d'hydrophobicité et curseur de zoom.
+                        ft.Column(
+                            [
+                                # Graphique de ligne pour afficher le profil d'hydrophobicité.
+                                ft.LineChart(
+                                    data_series=generation.data_list,
+                                    tooltip_bgcolor=ft.colors.with_opacity(0.8, ft.colors.BLUE_GREY),
+                                    horizontal_grid_lines=ft.ChartGridLines(
+                                        interval=1, color=ft.colors.with_opacity(0.2, ft.colors.ON_SURFACE), width=1
+                                    ),
+                                    vertical_grid_lines=ft.ChartGridLines(
+                                        interval=5, color=ft.colors.with_opacity(0.2, ft.colors.ON_SURFACE), width=1
+                                    ),
+                                    left_axis=ft.ChartAxis(
+                                        title=ft.Text("Hydrophobicity", size=25),
+                                        title_size=50,
+                                        labels_interval=1,
+                                        labels_size=50
+                                    ),
+                                    bottom_axis=ft.ChartAxis(
+                                        title=ft.Text("Amino acids", size=25),
+                                        title_size=50,
+                                        labels_interval=25,
+                                        labels_size=50
+                                    ),
+                                    border=ft.border.all(3, ft.colors.with_opacity(0.2, ft.colors.ON_SURFACE)),
+                                    expand=True,
+                                    ref=generation.chart
                                 ),
-                                vertical_grid_lines=ft.ChartGridLines(
-                                    interval=5, color=ft.colors.with_opacity(0.2, ft.colors.ON_SURFACE), width=1
+
+                                # Curseur de zoom sur un intervalle d'acides aminés (visible une fois les profils calculés).
+                                ft.RangeSlider(
+                                    ref=generation.range_slider,
+                                    start_value=0,
+                                    end_value=1,
+                                    min=0,
+                                    max=1,
+                                    label="{value}",
+                                    visible=False,
+                                    on_change_end=lambda e: self._zoom(e, generation)
                                 ),
-                                left_axis=ft.ChartAxis(
-                                    title=ft.Text("Hydrophobicity", size=25),
-                                    title_size=50,
-                                    labels_interval=1,
-                                    labels_size=50
+
+                                # Curseurs de la taille de fenêtre et de la pondération, qui recalculent les profils
+                                # sans relire le fichier (visibles une fois les profils calculés).
+                                ft.Row(
+                                    [
+                                        ft.Text("Window size"),
+                                        ft.Slider(
+                                            ref=generation.window_slider,
+                                            min=1,
+                                            max=2,
+                                            divisions=1,
+                                            label="{value}",
+                                            expand=True,
+                                            on_change=lambda _: self._tune(generation)
+                                        ),
+                                        ft.Text("Weighting at the ends (%)"),
+                                        ft.Slider(
+                                            ref=generation.weighting_slider,
+                                            min=0,
+                                            max=100,
+                                            divisions=100,
+                                            label="{value}",
+                                            expand=True,
+                                            on_change=lambda _: self._tune(generation)
+                                        ),
+                                    ],
+                                    ref=generation.tuning_row,
+                                    visible=False
                                 ),
-                                bottom_axis=ft.ChartAxis(
-                                    title=ft.Text("Amino acids", size=25),
-                                    title_size=50,
-                                    labels_interval=25,
-                                    labels_size=50
+
+                                # Commutateurs des autres échelles d'hydrophobicité, superposées en pointillés.
+                                ft.Row(
+                                    [],
+                                    ref=generation.scales_row,
+                                    wrap=True,
+                                    visible=False
                                 ),
-                                border=ft.border.all(3, ft.colors.with_opacity(0.2, ft.colors.ON_SURFACE)),
-                                expand=True,
-                                ref=line_chart_ref
-                            ),
+                            ],
+                            ref=generation.chart_panel,
+                            expand=True
+                        ),
 
-                            # Liste de détails pour afficher les informations sur le journal, le fichier PDB,
-                            # les paramètres et les profils.
-                            ft.ListView([
-                                # Liste d'ExpansionPanel pour organiser et afficher des informations détaillées dans un format repliable.
-                                ft.ExpansionPanelList(
-                                    expand_icon_color=ft.colors.BLUE_GREY,  # Couleur de l'icône d'expansion.
-                                    spacing=20,  # Espace entre chaque panneau.
-                                    elevation=8,  # Effet de profondeur visuelle des panneaux.
-                                    divider_color=ft.colors.with_opacity(0.2, ft.colors.ON_SURFACE),
-                                    # Couleur du séparateur entre les panneaux.
-                                    controls=[
-                                        # Premier panneau d'expansion : Informations du journal associé à la structure PDB.
-                                        ft.ExpansionPanel(
-                                            header=ft.ListTile(
-                                                leading=ft.Icon(ft.icons.NEWSPAPER_ROUNDED),  # Icône pour le panneau.
-                                                title=ft.Text("Journal Information")  # Titre du panneau.
-                                            ),
-                                            can_tap_header=True,
-                                            # Permet d'ouvrir/fermer le panneau en tapant sur l'entête.
-                                            content=ft.ListTile(
-                                                title=ft.Markdown(
-                                                    value=f"**Title:** {pdb_file.journal.title if pdb_file.journal.title else 'Not available'}\n\n" +
-                                                          f"**Authors:** {', '.join(pdb_file.journal.authors) if pdb_file.journal.authors else 'Not available'}\n\n" +
-                                                          f"**PubMed Link:** [{pdb_file.journal.pubmed_link if pdb_file.journal.pubmed_link else 'Not available'}]" +
-                                                          f"({pdb_file.journal.pubmed_link if pdb_file.journal.pubmed_link else '#'})\n\n" +
-                                                          f"**PubMed ID:** {pdb_file.journal.pubmed_id if pdb_file.journal.pubmed_id else 'Not available'}\n\n" +
-                                                          f"**DOI:** {pdb_file.journal.digital_object_identifier if pdb_file.journal.digital_object_identifier else 'Not available'}\n\n" +
-                                                          f"**ISSN:** {pdb_file.journal.international_standard_serial_number if pdb_file.journal.international_standard_serial_number else 'Not available'}\n\n" +
-                                                          f"**Publisher:** {pdb_file.journal.publisher if pdb_file.journal.publisher else 'Not available'}\n\n" +
-                                                          f"**Year:** {pdb_file.journal.reference.year if pdb_file.journal.reference.year else 'Not available'}\n\n" +
-                                                          f"**Volume:** {pdb_file.journal.reference.volume if pdb_file.journal.reference.volume else 'Not available'}\n\n" +
-                                                          f"**Page:** {pdb_file.journal.reference.page if pdb_file.journal.reference.page else 'Not available'}\n\n" +
-                                                          f"**Publication Name:** {pdb_file.journal.reference.pub_name if pdb_file.journal.reference.pub_name else 'Not available'}",
-                                                    auto_follow_links=True,
-                                                    selectable=True
-                                                )
-                                            )
-                                        ),
+                        # Liste de détails pour afficher les informations sur le journal, le fichier PDB,
+                        # les paramètres et les profils (remplie une fois tous les profils calculés).
+                        ft.ListView(
+                            [],
+                            padding=20,
+                            expand=True,
+                            visible=False,
+                            ref=generation.details
+                        )],
+                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                    alignment=ft.MainAxisAlignment.CENTER,
+                    expand=True
+                )
+            ]
+        )
 
-                                        # Deuxième panneau d'expansion : Informations détaillées du fichier PDB.
-                                        ft.ExpansionPanel(
-                                            header=ft.ListTile(
-                                                leading=ft.Icon(ft.icons.ATTACH_FILE_ROUNDED),  # Icône pour le panneau.
-                                                title=ft.Text("PDB Information")  # Titre du panneau.
-                                            ),
-                                            can_tap_header=True,
-                                            # Permet d'ouvrir/fermer le panneau en tapant sur l'entête.
-                                            content=ft.ListTile(
-                                                title=ft.Column([
-                                                    # Affichage des informations principales du fichier PDB en Markdown.
-                                                    ft.Markdown(
-                                                        value=f"**Author(s):** {', '.join(pdb_file.authors) if pdb_file.authors else 'Not available'}\n\n" +
-                                                              f"**PDB Link:** [{pdb_file.header.pdb_link if pdb_file.header.pdb_link else 'Not available'}]({pdb_file.header.pdb_link if pdb_file.header.pdb_link else '#'})\n\n" +
-                                                              f"**Date:** {pdb_file.header.date if pdb_file.header.date else 'Not available'}\n\n" +
-                                                              f"**Classification:** {pdb_file.header.classification if pdb_file.header.classification else 'Not available'}\n\n" +
-                                                              f"**ID:** {pdb_file.header.id if pdb_file.header.id else 'Not available'}",
-                                                        auto_follow_links=True,
-                                                        selectable=True
-                                                    ),
-                                                    # Sous-section pour lister les séquences de chaque chaîne de la protéine.
-                                                    ft.ExpansionTile(
-                                                        title=ft.Text("Séquence"),
-                                                        controls=[
-                                                            ft.ExpansionTile(
-                                                                title=ft.Text(f"Chain {chain}"),
-                                                                subtitle=ft.Text(f"Length: {len(sequence)}"),
-                                                                leading=ft.Icon(ft.icons.CIRCLE,
-                                                                                color=self._get_color_by_chain(chain)),
-                                                                controls=[
-                                                                    ft.ListTile(
-                                                                        title=ft.Markdown(
-                                                                            value=f"{' '.join(sequence)}",
-                                                                            selectable=True
-                                                                        )
-                                                                    )
-                                                                ]
-                                                            ) for chain, sequence in pdb_file.seqres.items()
-                                                        ]
-                                                    )
-                                                ])
-                                            )
-                                        ),
+    def _build_details_panels(self, pdb_file: PDBFile, profile_list: list, model_name: str, window_size: int,
+                              weighting: float) -> ft.ExpansionPanelList:
+        """ Construit les panneaux de détails: journal, fichier PDB, analyse d'hydrophobicité et paramètres. """
 
-                                        # Troisième panneau d'expansion : Analyse de l'hydrophobicité pour chaque chaîne.
-                                        ft.ExpansionPanel(
-                                            header=ft.ListTile(
-                                                leading=ft.Icon(ft.icons.ANALYTICS),  # Icône pour le panneau.
-                                                title=ft.Text("Hydrophobicity analysis")  # Titre du panneau.
-                                            ),
-                                            can_tap_header=True,
-                                            # Permet d'ouvrir/fermer le panneau en tapant sur l'entête.
-                                            content=ft.ListTile(
-                                                title=ft.Column(
-                                                    [
-                                                        ft.ExpansionTile(
-                                                            title=ft.Text(f"Chain {chain}"),
-                                                            leading=ft.Icon(ft.icons.CIRCLE,
-                                                                            color=self._get_color_by_chain(chain)),
-                                                            subtitle=ft.Text(
-                                                                f"{len(profile.picks)} predicted transmembrane domains"),
-                                                            controls=[
-                                                                ft.ExpansionTile(
-                                                                    title=ft.Text(f"Pick {i + 1}"),
-                                                                    controls=[
-                                                                        ft.ListTile(
-                                                                            title=ft.Markdown(
-                                                                                value=f"**Start:** {pick.start}\n\n" +
-                                                                                      f"**End:** {pick.start + pick.length}\n\n" +
-                                                                                      f"**Length:** {pick.length}\n\n" +
-                                                                                      f"**Maximum:** {pick.maximum:.2f}\n\n" +
-                                                                                      f"**Minimum:** {pick.minimum:.2f}\n\n",
-                                                                                selectable=True
-                                                                            ),
-                                                                            subtitle=ft.LineChart(
-                                                                                data_series=[
-                                                                                    ft.LineChartData(
-                                                                                        data_points=profile.points[
-                                                                                                    pick.start - window_size_copy:pick.start + pick.length - window_size_copy + 1],
-                                                                                        stroke_width=2,
-                                                                                        curved=True,
-                                                                                        stroke_cap_round=True,
-                                                                                        color=self._get_color_by_chain(
-                                                                                            chain),
-                                                                                        data=chain,
-                                                                                    )
-                                                                                ],
-                                                                                tooltip_bgcolor=ft.colors.with_opacity(
-                                                                                    0.8, ft.colors.BLUE_GREY),
-                                                                                min_y=pick.minimum - 0.5,
-                                                                                max_y=pick.maximum + 0.5,
-                                                                                min_x=pick.start,
-                                                                                max_x=pick.start + pick.length,
-                                                                                horizontal_grid_lines=ft.ChartGridLines(
-                                                                                    interval=1,
-                                                                                    color=ft.colors.with_opacity(0.2,
-                                                                                                                 ft.colors.ON_SURFACE),
-                                                                                    width=1),
-                                                                                vertical_grid_lines=ft.ChartGridLines(
-                                                                                    interval=5,
-                                                                                    color=ft.colors.with_opacity(0.2,
-                                                                                                                 ft.colors.ON_SURFACE),
-                                                                                    width=1),
-                                                                                left_axis=ft.ChartAxis(
-                                                                                    title=ft.Text("Hydrophobicity"),
-                                                                                    labels_interval=1, labels_size=50),
-                                                                                bottom_axis=ft.ChartAxis(
-                                                                                    title=ft.Text("Amino acids"),
-                                                                                    labels_interval=50, labels_size=50),
-                                                                                border=ft.border.all(3,
-                                                                                                     ft.colors.with_opacity(
-                                                                                                         0.2,
-                                                                                                         ft.colors.ON_SURFACE)),
-                                                                                expand=True
-                                                                            )
-                                                                        )
-                                                                    ]
-                                                                ) for i, pick in enumerate(profile.picks)
-                                                            ]
-                                                        ) for chain, profile in profile_list
-                                                    ]
-                                                ),
-                                            )
-                                        ),
+        return ft.ExpansionPanelList(
+            expand_icon_color=ft.colors.BLUE_GREY,  # Couleur de l'icône d'expansion.
+            spacing=20,  # Espace entre chaque panneau.
+            elevation=8,  # Effet de profondeur visuelle des panneaux.
+            divider_color=ft.colors.with_opacity(0.2, ft.colors.ON_SURFACE),
+            # Couleur du séparateur entre les panneaux.
+            controls=[
+                # Premier panneau d'expansion : Informations du journal associé à la structure PDB.
+                ft.ExpansionPanel(
+                    header=ft.ListTile(
+                        leading=ft.Icon(ft.icons.NEWSPAPER_ROUNDED),  # Icône pour le panneau.
+                        title=ft.Text("Journal Information")  # Titre du panneau.
+                    ),
+                    can_tap_header=True,
+                    # Permet d'ouvrir/fermer le panneau en tapant sur l'entête.
+                    content=ft.ListTile(
+                        title=ft.Markdown(
+                            value=f"**Title:** {pdb_file.journal.title if pdb_file.journal.title else 'Not available'}\n\n" +
+                                  f"**Authors:** {', '.join(pdb_file.journal.authors) if pdb_file.journal.authors else 'Not available'}\n\n" +
+                                  f"**PubMed Link:** [{pdb_file.journal.pubmed_link if pdb_file.journal.pubmed_link else 'Not available'}]" +
+                                  f"({pdb_file.journal.pubmed_link if pdb_file.journal.pubmed_link else '#'})\n\n" +
+                                  f"**PubMed ID:** {pdb_file.journal.pubmed_id if pdb_file.journal.pubmed_id else 'Not available'}\n\n" +
+                                  f"**DOI:** {pdb_file.journal.digital_object_identifier if pdb_file.journal.digital_object_identifier else 'Not available'}\n\n" +
+                                  f"**ISSN:** {pdb_file.journal.international_standard_serial_number if pdb_file.journal.international_standard_serial_number else 'Not available'}\n\n" +
+                                  f"**Publisher:** {pdb_file.journal.publisher if pdb_file.journal.publisher else 'Not available'}\n\n" +
+                                  f"**Year:** {pdb_file.journal.reference.year if pdb_file.journal.reference.year else 'Not available'}\n\n" +
+                                  f"**Volume:** {pdb_file.journal.reference.volume if pdb_file.journal.reference.volume else 'Not available'}\n\n" +
+                                  f"**Page:** {pdb_file.journal.reference.page if pdb_file.journal.reference.page else 'Not available'}\n\n" +
+                                  f"**Publication Name:** {pdb_file.journal.reference.pub_name if pdb_file.journal.reference.pub_name else 'Not available'}",
+                            auto_follow_links=True,
+                            selectable=True
+                        )
+                    )
+                ),
 
-                                        # Quatrième panneau d'expansion : Paramètres utilisés pour l'analyse.
-                                        ft.ExpansionPanel(
-                                            header=ft.ListTile(
-                                                leading=ft.Icon(ft.icons.SETTINGS_ROUNDED),  # Icône pour le panneau.
-                                                title=ft.Text("Parameters")  # Titre du panneau.
-                                            ),
-                                            can_tap_header=True,
-                                            # Permet d'ouvrir/fermer le panneau en tapant sur l'entête.
-                                            content=ft.ListTile(
+                # Deuxième panneau d'expansion : Informations détaillées du fichier PDB.
+                ft.ExpansionPanel(
+                    header=ft.ListTile(
+                        leading=ft.Icon(ft.icons.ATTACH_FILE_ROUNDED),  # Icône pour le panneau.
+                        title=ft.Text("PDB Information")  # Titre du panneau.
+                    ),
+                    can_tap_header=True,
+                    # Permet d'ouvrir/fermer le panneau en tapant sur l'entête.
+                    content=ft.ListTile(
+                        title=ft.Column([
+                            # Affichage des informations principales du fichier PDB en Markdown.
+                            ft.Markdown(
+                                value=f"**Author(s):** {', '.join(pdb_file.authors) if pdb_file.authors else 'Not available'}\n\n" +
+                                      f"**PDB Link:** [{pdb_file.header.pdb_link if pdb_file.header.pdb_link else 'Not available'}]({pdb_file.header.pdb_link if pdb_file.header.pdb_link else '#'})\n\n" +
+                                      f"**Date:** {pdb_file.header.date if pdb_file.header.date else 'Not available'}\n\n" +
+                                      f"**Classification:** {pdb_file.header.classification if pdb_file.header.classification else 'Not available'}\n\n" +
+                                      f"**ID:** {pdb_file.header.id if pdb_file.header.id else 'Not available'}",
+                                auto_follow_links=True,
+                                selectable=True
+                            ),
+                            # Sous-section pour lister les séquences de chaque chaîne de la protéine.
+                            ft.ExpansionTile(
+                                title=ft.Text("Séquence"),
+                                controls=[
+                                    ft.ExpansionTile(
+                                        title=ft.Text(f"Chain {chain}"),
+                                        subtitle=ft.Text(f"Length: {len(sequence)}"),
+                                        leading=ft.Icon(ft.icons.CIRCLE,
+                                                        color=self._get_color_by_chain(chain)),
+                                        controls=[
+                                            ft.ListTile(
                                                 title=ft.Markdown(
-                                                    value=f"**Model:** {model.current.options[model_copy].text if model.current.options[model_copy].text else 'Not available'}\n\n" +
-                                                          f"**Window size:** {window_size_copy if window_size_copy else 'Not available'}\n\n" +
-                                                          f"**Weighting:** {weighting_copy * 100 if weighting_copy else 'Not available'}%",
+                                                    value=f"{' '.join(sequence)}",
                                                     selectable=True
                                                 )
                                             )
-                                        )
-                                    ]
-                                )],
-                                padding=20,
-                                expand=True,
-                                visible=False,
-                                ref=list_view_ref
-                            )],
-                            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                        alignment=ft.MainAxisAlignment.CENTER,
-                        expand=True
+                                        ]
+                                    ) for chain, sequence in pdb_file.seqres.items()
+                                ]
+                            )
+                        ])
+                    )
+                ),
+
+                # Troisième panneau d'expansion : Analyse de l'hydrophobicité pour chaque chaîne.
+                ft.ExpansionPanel(
+                    header=ft.ListTile(
+                        leading=ft.Icon(ft.icons.ANALYTICS),  # Icône pour le panneau.
+                        title=ft.Text("Hydrophobicity analysis")  # Titre du panneau.
+                    ),
+                    can_tap_header=True,
+                    # Permet d'ouvrir/fermer le panneau en tapant sur l'entête.
+                    content=ft.ListTile(
+                        title=ft.Column(
+                            [
+                                self._build_chain_analysis_tile(chain, profile)
+                                for chain, profile in profile_list
+                            ]
+                        ),
                     )
-                ]
+                ),
+
+                # Quatrième panneau d'expansion : Paramètres utilisés pour l'analyse.
+                ft.ExpansionPanel(
+                    header=ft.ListTile(
+                        leading=ft.Icon(ft.icons.SETTINGS_ROUNDED),  # Icône pour le panneau.
+                        title=ft.Text("Parameters")  # Titre du panneau.
+                    ),
+                    can_tap_header=True,
+                    # Permet d'ouvrir/fermer le panneau en tapant sur l'entête.
+                    content=ft.ListTile(
+                        title=ft.Markdown(
+                            value=f"**Model:** {model_name if model_name else 'Not available'}\n\n" +
+                                  f"**Window size:** {window_size if window_size else 'Not available'}\n\n" +
+                                  f"**Weighting:** {weighting * 100 if weighting else 'Not available'}%",
+                            selectable=True
+                        )
+                    )
+                )
+            ]
+        )
+
+    def _build_chain_analysis_tile(self, chain: str, profile: HydrophobicityProfile) -> ft.ExpansionTile:
+        """ Construit la tuile d'analyse d'une chaîne; les tuiles de ses pics ne sont créées qu'à son ouverture. """
+
+        return ft.ExpansionTile(
+            title=ft.Text(f"Chain {chain}"),
+            leading=ft.Icon(ft.icons.CIRCLE, color=self._get_color_by_chain(chain)),
+            subtitle=ft.Text(f"{len(profile.picks)} predicted transmembrane domains"),
+            controls=[],
+            data=(chain, profile),
+            on_change=self._expand_chain_analysis
+        )
+
+    @staticmethod
+    def _expand_chain_analysis(e):
+        """ Crée les tuiles des pics d'une chaîne à la première ouverture de sa tuile d'analyse. """
+
+        if e.data != "true" or e.control.controls:
+            return
+        chain, profile = e.control.data
+        e.control.controls = [
+            ft.ExpansionTile(
+                title=ft.Text(f"Pick {i + 1}"),
+                controls=[],
+                data=(chain, profile, pick),
+                on_change=FletApp._expand_pick
+            ) for i, pick in enumerate(profile.picks)
+        ]
+        e.control.update()
+
+    @staticmethod
+    def _expand_pick(e):
+        """ Construit le résumé et le graphique d'un pic à la première ouverture de sa tuile. """
+
+        if e.data != "true" or e.control.controls:
+            return
+        e.control.controls = [FletApp._build_pick_details(*e.control.data)]
+        e.control.update()
+
+    @staticmethod
+    def _build_pick_details(chain: str, profile: HydrophobicityProfile, pick) -> ft.ListTile:
+        """ Construit le résumé et le graphique de la portion du profil correspondant à un pic. """
+
+        return ft.ListTile(
+            title=ft.Markdown(
+                value=f"**Start:** {pick.start}\n\n" +
+                      f"**End:** {pick.start + pick.length}\n\n" +
+                      f"**Length:** {pick.length}\n\n" +
+                      f"**Maximum:** {pick.maximum:.2f}\n\n" +
+                      f"**Minimum:** {pick.minimum:.2f}\n\n",
+                selectable=True
+            ),
+            subtitle=ft.LineChart(
+                data_series=[
+                    ft.LineChartData(
+                        data_points=build_chart_points(profile, pick.start, pick.start + pick.length + 1),
+                        stroke_width=2,
+                        curved=True,
+                        stroke_cap_round=True,
+                        color=FletApp._get_color_by_chain(chain),
+                        data=chain,
+                    )
+                ],
+                tooltip_bgcolor=ft.colors.with_opacity(0.8, ft.colors.BLUE_GREY),
+                min_y=pick.minimum - 0.5,
+                max_y=pick.maximum + 0.5,
+                min_x=pick.start,
+                max_x=pick.start + pick.length,
+                horizontal_grid_lines=ft.ChartGridLines(
+                    interval=1, color=ft.colors.with_opacity(0.2, ft.colors.ON_SURFACE), width=1),
+                vertical_grid_lines=ft.ChartGridLines(
+                    interval=5, color=ft.colors.with_opacity(0.2, ft.colors.ON_SURFACE), width=1),
+                left_axis=ft.ChartAxis(title=ft.Text("Hydrophobicity"), labels_interval=1, labels_size=50),
+                bottom_axis=ft.ChartAxis(title=ft.Text("Amino acids"), labels_interval=50, labels_size=50),
+                border=ft.border.all(3, ft.colors.with_opacity(0.2, ft.colors.ON_SURFACE)),
+                expand=True
             )
         )
 
-        # Redirige vers la nouvelle vue de profil.
-        self.page.go("/profile")
+    def _export_result(self, e: ft.FilePickerResultEvent):
+        """ Exporte les profils de la vue affichée sous le chemin choisi (sans extension) et affiche le résultat. """
+
+        generation = self.generation
+        if e.path is None or generation is None:
+            return
+        output = e.path
+        for extension in ("_manifest.json", "_scores.npy", "_picks.npy", ".json", ".npy"):
+            if output.endswith(extension):
+                output = output[:-len(extension)]
+                break
+
+        try:
+            count = self._export_profiles(generation, output)
+        except OSError as error:
+            self.page.show_snack_bar(ft.SnackBar(ft.Text(f"Export failed: {error}", color=ft.colors.WHITE),
+                                                 bgcolor=ft.colors.RED_900))
+            return
+        self.page.show_snack_bar(ft.SnackBar(ft.Text(f"{count} chains exported to {output}_manifest.json")))
 
     @staticmethod
-    def _show_hide_chains(e, data_list):
-        """ Affiche ou masque les chaînes sélectionnées en fonction de l'état d'un contrôle Switch. """
+    def _export_profiles(generation: "ProfileGeneration", output: str) -> int:
+        """ Écrit les profils et les pics de toutes les chaînes, dans l'ordre du fichier PDB, au format binaire du
+        mode batch (voir export.py). Retourne le nombre de chaînes exportées. """
 
-        for data in data_list:
-            # Vérifie si l'étiquette du contrôle correspond à la donnée actuellement manipulée.
-            if data.data == e.control.label[-1]:  # Accède au dernier caractère de l'étiquette qui représente la chaîne.
-                data.visible = e.control.value  # Définit la visibilité de la série de données en fonction de l'état du Switch.
-                data.update()  # Met à jour les données pour refléter les changements dans l'interface utilisateur.
-                break  # Quitte la boucle une fois la chaîne correspondante trouvée et mise à jour.
+        # Import local: ces modules ne servent qu'à l'export et ne ralentissent pas le démarrage.
+        from scripts.export import BinaryWriter
+        from scripts.parallel import ChainProfile, entry_id
+
+        with span("_export_profiles"):
+            entry = entry_id(generation.pdb_file, generation.path)
+            profiles = generation.ordered_profiles()
+            writer = BinaryWriter(output)
+            try:
+                for chain, profile in profiles.items():
+                    writer.write(entry, chain, ChainProfile(generation.path, entry, chain, profile))
+            finally:
+                writer.close()
+            return len(profiles)
+
+    def _show_hide_chains(self, e: ft.ControlEvent, generation: "ProfileGeneration"):
+        """ Affiche ou masque une chaîne et celles de même séquence (avec les profils de leurs autres échelles) en
+        fonction de l'état d'un contrôle Switch. """
+
+        chain = e.control.data  # Chaîne représentante associée au contrôle Switch.
+        if e.control.value:
+            generation.hidden_chains.discard(chain)
+        else:
+            generation.hidden_chains.add(chain)
+        self._apply_visibility(generation)
+        generation.chart.current.update()  # Met à jour le graphique pour refléter les changements.
 
-    def _switch_content(self, e: ft.ControlEvent, chart: ft.Ref[ft.LineChart],
+    def _switch_content(self, e: ft.ControlEvent, chart: ft.Ref[ft.Column],
                         checkboxes: ft.Ref[ft.Row], list_view_ref: ft.Ref[ft.ListView]):
         """ Change le contenu de la page en fonction de l'onglet sélectionné dans une barre de navigation. """
 
@@ -610,7 +1191,8 @@ class FletApp:
 
     @staticmethod
     def _get_color_by_chain(chain: str):
-        """ Retourne la couleur associée à la chaîne. """
+        """ Retourne la couleur associée à la chaîne (gris-bleu pour les identifiants sans couleur, comme les chiffres
+        des grandes capsides). """
         return {
             "A": ft.colors.RED,
             "B": ft.colors.GREEN,
@@ -664,4 +1246,4 @@ class FletApp:
             "x": ft.colors.LIGHT_BLUE_800,
             "y": ft.colors.RED_900,
             "z": ft.colors.GREEN_900
-        }[chain]
+        }.get(chain, ft.colors.BLUE_GREY)
@@ -0,0 +1,201 @@
+"""
+Lecture en flux des séquences des fichiers mmCIF (PDBx), éventuellement compressés avec gzip.
+
+Utilisation:
+    - iter_mmcif est un générateur qui produit un triplet (identifiant de l'entrée, chaîne, séquence) par chaîne
+        polymère, au fil de la lecture. La séquence est une EncodedSequence (voir residues.py), comme les chaînes de
+        PDBFile.seqres, utilisable directement par HydrophobicityProfile
+    - Les séquences sont lues dans _entity_poly_seq (une séquence par entité) et attribuées aux chaînes de l'entité
+        (_entity_poly.pdbx_strand_id, identifiants d'auteur comme dans les fichiers PDB); la lecture s'arrête alors au
+        début des coordonnées (_atom_site). À défaut, elles sont lues dans _pdbx_poly_seq_scheme (une ligne par résidu
+        et par chaîne), qui suit les coordonnées. En cas de microhétérogénéité, le premier résidu de chaque position est
+        retenu
+    - Avec all_blocks=True, tous les blocs de données (data_) du fichier sont lus, et non seulement le premier
+    - MMCIF_EXTENSIONS et is_mmcif identifient les fichiers mmCIF d'après leur extension
+"""
+
+import re
+
+from scripts.pdb import open_text, read_lines
+from scripts.residues import EncodedSequence
+
+# extensions des fichiers mmCIF, compressés ou non
+MMCIF_EXTENSIONS = ('.cif', '.mmcif', '.cif.gz', '.mmcif.gz')
+
+# catégories lues
+CATEGORIES = ('entry', 'entity_poly', 'entity_poly_seq', 'pdbx_poly_seq_scheme')
+
+# catégorie des coordonnées, qui suit les catégories de séquence
+COORDINATES_CATEGORY = 'atom_site'
+
+# mot (valeur entre apostrophes ou guillemets, ou suite de caractères non blancs) d'une ligne mmCIF
+_TOKEN_PATTERN = re.compile(r"""'(?:[^']|'(?=\S))*'(?=\s|$)|"(?:[^"]|"(?=\S))*"(?=\s|$)|\S+""")
+
+# types des mots produits par _iter_tokens
+_DATA, _LOOP, _NAME, _VALUE = range(4)
+
+
+def is_mmcif(path: str) -> bool:
+    """
+    Indique si un chemin désigne un fichier mmCIF, d'après son extension.
+    """
+    return path.lower().endswith(MMCIF_EXTENSIONS)
+
+
+def _iter_tokens(lines):
+    """
+    Découpe les lignes d'un fichier mmCIF en couples (type, texte): début de bloc (data_), début de boucle (loop_), nom
+    d'attribut (_catégorie.attribut) ou valeur. Les commentaires sont ignorés et les champs texte (entre deux lignes
+    commençant par ';') forment une seule valeur.
+    """
+    text = None
+    for line in lines:
+        if text is not None:
+            if line.startswith(';'):
+                yield _VALUE, "\n".join(text)
+                text = None
+            else:
+                text.append(line)
+            continue
+        if line.startswith(';'):
+            text = [line[1:]]
+            continue
+
+        for token in _TOKEN_PATTERN.findall(line):
+            if token.startswith('#'):
+                break
+            if token.startswith('_'):
+                yield _NAME, token
+            elif token.startswith(("'", '"')):
+                yield _VALUE, token[1:-1]
+            elif token.lower() == 'loop_':
+                yield _LOOP, token
+            elif token.lower().startswith('data_'):
+                yield _DATA, token[5:]
+            else:
+                yield _VALUE, token
+
+
+def _iter_rows(tokens, categories: tuple):
+    """
+    Génère, au fil de la lecture, un couple (catégorie, ligne) pour chaque ligne des catégories demandées, où ligne est
+    un dictionnaire (attribut -> valeur): une ligne par enregistrement pour une boucle, une seule pour une catégorie
+    écrite sous forme clé-valeur. Génère aussi (catégorie, None) au début de chaque catégorie, quelle qu'elle soit, et
+    ('data_', identifiant) au début de chaque bloc de données.
+    """
+    columns = None  # attributs de la boucle en cours, None hors boucle
+    in_header = False  # les attributs de la boucle sont en cours de lecture
+    row = []  # valeurs de l'enregistrement de boucle en cours
+    category = None  # catégorie en cours (boucle ou clé-valeur)
+    values = {}  # valeurs de la catégorie clé-valeur en cours
+    key = None  # attribut clé-valeur en attente de sa valeur
+
+    for kind, token in tokens:
+        if kind == _VALUE:
+            if columns is not None:
+                in_header = False
+                row.append(token)
+                if len(row) == len(columns):
+                    if category in categories:
+                        yield category, dict(zip(columns, row))
+                    row = []
+            elif key is not None:
+                values[key] = token
+                key = None
+            continue
+
+        # un nom, une boucle ou un bloc termine la catégorie clé-valeur en cours
+        if values and (kind != _NAME or columns is not None or not token[1:].startswith(f"{category}.")):
+            if category in categories:
+                yield category, values
+            values = {}
+
+        if kind == _NAME:
+            name, _, attribute = token[1:].partition('.')
+            if in_header:
+                columns.append(attribute)
+                if not category:
+                    category = name
+                    yield category, None
+                continue
+            columns = None
+            if name != category:
+                category = name
+                yield category, None
+            key = attribute
+        elif kind == _LOOP:
+            columns, in_header, row, category, key = [], True, [], None, None
+        else:
+            columns, in_header, row, category, key = None, False, [], None, None
+            yield 'data_', token
+
+    if values and category in categories:
+        yield category, values
+
+
+def _block_chains(entities: dict, strands: dict, schemes: dict):
+    """
+    Génère un couple (chaîne, séquence) pour chaque chaîne d'un bloc: à partir des entités et de leurs chaînes si
+    _entity_poly_seq a été lue, sinon à partir de _pdbx_poly_seq_scheme.
+    """
+    if not entities:
+        for chain, residues in schemes.items():
+            yield chain, EncodedSequence.from_residues(residues)
+        return
+    for entity, residues in entities.items():
+        # les chaînes d'une même entité partagent la même séquence
+        sequence = EncodedSequence.from_residues(residues)
+        chains = [chain.strip() for chain in strands.get(entity, "").split(',') if chain.strip()]
+        for chain in chains or [entity]:
+            yield chain, sequence
+
+
+def iter_mmcif(source, all_blocks: bool = False):
+    """
+    Génère un triplet (identifiant de l'entrée, chaîne, EncodedSequence) pour chaque chaîne polymère d'un fichier mmCIF
+    (du premier bloc de données seulement, sauf avec all_blocks=True).
+    """
+    entry = None
+    strands = {}  # chaînes de chaque entité (_entity_poly)
+    entities = {}  # résidus de chaque entité (_entity_poly_seq)
+    schemes = {}  # résidus de chaque chaîne (_pdbx_poly_seq_scheme)
+    positions = {}  # dernière position lue de chaque entité ou chaîne, pour ignorer la microhétérogénéité
+    done = False  # les séquences du bloc en cours ont déjà été produites
+
+    with open_text(source) as file:
+        for category, row in _iter_rows(_iter_tokens(read_lines(file)), CATEGORIES):
+            if category == 'data_':
+                if entry is not None:
+                    if not done:
+                        yield from ((entry, chain, sequence) for chain, sequence in
+                                    _block_chains(entities, strands, schemes))
+                    if not all_blocks:
+                        return
+                entry, strands, entities, schemes, positions, done = row, {}, {}, {}, {}, False
+            elif row is None:
+                if category == COORDINATES_CATEGORY and entities and not done:
+                    # les séquences des entités sont connues: inutile de lire les coordonnées
+                    yield from ((entry, chain, sequence) for chain, sequence in
+                                _block_chains(entities, strands, schemes))
+                    done = True
+                    if not all_blocks:
+                        return
+            elif done:
+                continue
+            elif category == 'entry':
+                entry = row.get('id', entry)
+            elif category == 'entity_poly':
+                strands[row.get('entity_id')] = row.get('pdbx_strand_id', "")
+            elif category == 'entity_poly_seq':
+                entity = row.get('entity_id')
+                if positions.get(('entity', entity)) != row.get('num'):
+                    positions[('entity', entity)] = row.get('num')
+                    entities.setdefault(entity, []).append(row.get('mon_id'))
+            elif category == 'pdbx_poly_seq_scheme':
+                chain = row.get('pdb_strand_id') or row.get('asym_id')
+                if positions.get(('chain', chain)) != row.get('seq_id'):
+                    positions[('chain', chain)] = row.get('seq_id')
+                    schemes.setdefault(chain, []).append(row.get('mon_id'))
+
+    if not done:
+        yield from ((entry, chain, sequence) for chain, sequence in _block_chains(entities, strands, schemes))
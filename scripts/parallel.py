@@ -0,0 +1,389 @@
+"""
+Calcul parallèle des profils d'hydrophobicité sur un pool de processus.
+
+Le travail est découpé en deux étapes exécutées dans le même pool:
+    - lecture: chaque fichier PDB (éventuellement compressé avec gzip) est lu par un processus, qui retourne les
+        séquences encodées (un octet par acide aminé) de ses chaînes. Une archive tar est lue en entier par un même
+        processus et chacun de ses membres PDB est traité comme un fichier (chemin archive/membre); plusieurs archives
+        sont donc lues en parallèle. Les fichiers mmCIF sont lus de la même façon (voir mmcif.py)
+    - profil: chaque couple (fichier, séquence distincte) est une unité de travail indépendante, répartie sur tous les
+        processus. Les chaînes de même séquence d'un fichier (homo-oligomères, capsides...) ne sont profilées qu'une
+        fois et partagent le même profil, mais chacune a son propre ChainProfile
+
+Les fichiers FASTA, qui peuvent contenir des millions de séquences, sont traités par profile_fasta: ils sont lus en flux
+par ce processus et chaque séquence est une unité de l'étape de profil, le nombre d'unités en attente étant borné.
+
+Les processus ne retournent que des résultats numériques compacts (ChainProfile) et jamais d'objets Flet. Les modèles
+sont chargés une seule fois par processus, à son démarrage. Le nombre d'unités envoyées à un processus à la fois est
+réglable avec chunksize. Si un ResultCache est fourni, l'étape de lecture le consulte avant de lire chaque fichier
+(mais pas pour les membres des archives).
+"""
+
+import os
+import tarfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from scripts.cache import ResultCache
+from scripts.fasta import iter_fasta
+from scripts.mmcif import is_mmcif, iter_mmcif
+from scripts.pdb import PDBFile, is_archive, iter_archive
+from scripts.profile_generation import MODEL_REGISTRY, HydrophobicityProfile, encode_sequence, group_identical_chains
+
+
+class ChainProfile:
+    __slots__ = ('path', 'entry', 'chain', 'profile', 'error')
+
+    def __init__(self, path: str, entry: str, chain: str, profile: HydrophobicityProfile = None, error: str = None):
+        """
+        Résultat du profil d'une chaîne. error contient la raison pour laquelle la chaîne (ou le fichier, si chain est
+        None) n'a pas pu être profilée.
+        """
+        self.path = path
+        self.entry = entry
+        self.chain = chain
+        self.profile = profile
+        self.error = error
+
+    @property
+    def positions(self) -> np.ndarray:
+        """
+        Indice de l'acide aminé central de chaque fenêtre.
+        """
+        return self.profile.positions
+
+    @property
+    def scores(self) -> np.ndarray:
+        """
+        Valeur d'hydrophobicité de chaque fenêtre.
+        """
+        return self.profile.scores
+
+    @property
+    def picks(self) -> list:
+        """
+        Pics détectés dans le profil.
+        """
+        return self.profile.picks
+
+    @property
+    def first_position(self) -> int:
+        """
+        Indice de l'acide aminé central de la première fenêtre.
+        """
+        return int(self.profile.abscissa_axe.min_value)
+
+    def __repr__(self) -> str:
+        """
+        Représentation de l'objet ChainProfile.
+        """
+        if self.error is not None:
+            return f"ChainProfile({self.entry}, {self.chain}, error: {self.error})"
+        return f"ChainProfile({self.entry}, {self.chain}, {len(self.scores)} scores, {len(self.picks)} picks)"
+
+
+def entry_id(pdb_file: PDBFile, path: str) -> str:
+    """
+    Retourne l'identifiant PDB d'un fichier, ou le nom du fichier s'il n'a pas d'en-tête.
+    """
+    if pdb_file.header is not None and pdb_file.header.id:
+        return pdb_file.header.id
+    return os.path.basename(path).split('.')[0]
+
+
+# cache de résultats du processus courant (initialisé par _init_worker)
+_worker_cache = None
+
+# statut d'un fichier lu vis-à-vis du cache: trouvé dans le cache, absent du cache (à y enregistrer une fois calculé),
+# ou non concerné par le cache (cache désactivé, membre d'archive, fichier mmCIF, fichier illisible)
+CACHE_HIT, CACHE_MISS, UNCACHED = 'hit', 'miss', 'uncached'
+
+
+def _init_worker(models_path: str, cache: ResultCache = None) -> None:
+    """
+    Initialise un processus du pool: charge et valide les modèles une seule fois.
+    """
+    global _worker_cache
+    MODEL_REGISTRY.path = models_path
+    MODEL_REGISTRY.names()
+    _worker_cache = cache
+
+
+def _read_files(items: list) -> list:
+    """
+    Étape de lecture: chaque élément est un couple (chemin, paramètres). Retourne pour chaque fichier un tuple
+    (chemin, identifiant, chaînes, ordre, statut, cache) où chaînes contient, pour chaque séquence distincte, le tuple
+    des chaînes de cette séquence et la séquence encodée (ou l'erreur rencontrée), ou directement les ChainProfile
+    trouvés dans le cache, et ordre est le tuple des chaînes dans l'ordre du fichier. statut est CACHE_HIT,
+    CACHE_MISS ou UNCACHED; pour CACHE_MISS, cache contient l'empreinte du fichier et ses informations à enregistrer
+    dans le cache (None sinon).
+    """
+    results = []
+    for path, parameters in items:
+        if is_archive(path):
+            results.extend(_read_archive(path))
+            continue
+        if is_mmcif(path):
+            results.append(_read_mmcif(path))
+            continue
+
+        try:
+            file_hash = None
+            if _worker_cache is not None:
+                # consulte le cache avant de lire le fichier
+                file_hash = _worker_cache.hash_file(path)
+                cached = _worker_cache.get(file_hash, *parameters)
+                if cached is not None:
+                    pdb_file, profiles = cached
+                    entry = entry_id(pdb_file, path)
+                    results.append((path, entry, [
+                        ChainProfile(path, entry, chain, profile) for chain, profile in profiles.items()
+                    ], tuple(profiles), CACHE_HIT, None))
+                    continue
+
+            pdb_file = PDBFile(path, sequence_only=True)
+        except (OSError, EOFError, UnicodeDecodeError, IndexError) as e:
+            results.append((path, None, str(e), None, UNCACHED, None))
+            continue
+
+        results.append(_read_result(path, pdb_file, file_hash))
+    return results
+
+
+def _read_archive(path: str) -> list:
+    """
+    Lit chaque membre PDB d'une archive tar et retourne un résultat de lecture par membre (voir _read_files), sans
+    consulter le cache. Une archive illisible donne un seul résultat en erreur.
+    """
+    results = []
+    try:
+        for name, stream in iter_archive(path):
+            member_path = os.path.join(path, name)
+            try:
+                pdb_file = PDBFile(stream, sequence_only=True)
+            except (OSError, EOFError, UnicodeDecodeError, IndexError) as e:
+                results.append((member_path, None, str(e), None, UNCACHED, None))
+                continue
+            results.append(_read_result(member_path, pdb_file, None))
+    except (OSError, EOFError, tarfile.TarError) as e:
+        results.append((path, None, str(e), None, UNCACHED, None))
+    return results
+
+
+def _read_mmcif(path: str) -> tuple:
+    """
+    Lit les séquences du premier bloc d'un fichier mmCIF et retourne son résultat de lecture (voir _read_files). Les
+    fichiers mmCIF ne sont pas mis en cache (statut UNCACHED): ils ne comptent ni comme succès ni comme échecs.
+    """
+    try:
+        records = list(iter_mmcif(path))
+    except (OSError, EOFError, UnicodeDecodeError) as e:
+        return path, None, str(e), None, UNCACHED, None
+    entry = records[0][0] if records and records[0][0] else os.path.basename(path).split('.')[0]
+    seqres = {chain: sequence for _, chain, sequence in records}
+    return path, entry, _chain_units(seqres), tuple(seqres), UNCACHED, None
+
+
+def _read_result(path: str, pdb_file: PDBFile, file_hash: str = None) -> tuple:
+    """
+    Retourne le résultat de lecture d'un fichier lu (voir _read_files): absent du cache si son empreinte est connue,
+    non concerné par le cache sinon.
+    """
+    entry, chains, order = entry_id(pdb_file, path), _chain_units(pdb_file.seqres), tuple(pdb_file.seqres)
+    if file_hash is None:
+        return path, entry, chains, order, UNCACHED, None
+    return path, entry, chains, order, CACHE_MISS, (file_hash, pdb_file.to_dict())
+
+
+def _chain_units(seqres: dict) -> list:
+    """
+    Retourne, pour chaque séquence distincte, le tuple des chaînes de cette séquence et la séquence encodée.
+    """
+    # les séquences sont déjà codées, les résidus non standards compris; les chaînes de même séquence forment une seule
+    # unité
+    return [(tuple(members), encode_sequence(seqres[chain]), None)
+            for chain, members in group_identical_chains(seqres).items()]
+
+
+def _profile_chains(units: list) -> list:
+    """
+    Étape de profil: calcule le profil de chaque unité (fichier, séquence distincte) et retourne un ChainProfile pour
+    chaque chaîne de cette séquence, toutes partageant le même profil.
+    """
+    results = []
+    for unit in units:
+        # les erreurs de lecture sont transmises telles quelles
+        if isinstance(unit, ChainProfile):
+            results.append(unit)
+            continue
+
+        path, entry, chains, codes, model_id, frame_size, edge_proportion = unit
+        if len(codes) < 2 * frame_size + 1:
+            error = f"sequence of length {len(codes)} is shorter than the window"
+            results.extend(ChainProfile(path, entry, chain, error=error) for chain in chains)
+            continue
+        profile = HydrophobicityProfile(codes, model_id, frame_size, edge_proportion)
+        results.extend(ChainProfile(path, entry, chain, profile) for chain in chains)
+    return results
+
+
+def _chunks(iterable, chunksize: int):
+    """
+    Regroupe les éléments d'un itérable en listes de chunksize éléments.
+    """
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _bounded_map(pool, function, iterable, chunksize: int, max_pending: int):
+    """
+    Applique function à chaque paquet de chunksize éléments dans le pool, en gardant au plus max_pending paquets en
+    cours. Les résultats sont retournés dans l'ordre de l'itérable, au fur et à mesure, sans consommer l'itérable en
+    entier à l'avance.
+    """
+    pending = deque()
+    for chunk in _chunks(iterable, chunksize):
+        pending.append(pool.submit(function, chunk))
+        if len(pending) >= max_pending:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+
+def profile_files(paths, model_id, frame_size: int, edge_proportion: float, workers: int = None,
+                  chunksize: int = 4, models_path: str = None, cache: ResultCache = None):
+    """
+    Calcule en parallèle le profil de chaque chaîne des fichiers paths et génère un ChainProfile par chaîne (ou par
+    fichier illisible), dans l'ordre des fichiers. Avec workers=1, le calcul est fait dans le processus courant. Si un
+    cache est fourni, il est consulté avant de lire chaque fichier et complété avec les fichiers calculés; ses
+    compteurs de succès et d'échecs sont tenus à jour dans ce processus.
+    """
+    global _worker_cache
+    models_path = models_path or MODEL_REGISTRY.path
+    parameters = (model_id, frame_size, edge_proportion)
+    # valide le modèle avant de démarrer les processus
+    MODEL_REGISTRY.get(model_id)
+
+    # fichiers calculés en attente d'être enregistrés dans le cache: chemin -> [empreinte, informations, chaînes
+    # restantes, profils]
+    to_cache = {}
+    # fichiers dont des chaînes de même séquence sont calculées ensemble: chemin -> file d'attente de couples (ordre
+    # des chaînes du fichier, ChainProfile déjà calculés)
+    to_reorder = {}
+
+    def units(files):
+        # transforme les résultats de lecture en unités de travail (fichier, chaîne)
+        for path, entry, chains, order, status, cache_entry in files:
+            if entry is None:
+                yield ChainProfile(path, None, None, error=chains)
+                continue
+            if status != CACHE_HIT and len(chains) < len(order):
+                to_reorder.setdefault(path, deque()).append((order, {}))
+            if cache is not None:
+                # seuls les fichiers réellement trouvés dans le cache comptent comme succès
+                if status == CACHE_HIT:
+                    cache.hits += 1
+                elif status == CACHE_MISS:
+                    cache.misses += 1
+                    if chains:
+                        to_cache[path] = [*cache_entry, sum(len(members) for members, _, _ in chains), {}]
+                    else:
+                        cache.put(cache_entry[0], *parameters, PDBFile.from_dict(cache_entry[1]), {})
+            for chain in chains:
+                if isinstance(chain, ChainProfile):
+                    # profil trouvé dans le cache
+                    yield chain
+                    continue
+                members, codes, error = chain
+                if error is not None:
+                    yield from (ChainProfile(path, entry, member, error=error) for member in members)
+                else:
+                    yield path, entry, members, codes, model_id, frame_size, edge_proportion
+
+    def in_file_order(result):
+        # les chaînes de même séquence sont calculées dans une seule unité: les ChainProfile d'un fichier sont
+        # retenus jusqu'au dernier, puis rendus dans l'ordre des chaînes du fichier
+        pending = to_reorder.get(result.path)
+        if not pending:
+            return [result]
+        order, done = pending[0]
+        done[result.chain] = result
+        if len(done) < len(order):
+            return []
+        pending.popleft()
+        if not pending:
+            del to_reorder[result.path]
+        return [done[chain] for chain in order]
+
+    def store(result):
+        # enregistre un fichier dans le cache une fois toutes ses chaînes calculées
+        pending = to_cache.get(result.path)
+        if pending is None:
+            return
+        if result.error is None:
+            pending[3][result.chain] = result.profile
+        pending[2] -= 1
+        if pending[2] <= 0:
+            del to_cache[result.path]
+            cache.put(pending[0], *parameters, PDBFile.from_dict(pending[1]), pending[3])
+
+    def run(map_function):
+        # les deux étapes sont enchaînées: les unités sont produites au fur et à mesure de la lecture des fichiers
+        items = ((path, parameters) for path in paths)
+        for computed in map_function(_profile_chains, units(map_function(_read_files, items))):
+            for result in in_file_order(computed):
+                store(result)
+                yield result
+
+    # l'étape de lecture consulte une copie du cache, seul ce processus y écrit et tient les compteurs à jour
+    worker_cache = ResultCache(cache.directory, cache.max_bytes) if cache is not None else None
+
+    if workers == 1:
+        previous_cache, _worker_cache = _worker_cache, worker_cache
+        try:
+            yield from run(lambda function, iterable: (
+                result for chunk in _chunks(iterable, chunksize) for result in function(chunk)
+            ))
+        finally:
+            _worker_cache = previous_cache
+        return
+
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(models_path, worker_cache)) as pool:
+        yield from run(lambda function, iterable: _bounded_map(pool, function, iterable, chunksize, 4 * workers))
+
+
+def profile_fasta(path: str, model_id, frame_size: int, edge_proportion: float, workers: int = None,
+                  chunksize: int = 64, models_path: str = None):
+    """
+    Calcule en parallèle le profil de chaque séquence d'un fichier FASTA et génère un ChainProfile par séquence (entry
+    est l'identifiant de la séquence et chain est vide), dans l'ordre du fichier. Le fichier est lu au fur et à mesure
+    du calcul: la mémoire utilisée ne dépend pas de sa taille. Avec workers=1, le calcul est fait dans le processus
+    courant. Si le fichier ne peut pas être lu jusqu'au bout, un dernier ChainProfile (chain=None) contient l'erreur.
+    """
+    models_path = models_path or MODEL_REGISTRY.path
+    # valide le modèle avant de démarrer les processus
+    MODEL_REGISTRY.get(model_id)
+    units = ((path, identifier, ("",), sequence.codes, model_id, frame_size, edge_proportion)
+             for identifier, sequence in iter_fasta(path))
+
+    try:
+        if workers == 1:
+            for chunk in _chunks(units, chunksize):
+                yield from _profile_chains(chunk)
+            return
+
+        workers = workers or os.cpu_count()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(models_path,)) as pool:
+            yield from _bounded_map(pool, _profile_chains, units, chunksize, 4 * workers)
+    except (OSError, EOFError, UnicodeDecodeError) as e:
+        yield ChainProfile(path, None, None, error=str(e))
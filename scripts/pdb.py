@@ -4,9 +4,60 @@ The classes are:
     - Header: contains the header information of the PDB file.
     - JournalReference: contains the reference information of the journal.
     - Journal: contains the journal information of the PDB file.
-    - PDBFile: contains the information of the PDB file.
+    - PDBFile: contains the information of the PDB file. The file is streamed in large blocks and each record is
+        dispatched on its 6-character name. Each chain of seqres is an EncodedSequence (one byte per residue, see
+        residues.py) that behaves like the list of its three-letter codes. With sequence_only=True, reading stops at the
+        first coordinate record.
+        With memory_map=True, the file is memory-mapped and the header, seqres, remarks, authors and journal are only
+        located (with byte-level searches) and decoded when first accessed.
+        The path may also be a gzip-compressed file (.pdb.gz, .ent.gz) or an already opened text or binary stream;
+        compressed data is decompressed incrementally, and decompression stops as soon as reading stops (END record, or
+        first coordinate record with sequence_only=True). Memory mapping only applies to uncompressed files.
+    - open_text and read_lines: open a path or stream as text (decompressing gzip data on the fly) and iterate over its
+        lines, read in growing blocks. They are shared with the FASTA and mmCIF readers (fasta.py, mmcif.py).
+    - iter_archive: iterates over the PDB members of a tar archive (possibly compressed, members possibly gzipped)
+        as binary streams, read sequentially without extracting the archive to disk.
 """
 
+import contextlib
+import gzip
+import io
+import mmap
+import re
+import tarfile
+
+import numpy as np
+
+from scripts.instrumentation import span
+from scripts.residues import RESIDUE_CODES, UNKNOWN_CODE, EncodedSequence
+
+# taille (en caractères) des blocs lus dans le fichier PDB: le premier bloc est petit, pour ne pas lire (ni
+# décompresser) inutilement la suite du fichier lorsque la lecture s'arrête tôt, puis la taille double à chaque bloc
+FIRST_BLOCK_SIZE = 1 << 14
+BLOCK_SIZE = 1 << 20
+
+# signature des données compressées au format gzip
+GZIP_MAGIC = b"\x1f\x8b"
+
+# extensions des fichiers PDB, compressés ou non, et des archives tar contenant des fichiers PDB
+PDB_EXTENSIONS = ('.pdb', '.ent', '.pdb.gz', '.ent.gz')
+ARCHIVE_EXTENSIONS = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz')
+
+# enregistrements de la section des coordonnées, qui suivent tous les enregistrements d'en-tête et SEQRES
+COORDINATE_RECORDS = ("MODEL ", "ATOM  ", "HETATM")
+
+# recherche (sur octets) du premier enregistrement de coordonnées dans un fichier projeté en mémoire
+_COORDINATES_PATTERN = re.compile(rb"^(?:MODEL |ATOM  |HETATM)", re.MULTILINE)
+
+# recherche (sur octets) des blocs de lignes consécutives d'un même enregistrement dans un fichier projeté en mémoire
+_RECORD_PATTERNS = {
+    record: re.compile(rb"(?:^" + record.encode() + rb".*\n?)+", re.MULTILINE)
+    for record in ("SEQRES", "HEADER", "REMARK", "AUTHOR", "JRNL  ")
+}
+
+# en-tête pas encore décodé (fichier projeté en mémoire): None signifie que le fichier n'a pas d'enregistrement HEADER
+_NOT_DECODED = object()
+
 
 class Header:
     def __init__(self, data: str):
@@ -80,38 +131,298 @@ class Journal:
 
 
 class PDBFile:
-    def __init__(self, path):
+    def __init__(self, path, sequence_only: bool = False, memory_map: bool = False):
         """
         Parse un fichier PDB.
+        :param path: str: Le chemin du fichier PDB (éventuellement compressé avec gzip) ou un flux déjà ouvert, texte ou
+            binaire.
+        :param sequence_only: bool: Arrête la lecture au premier enregistrement de coordonnées (MODEL, ATOM, HETATM),
+            une fois les enregistrements d'en-tête et SEQRES lus.
+        :param memory_map: bool: Projette le fichier en mémoire et ne décode chaque type d'enregistrement qu'au premier
+            accès à l'attribut correspondant.
         """
-        self.seqres = {}
-        remarks = {}
-        self.authors = []
-        self.header = None
-        journal = ""
-        with open(path, 'r') as file:
-            line = file.readline().strip()
-            while line != "END":
-                if line[0:6] == "SEQRES":
-                    if line[11] not in self.seqres:
-                        self.seqres[line[11]] = []
-                    self.seqres[line[11]].extend(line[19:].split())
-
-                elif line[0:6] == "HEADER":
-                    self.header = Header(line)
-
-                elif line[0:6] == "REMARK":
-                    if line[7:10] not in remarks:
-                        remarks[line[7:10]] = ""
-                    remarks[line[7:10]] += f"{line[11:].strip()}\n"
-
-                elif line[0:6] == "AUTHOR":
-                    self.authors.extend(line[10:].strip().split(","))
-
-                elif line[0:6] == "JRNL  ":
-                    journal += line + "\n"
-
-                line = file.readline().strip()
-
-        self.remarks = list(remarks.values())
-        self.journal = Journal(journal)
+        with span("PDBFile.__init__", path=path, sequence_only=sequence_only, memory_map=memory_map):
+            self._seqres = None
+            self._authors = None
+            self._header = None
+            self._remarks = None
+            self._journal = None
+
+            if memory_map and not hasattr(path, 'read') and not _is_gzip_file(path):
+                self._header = _NOT_DECODED
+                self._open_memory_map(path, sequence_only)
+                return
+            self._map = None
+
+            self._seqres = {}
+            self._authors = []
+            self._remark_blocks = {}
+            self._journal_lines = []
+
+            # table de dispatch sur le nom d'enregistrement (6 premiers caractères de la ligne)
+            handlers = {
+                "SEQRES": self._read_seqres,
+                "HEADER": self._read_header,
+                "REMARK": self._read_remark,
+                "AUTHOR": self._read_author,
+                "JRNL  ": self._read_journal,
+            }
+
+            with open_text(path) as file:
+                for line in read_lines(file):
+                    line = line.strip()
+                    record = line[0:6]
+                    if record == "END" or (sequence_only and record in COORDINATE_RECORDS):
+                        break
+                    handler = handlers.get(record)
+                    if handler is not None:
+                        handler(line)
+
+            self._seqres = _encode_chains(self._seqres)
+            self._remarks = ["".join(remark) for remark in self._remark_blocks.values()]
+            self._journal = Journal("".join(self._journal_lines))
+            del self._remark_blocks, self._journal_lines
+
+    @property
+    def seqres(self) -> dict:
+        """
+        Séquence de résidus de chaque chaîne.
+        """
+        if self._seqres is None:
+            self._seqres = {}
+            self._decode("SEQRES", self._read_seqres)
+            self._seqres = _encode_chains(self._seqres)
+        return self._seqres
+
+    @property
+    def authors(self) -> list:
+        """
+        Auteurs de la structure.
+        """
+        if self._authors is None:
+            self._authors = []
+            self._decode("AUTHOR", self._read_author)
+        return self._authors
+
+    @property
+    def header(self):
+        """
+        En-tête du fichier PDB (None si le fichier n'a pas d'enregistrement HEADER).
+        """
+        if self._header is _NOT_DECODED:
+            # décodé une seule fois, même en l'absence d'enregistrement HEADER
+            self._header = None
+            self._decode("HEADER", self._read_header)
+        return self._header
+
+    @property
+    def remarks(self) -> list:
+        """
+        Texte de chaque bloc REMARK.
+        """
+        if self._remarks is None:
+            self._remark_blocks = {}
+            self._decode("REMARK", self._read_remark)
+            self._remarks = ["".join(remark) for remark in self._remark_blocks.values()]
+            del self._remark_blocks
+        return self._remarks
+
+    @property
+    def journal(self):
+        """
+        Article de référence de la structure.
+        """
+        if self._journal is None:
+            self._journal_lines = []
+            self._decode("JRNL  ", self._read_journal)
+            self._journal = Journal("".join(self._journal_lines))
+            del self._journal_lines
+        return self._journal
+
+    def to_dict(self) -> dict:
+        """
+        Retourne les informations du fichier sous forme de types simples, sérialisables en JSON.
+        """
+        return {
+            'seqres': {chain: sequence.three_letter() for chain, sequence in self.seqres.items()},
+            'authors': self.authors,
+            'remarks': self.remarks,
+            'header': vars(self.header) if self.header is not None else None,
+            'journal': {**vars(self.journal), 'reference': vars(self.journal.reference)},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """
+        Reconstruit un PDBFile à partir du dictionnaire retourné par to_dict, sans relire le fichier.
+        """
+        pdb_file = cls.__new__(cls)
+        pdb_file._map = None
+        pdb_file._seqres = {
+            chain: EncodedSequence.from_residues(sequence) for chain, sequence in data['seqres'].items()
+        }
+        pdb_file._authors = data['authors']
+        pdb_file._remarks = data['remarks']
+
+        pdb_file._header = None
+        if data['header'] is not None:
+            pdb_file._header = Header.__new__(Header)
+            vars(pdb_file._header).update(data['header'])
+
+        pdb_file._journal = Journal.__new__(Journal)
+        vars(pdb_file._journal).update(data['journal'])
+        pdb_file._journal.reference = JournalReference.__new__(JournalReference)
+        vars(pdb_file._journal.reference).update(data['journal']['reference'])
+        return pdb_file
+
+    def _open_memory_map(self, path, sequence_only: bool) -> None:
+        """
+        Projette le fichier en mémoire et délimite la zone dans laquelle les enregistrements seront recherchés.
+        """
+        with open(path, 'rb') as file:
+            try:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # un fichier vide ne peut pas être projeté en mémoire
+                self._map = b""
+
+        self._map_end = len(self._map)
+        if sequence_only:
+            # seule la zone précédant le premier enregistrement de coordonnées sera parcourue
+            coordinates = _COORDINATES_PATTERN.search(self._map)
+            if coordinates is not None:
+                self._map_end = coordinates.start()
+
+    def _decode(self, record: str, handler) -> None:
+        """
+        Localise les lignes d'un type d'enregistrement dans le fichier projeté en mémoire, puis décode et traite
+        uniquement ces lignes.
+        """
+        if self._map is None:
+            return
+        with span("PDBFile._decode", record=record):
+            for block in _RECORD_PATTERNS[record].finditer(self._map, 0, self._map_end):
+                for line in block.group().decode(errors="replace").split("\n"):
+                    line = line.strip()
+                    if line:
+                        handler(line)
+
+    def _read_seqres(self, line: str) -> None:
+        """
+        Ajoute les codes des résidus d'une ligne SEQRES à la séquence de sa chaîne.
+        """
+        if line[11] not in self._seqres:
+            self._seqres[line[11]] = bytearray()
+        self._seqres[line[11]].extend([RESIDUE_CODES.get(residue, UNKNOWN_CODE) for residue in line[19:].split()])
+
+    def _read_header(self, line: str) -> None:
+        """
+        Lit l'enregistrement HEADER.
+        """
+        self._header = Header(line)
+
+    def _read_remark(self, line: str) -> None:
+        """
+        Ajoute une ligne REMARK au bloc de remarques correspondant à son numéro.
+        """
+        if line[7:10] not in self._remark_blocks:
+            self._remark_blocks[line[7:10]] = []
+        self._remark_blocks[line[7:10]].append(f"{line[11:].strip()}\n")
+
+    def _read_author(self, line: str) -> None:
+        """
+        Ajoute les auteurs d'une ligne AUTHOR.
+        """
+        self._authors.extend(line[10:].strip().split(","))
+
+    def _read_journal(self, line: str) -> None:
+        """
+        Conserve une ligne JRNL pour construire l'objet Journal.
+        """
+        self._journal_lines.append(line + "\n")
+
+
+def _encode_chains(chains: dict) -> dict:
+    """
+    Convertit les codes accumulés pour chaque chaîne en objets EncodedSequence.
+    """
+    return {chain: EncodedSequence(np.frombuffer(bytes(codes), dtype=np.uint8)) for chain, codes in chains.items()}
+
+
+def is_archive(path: str) -> bool:
+    """
+    Indique si un chemin désigne une archive tar, d'après son extension.
+    """
+    return path.lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+def iter_archive(path: str):
+    """
+    Itère sur les membres PDB (d'après PDB_EXTENSIONS) d'une archive tar, compressée ou non, et génère pour chacun un
+    couple (nom, flux binaire). L'archive est lue séquentiellement, sans être extraite sur le disque: le contenu brut
+    de chaque membre est gardé en mémoire jusqu'au membre suivant (la lecture séquentielle de l'archive le parcourt de
+    toute façon en entier), et les membres compressés avec gzip ne sont décompressés que par PDBFile, au fil de la
+    lecture.
+    """
+    with tarfile.open(path, 'r|*') as archive:
+        for member in archive:
+            if member.isfile() and member.name.lower().endswith(PDB_EXTENSIONS):
+                yield member.name, io.BytesIO(archive.extractfile(member).read())
+
+
+def _is_gzip_file(path) -> bool:
+    """
+    Indique si un fichier est compressé avec gzip, d'après sa signature.
+    """
+    with open(path, 'rb') as file:
+        return file.read(len(GZIP_MAGIC)) == GZIP_MAGIC
+
+
+@contextlib.contextmanager
+def open_text(source):
+    """
+    Ouvre en mode texte un chemin ou un flux binaire, décompressé au fil de la lecture s'il commence par la signature
+    gzip. Un flux texte est utilisé tel quel. Les flux fournis par l'appelant ne sont pas fermés.
+    """
+    if not hasattr(source, 'read'):
+        with (gzip.open(source, 'rt') if _is_gzip_file(source) else open(source, 'r')) as file:
+            yield file
+        return
+    if isinstance(source, io.TextIOBase):
+        yield source
+        return
+
+    # un flux sans peek est enveloppé dans un BufferedReader, détaché à la fin pour ne pas fermer le flux
+    buffer = None if hasattr(source, 'peek') else io.BufferedReader(source)
+    stream = source if buffer is None else buffer
+    if stream.peek(len(GZIP_MAGIC))[:len(GZIP_MAGIC)] == GZIP_MAGIC:
+        # GzipFile ne ferme jamais un fileobj qu'il n'a pas ouvert
+        stream = gzip.GzipFile(fileobj=stream)
+    file = io.TextIOWrapper(stream)
+    try:
+        yield file
+    finally:
+        # rend le flux sans le fermer
+        file.detach()
+        if buffer is not None:
+            buffer.detach()
+
+
+def read_lines(file, block_size: int = BLOCK_SIZE, first_block_size: int = FIRST_BLOCK_SIZE):
+    """
+    Itère sur les lignes d'un fichier en le lisant par blocs de first_block_size caractères, puis de taille doublée à
+    chaque bloc jusqu'à block_size. S'arrête proprement à la fin du fichier, même sans enregistrement END.
+    """
+    remainder = ""
+    size = first_block_size
+    while True:
+        block = file.read(size)
+        if not block:
+            break
+        size = min(2 * size, block_size)
+        lines = (remainder + block).split("\n")
+        # la dernière ligne du bloc peut être incomplète, elle est complétée par le bloc suivant
+        remainder = lines.pop()
+        yield from lines
+    if remainder:
+        yield remainder
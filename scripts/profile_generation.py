@@ -2,19 +2,33 @@
 Utilisation de la classe HydrophobicityProfile:
     - Pour créer un profil d'hydrophobicité, il faut instancier la classe HydrophobicityProfile avec les paramètres
         suivants:
-        - sequence: une chaîne de caractères contenant la séquence d'acides aminés
-        - model_id: une chaîne de caractères contenant le nom du modèle à utiliser
+        - sequence: une liste de codes à trois lettres contenant la séquence d'acides aminés, une EncodedSequence
+            (comme les séquences de PDBFile.seqres) ou le tableau NumPy retourné par encode_sequence. Les résidus non
+            standards (MSE, SEC, PYL, ASX, GLX, UNK et tout résidu inconnu) prennent la valeur des acides aminés
+            standards équivalents
+        - model_id: l'indice du modèle dans models.json ou une chaîne de caractères contenant son nom
         - frame_size: un entier positif représentant la taille du cadre à utiliser pour calculer la moyenne
         - edge_proportion: un flottant entre 0 et 1 représentant la proportion de la moyenne que les acides aminés aux
             extrémités du cadre doivent compter
     - La classe HydrophobicityProfile a les attributs suivants:
-        - points: une liste de points de données de type LineChartDataPoint
+        - positions: un tableau NumPy contenant l'indice de l'acide aminé central de chaque fenêtre
+        - scores: un tableau NumPy contenant la valeur d'hydrophobicité de chaque fenêtre
         - abscissa_axe: un objet de type Axe représentant l'axe des abscisses
         - ordinate_axe: un objet de type Axe représentant l'axe des ordonnées
     - La classe HydrophobicityProfile a les méthodes suivantes:
         - get_models_names: une méthode statique qui retourne une liste de chaînes de caractères contenant les noms des
             modèles disponibles
+        - sweep: une méthode statique qui évalue une grille (modèles, tailles de fenêtre, pondérations) sur une
+            séquence et retourne un objet ProfileSweep dont l'attribut scores est un cube NumPy de dimensions
+            (modèle, fenêtre, pondération, acide aminé)
+        - multi_scale: une méthode statique qui calcule en une seule passe, à partir d'une matrice (acide aminé,
+            échelle), le profil de chaque modèle et retourne un objet MultiScaleProfile contenant les scores de chaque
+            échelle, leur version centrée réduite (normalized), leur moyenne (consensus) et les pics de chaque échelle
+            (segments). Sa méthode profile retourne le HydrophobicityProfile d'une échelle sans recalcul
     - La classe HydrophobicityProfile lève l'exception ModelFormatError si le fichier models.json est mal formaté
+    - La classe ModelRegistry charge et valide models.json une seule fois (puis à chaque modification du fichier) et
+        conserve chaque modèle sous forme d'une table de valeurs indexée par code de résidu (voir residues.py). Le
+        registre partagé MODEL_REGISTRY retourne un modèle à partir de son indice ou de son nom
     - La classe Axe a les attributs suivants:
         - min_value: un entier représentant la valeur minimale de l'axe
         - max_value: un entier représentant la valeur maximale de l'axe
@@ -23,10 +37,79 @@ Utilisation de la classe HydrophobicityProfile:
         - minimum: un flottant représentant la valeur minimale du pic
         - length: un entier représentant la longueur du pic
         - start: un entier représentant l'indice de départ du pic
+    - La fonction compute_window_scores calcule la moyenne pondérée de chaque fenêtre d'un tableau NumPy de valeurs
+        d'hydrophobicité en une seule convolution avec le noyau retourné par window_kernel
+    - La fonction detect_segments détecte, sans boucle Python, les segments d'un tableau de scores supérieurs ou égaux
+        à un seuil et d'une longueur minimale donnée. Elle retourne un objet Segments dont les attributs start, end,
+        length, minimum, maximum et mean sont des tableaux NumPy (une valeur par segment) et dont la méthode to_picks
+        retourne les objets Pick correspondants. Les pics d'un HydrophobicityProfile sont détectés par cette fonction
+    - La fonction group_identical_chains regroupe les chaînes de séquences identiques (homo-oligomères, capsides...),
+        dont le profil n'est calculé qu'une fois puis partagé
 """
 
 import json
-import flet
+import os
+import threading
+import numpy as np
+
+from scripts.instrumentation import span
+from scripts.residues import AMINO_ACIDS, EncodedSequence, encode, extend_table, sequence_hash
+
+# indice de chaque acide aminé standard dans les tables de valeurs
+AMINO_ACID_INDEX = {amino_acid: index for index, amino_acid in enumerate(AMINO_ACIDS)}
+
+# seuil d'hydrophobicité et longueur minimale (end - start) des pics détectés par défaut
+PICK_THRESHOLD = 0.5
+PICK_MIN_LENGTH = 10
+
+
+def window_kernel(frame_size: int, edge_proportion: float) -> np.ndarray:
+    """
+    Construit le noyau de pondération triangulaire d'une fenêtre de taille 2 * frame_size + 1, déjà divisé par le
+    nombre d'acides aminés de la fenêtre.
+    """
+    # distance de chaque position de la fenêtre à l'acide aminé central
+    distances = np.abs(np.arange(-frame_size, frame_size + 1))
+    # poids égal à 1 au centre et à edge_proportion aux extrémités
+    weights = 1 / frame_size * -(distances * (1 - edge_proportion)) + 1
+    return weights / len(weights)
+
+
+def encode_sequence(sequence) -> np.ndarray:
+    """
+    Convertit une séquence de codes à trois lettres (ou une EncodedSequence, déjà codée) en un tableau d'indices
+    utilisables dans les tables des modèles. Les résidus non standards sont codés selon residues.py.
+    """
+    if isinstance(sequence, EncodedSequence):
+        return sequence.codes
+    return encode(sequence)
+
+
+def group_identical_chains(sequences: dict) -> dict:
+    """
+    Regroupe les chaînes dont les séquences (listes de codes à trois lettres, EncodedSequence ou tableaux retournés par
+    encode_sequence) sont identiques, comparées par leur empreinte. Retourne, pour la première chaîne de chaque groupe
+    (son représentant), la liste des chaînes du groupe, représentant compris, dans l'ordre de sequences.
+    """
+    groups = {}
+    for chain, sequence in sequences.items():
+        codes = sequence if isinstance(sequence, np.ndarray) else encode_sequence(sequence)
+        groups.setdefault(sequence_hash(codes), []).append(chain)
+    return {chains[0]: chains for chains in groups.values()}
+
+
+def compute_window_scores(values: np.ndarray, frame_size: int, edge_proportion: float) -> np.ndarray:
+    """
+    Calcule la moyenne pondérée de chaque fenêtre complète de values. La valeur d'indice k du résultat correspond à
+    l'acide aminé frame_size + k de la séquence.
+    """
+    kernel = window_kernel(frame_size, edge_proportion)
+    # aucune fenêtre complète si la séquence est plus courte que le noyau
+    if len(values) < len(kernel):
+        return np.empty(0, dtype=np.float64)
+    # le noyau est symétrique, la convolution équivaut donc à une corrélation
+    with span("compute_window_scores", residues=len(values), frame_size=frame_size):
+        return np.convolve(values, kernel, mode='valid')
 
 
 class Axe:
@@ -47,6 +130,95 @@ class ModelFormatError(Exception):
         super().__init__(self.message)
 
 
+class Model:
+    def __init__(self, index: int, name: str, table: np.ndarray):
+        """
+        Modèle d'hydrophobicité validé. table contient la valeur de chaque résidu, indexée par son code (voir
+        residues.py): les 20 acides aminés standards puis les résidus non standards.
+        """
+        self.index = index
+        self.name = name
+        self.table = table
+
+    def __repr__(self) -> str:
+        """
+        Représentation de l'objet Model.
+        """
+        return f"Model({self.index}, {self.name})"
+
+
+class ModelRegistry:
+    def __init__(self, path: str = 'data/models.json'):
+        """
+        Charge et valide une seule fois les modèles de models.json. Le fichier n'est relu que si sa date de
+        modification change.
+        """
+        self.path = path
+        self._mtime = None
+        self._models = []
+        self._models_by_name = {}
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> None:
+        """
+        Recharge les modèles si models.json a été modifié depuis le dernier chargement.
+        """
+        mtime = os.stat(self.path).st_mtime_ns
+        if mtime == self._mtime:
+            return
+
+        with self._lock:
+            # un autre thread a peut-être déjà rechargé le fichier
+            if mtime == self._mtime:
+                return
+
+            with span("ModelRegistry.load", path=self.path):
+                with open(self.path) as f:
+                    data = json.load(f)
+
+                models = []
+                for index, model in enumerate(data):
+                    # vérifie l'intégrité du modèle
+                    HydrophobicityProfile._check_model_integrity(model)
+                    table = extend_table(np.array([model[amino_acid] for amino_acid in AMINO_ACIDS],
+                                                  dtype=np.float64))
+                    table.flags.writeable = False
+                    models.append(Model(index, model['name'], table))
+
+            self._models = models
+            self._models_by_name = {model.name: model for model in models}
+            self._mtime = mtime
+
+    def get(self, model_id) -> Model:
+        """
+        Retourne un modèle à partir de son indice dans models.json ou de son nom.
+        """
+        self._refresh()
+        if isinstance(model_id, str):
+            if model_id not in self._models_by_name:
+                raise KeyError(f"Unknown model '{model_id}'")
+            return self._models_by_name[model_id]
+        return self._models[model_id]
+
+    def names(self) -> list:
+        """
+        Retourne les noms des modèles dans l'ordre de models.json.
+        """
+        self._refresh()
+        return [model.name for model in self._models]
+
+    def __len__(self) -> int:
+        """
+        Nombre de modèles disponibles.
+        """
+        self._refresh()
+        return len(self._models)
+
+
+# registre partagé par tous les profils du processus
+MODEL_REGISTRY = ModelRegistry()
+
+
 class Pick:
     def __init__(self, start):
         """
@@ -78,87 +250,258 @@ class Pick:
         return f"Pick({self.start}, {self.start + self.length}, max: {self.maximum}, min: {self.minimum})"
 
 
+class Segments:
+    def __init__(self, start: np.ndarray, end: np.ndarray, minimum: np.ndarray, maximum: np.ndarray,
+                 mean: np.ndarray):
+        """
+        Segments détectés dans un profil, par colonnes: start et end sont les positions du premier et du dernier acide
+        aminé de chaque segment et length = end - start, comme pour Pick.
+        """
+        self.start = start
+        self.end = end
+        self.length = end - start
+        self.minimum = minimum
+        self.maximum = maximum
+        self.mean = mean
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def rows(self) -> list:
+        """
+        Retourne les segments sous forme de tuples (start, length, minimum, maximum), comme attendu par
+        HydrophobicityProfile.from_arrays.
+        """
+        return list(zip(self.start.tolist(), self.length.tolist(), self.minimum.tolist(), self.maximum.tolist()))
+
+    def to_picks(self) -> list:
+        """
+        Retourne les segments sous forme d'une liste d'objets Pick.
+        """
+        picks = []
+        for start, length, minimum, maximum in zip(self.start.tolist(), self.length.tolist(), self.minimum.tolist(),
+                                                   self.maximum.tolist()):
+            pick = Pick(start)
+            pick.length, pick.minimum, pick.maximum = length, minimum, maximum
+            picks.append(pick)
+        return picks
+
+
+def detect_segments(scores: np.ndarray, threshold: float = PICK_THRESHOLD, min_length: int = PICK_MIN_LENGTH,
+                    first_position: int = 0) -> Segments:
+    """
+    Détecte les segments de scores consécutifs supérieurs ou égaux à threshold dont la longueur (end - start) est au
+    moins min_length. first_position est la position du premier score (frame_size pour un profil). Les valeurs NaN ne
+    font partie d'aucun segment.
+    """
+    with span("detect_segments", scores=len(scores)):
+        scores = np.asarray(scores, dtype=np.float64)
+        above = scores >= threshold
+
+        # débuts et fins (exclues) des suites de valeurs au-dessus du seuil, aux changements d'état du masque
+        changes = np.diff(above.view(np.int8), prepend=0, append=0)
+        starts = np.flatnonzero(changes == 1)
+        stops = np.flatnonzero(changes == -1)
+        kept = stops - starts - 1 >= min_length
+        if not kept.any():
+            empty = np.empty(0, dtype=np.float64)
+            return Segments(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), empty, empty, empty)
+
+        # réduit chaque suite en une seule opération sur les valeurs au-dessus du seuil, mises bout à bout
+        values = scores[above]
+        counts = stops - starts
+        offsets = np.cumsum(counts) - counts
+        return Segments(
+            starts[kept] + first_position,
+            stops[kept] - 1 + first_position,
+            np.minimum.reduceat(values, offsets)[kept],
+            np.maximum.reduceat(values, offsets)[kept],
+            np.add.reduceat(values, offsets)[kept] / counts[kept],
+        )
+
+
+class ProfileSweep:
+    def __init__(self, sequence, models=None, frame_sizes=(4,), edge_proportions=(1.0,)):
+        """
+        Évalue une grille de paramètres (modèle, taille de fenêtre, pondération aux extrémités) sur une même séquence.
+        La séquence est encodée une seule fois et toutes les pondérations d'une taille de fenêtre sont appliquées à
+        tous les modèles en un seul produit matriciel.
+        """
+        codes = sequence if isinstance(sequence, np.ndarray) else encode_sequence(sequence)
+        models = range(len(MODEL_REGISTRY)) if models is None else models
+        self.models = [MODEL_REGISTRY.get(model_id) for model_id in models]
+        self.frame_sizes = [int(frame_size) for frame_size in frame_sizes]
+        self.edge_proportions = [float(edge_proportion) for edge_proportion in edge_proportions]
+
+        # valeurs de chaque acide aminé pour chaque modèle: matrice (modèles, acides aminés)
+        values = np.stack([model.table for model in self.models])[:, codes]
+
+        # cube des résultats (modèle, fenêtre, pondération, acide aminé), NaN là où la fenêtre n'est pas complète
+        self.scores = np.full(
+            (len(self.models), len(self.frame_sizes), len(self.edge_proportions), len(codes)), np.nan
+        )
+        for f, frame_size in enumerate(self.frame_sizes):
+            width = 2 * frame_size + 1
+            if len(codes) < width:
+                continue
+            # fenêtres glissantes sans copie: tableau (modèles, positions, width)
+            windows = np.lib.stride_tricks.sliding_window_view(values, width, axis=1)
+            # noyaux de toutes les pondérations: matrice (pondérations, width)
+            kernels = np.stack([window_kernel(frame_size, edge) for edge in self.edge_proportions])
+            # produit matriciel (modèles, positions, width) x (width, pondérations)
+            self.scores[:, f, :, frame_size:len(codes) - frame_size] = np.swapaxes(windows @ kernels.T, 1, 2)
+
+    def get(self, model_id, frame_size: int, edge_proportion: float) -> tuple:
+        """
+        Retourne les positions et les scores d'un point de la grille (comme HydrophobicityProfile).
+        """
+        model = MODEL_REGISTRY.get(model_id)
+        m = next(i for i, candidate in enumerate(self.models) if candidate.name == model.name)
+        f = self.frame_sizes.index(frame_size)
+        e = self.edge_proportions.index(edge_proportion)
+        positions = np.arange(frame_size, self.scores.shape[-1] - frame_size, dtype=np.int32)
+        return positions, self.scores[m, f, e, frame_size:self.scores.shape[-1] - frame_size]
+
+
+class MultiScaleProfile:
+    def __init__(self, sequence, frame_size: int, edge_proportion: float, models=None):
+        """
+        Calcule en une seule passe le profil d'une séquence pour plusieurs échelles d'hydrophobicité (tous les modèles
+        par défaut), ainsi qu'un profil consensus et les pics de chaque échelle.
+        """
+        codes = sequence if isinstance(sequence, np.ndarray) else encode_sequence(sequence)
+        models = range(len(MODEL_REGISTRY)) if models is None else models
+        self.models = [MODEL_REGISTRY.get(model_id) for model_id in models]
+        self.frame_size = int(frame_size)
+        self.sequence_length = len(codes)
+
+        # valeurs de chaque acide aminé pour chaque échelle: matrice (acides aminés, échelles)
+        values = np.stack([model.table for model in self.models], axis=1)[codes]
+        self.minimum = values.min(axis=0) if len(codes) else np.zeros(len(self.models))
+        self.maximum = values.max(axis=0) if len(codes) else np.zeros(len(self.models))
+
+        # fenêtres glissantes sans copie (positions, échelles, width) multipliées par le noyau: (échelles, positions)
+        kernel = window_kernel(self.frame_size, edge_proportion)
+        if len(codes) < len(kernel):
+            self.scores = np.empty((len(self.models), 0), dtype=np.float64)
+        else:
+            with span("MultiScaleProfile.scores", residues=len(codes), scales=len(self.models)):
+                windows = np.lib.stride_tricks.sliding_window_view(values, len(kernel), axis=0)
+                self.scores = (windows @ kernel).T
+        self.positions = np.arange(self.frame_size, self.frame_size + self.scores.shape[1], dtype=np.int32)
+
+        # profils centrés réduits (z-scores) de chaque échelle, puis leur moyenne
+        mean = self.scores.mean(axis=1, keepdims=True) if self.scores.shape[1] else 0
+        deviation = self.scores.std(axis=1, keepdims=True) if self.scores.shape[1] else 1
+        self.normalized = (self.scores - mean) / np.where(deviation == 0, 1, deviation)
+        self.consensus = self.normalized.mean(axis=0)
+
+        # pics de chaque échelle, détectés comme pour HydrophobicityProfile
+        self.segments = [detect_segments(scores, first_position=self.frame_size) for scores in self.scores]
+
+    def profile(self, model_id):
+        """
+        Retourne le HydrophobicityProfile d'une des échelles, sans recalculer les fenêtres.
+        """
+        model = MODEL_REGISTRY.get(model_id)
+        m = next(i for i, candidate in enumerate(self.models) if candidate.name == model.name)
+        return HydrophobicityProfile.from_arrays(self.scores[m], self.frame_size, self.sequence_length,
+                                                 float(self.minimum[m]), float(self.maximum[m]),
+                                                 self.segments[m].rows())
+
+
 class HydrophobicityProfile:
     def __init__(self, sequence, model_id, frame_size, edge_proportion):
         """
         Crée un profil d'hydrophobicité à partir d'une séquence d'acides aminés.
         """
-        # charge le modèle depuis le fichier models.json
-        with open('data/models.json') as f:
-            data = json.load(f)
-        model = data[model_id]
+        # récupère la table de valeurs du modèle, déjà chargée et validée par le registre
+        table = MODEL_REGISTRY.get(model_id).table
 
-        # vérifie l'intégrité du modèle
-        HydrophobicityProfile._check_model_integrity(model)
+        # initialise les valeurs d'hydrophobicité pour chaque acide aminé (la séquence peut être déjà encodée)
+        codes = sequence if isinstance(sequence, np.ndarray) else encode_sequence(sequence)
+        hydrophobicity_values = table[codes]
 
-        # libère la mémoire utilisée par models.json
-        del data
-
-        # initialise les valeurs d'hydrophobicité pour chaque acide aminé
-        hydrophobicity_values = [model[amino_acid] for amino_acid in sequence]
-
-        # libère la mémoire utilisée par le modèle et la séquence d'acides aminés
-        del model, sequence
+        # calcule la moyenne pondérée de chaque fenêtre en une seule convolution
+        self.scores = compute_window_scores(hydrophobicity_values, frame_size, edge_proportion)
+        self.positions = np.arange(frame_size, frame_size + len(self.scores), dtype=np.int32)
 
         # initialise les variables nécessaires pour le profil d'hydrophobicité
-        self.points = []
         self.abscissa_axe = Axe(frame_size, len(hydrophobicity_values) - frame_size)
-        self.ordinate_axe = Axe(min(hydrophobicity_values), max(hydrophobicity_values))
-        self.picks = []
-        previous_value = 0
-        for i in range(frame_size, len(hydrophobicity_values) - frame_size):
-
-            # isole une fenêtre de taille frame_size autour de l'acide aminé i
-            frame = hydrophobicity_values[i - frame_size:i + frame_size + 1]
-            # applique une fonction de poids à la fenêtre en fonction de la distance à l'acide aminé i et de
-            # edge_proportion
-            for j in range(len(frame)):
-                frame[j] = frame[j] * (1 / frame_size * -(abs(j - frame_size) * (1 - edge_proportion)) + 1)
-
-            # calcule la moyenne des valeurs d'hydrophobicité dans la fenêtre
-            value = sum(frame) / len(frame)
-
-            # tentative de détection de zone hydrophobe
-            if value >= 0.5:
-                if previous_value < 0.5:
-                    # si la valeur est supérieure à 0.5 et que la valeur précédente est inférieure à 0.5, commence un
-                    # nouveau pic
-                    self.picks.append(Pick(i))
-                # ajoute la valeur à la zone hydrophobe actuelle
-                self.picks[-1].add(value)
-            else:
-                if previous_value > 0.5:
-                    # si la valeur est inférieure à 0.5 et que la valeur précédente est supérieure à 0.5, termine le pic
-                    if self.picks[-1].length < 10:
-                        # si le pic est trop court (moins de 10 acides aminés), il est supprimé
-                        self.picks.pop()
-            previous_value = value
-
-            # ajoute la valeur à la liste des points de données
-            self.points.append(flet.LineChartDataPoint(i, value, tooltip=str(round(value, 4))))
+        self.ordinate_axe = Axe(float(hydrophobicity_values.min()), float(hydrophobicity_values.max()))
 
-    @staticmethod
-    def get_models_names() -> list:
+        # détecte les zones hydrophobes (pics) sur l'ensemble des scores
+        self.picks = detect_segments(self.scores, first_position=frame_size).to_picks()
+
+    @classmethod
+    def from_arrays(cls, scores: np.ndarray, frame_size: int, sequence_length: int, minimum: float, maximum: float,
+                    picks: list):
         """
-        Retourne une liste de chaînes de caractères contenant les noms des modèles disponibles dans models.json.
+        Reconstruit un profil déjà calculé (par exemple lu depuis le cache) sans recalculer les fenêtres. picks est une
+        liste de tuples (start, length, minimum, maximum).
+        """
+        profile = cls.__new__(cls)
+        profile.scores = scores
+        profile.positions = np.arange(frame_size, frame_size + len(scores), dtype=np.int32)
+        profile.abscissa_axe = Axe(frame_size, sequence_length - frame_size)
+        profile.ordinate_axe = Axe(minimum, maximum)
+        profile.picks = []
+        for start, length, pick_minimum, pick_maximum in picks:
+            pick = Pick(start)
+            pick.length, pick.minimum, pick.maximum = length, pick_minimum, pick_maximum
+            profile.picks.append(pick)
+        return profile
+
+    @classmethod
+    def from_batch(cls, sequences: list, model_id, frame_size: int, edge_proportion: float) -> list:
+        """
+        Calcule les profils de plusieurs séquences (non vides) avec les mêmes paramètres en une seule convolution sur
+        leur concaténation: seules les fenêtres entièrement comprises dans une séquence sont conservées. Retourne un
+        profil par séquence, dans l'ordre.
         """
+        table = MODEL_REGISTRY.get(model_id).table
+        codes = [sequence if isinstance(sequence, np.ndarray) else encode_sequence(sequence) for sequence in sequences]
+        if not codes:
+            return []
+        lengths = np.array([len(sequence_codes) for sequence_codes in codes])
+        offsets = np.cumsum(lengths) - lengths
+        values = table[np.concatenate(codes)]
+        scores = compute_window_scores(values, frame_size, edge_proportion)
+        minimums = np.minimum.reduceat(values, offsets)
+        maximums = np.maximum.reduceat(values, offsets)
 
-        # charge les modèles depuis le fichier models.json
-        with open('data/models.json') as f:
-            data = json.load(f)
+        profiles = []
+        for offset, length, minimum, maximum in zip(offsets.tolist(), lengths.tolist(), minimums.tolist(),
+                                                    maximums.tolist()):
+            # la fenêtre d'indice offset + k de la concaténation est la fenêtre k de la séquence
+            sequence_scores = scores[offset:offset + max(length - 2 * frame_size, 0)]
+            segments = detect_segments(sequence_scores, first_position=frame_size)
+            profiles.append(cls.from_arrays(sequence_scores, frame_size, length, minimum, maximum, segments.rows()))
+        return profiles
 
-        # initialise la liste des noms des modèles
-        models = []
+    @staticmethod
+    def sweep(sequence, models=None, frame_sizes=(4,), edge_proportions=(1.0,)) -> ProfileSweep:
+        """
+        Évalue toute une grille de paramètres sur une séquence (voir ProfileSweep). models contient des indices ou des
+        noms de modèles (tous les modèles par défaut).
+        """
+        return ProfileSweep(sequence, models, frame_sizes, edge_proportions)
+
+    @staticmethod
+    def multi_scale(sequence, frame_size: int, edge_proportion: float, models=None) -> MultiScaleProfile:
+        """
+        Calcule en une seule passe le profil de chaque échelle (voir MultiScaleProfile). models contient des indices ou
+        des noms de modèles (tous les modèles par défaut).
+        """
+        return MultiScaleProfile(sequence, frame_size, edge_proportion, models)
 
-        # pour chaque modèle
-        for model in data:
-            # vérifie l'intégrité du modèle
-            HydrophobicityProfile._check_model_integrity(model)
-            # si le modèle est valide, ajoute son nom à la liste
-            models.append(model['name'])
+    @staticmethod
+    def get_models_names() -> list:
+        """
+        Retourne une liste de chaînes de caractères contenant les noms des modèles disponibles dans models.json.
+        """
 
-        # retourne la liste des noms des modèles
-        return models
+        return MODEL_REGISTRY.names()
 
     @staticmethod
     def _check_model_integrity(model):
@@ -172,16 +515,14 @@ class HydrophobicityProfile:
         if 'name' not in model:
             raise ModelFormatError("Model in models.json must have a name")
         # vérifie que le modèle a une valeur pour chaque acide aminé
-        for amino_acide in ['ALA', 'ARG', 'ASN', 'ASP', 'CYS', 'GLN', 'GLU', 'GLY', 'HIS', 'ILE', 'LEU', 'LYS', 'MET',
-                            'PHE', 'PRO', 'SER', 'THR', 'TRP', 'TYR', 'VAL']:
+        for amino_acide in AMINO_ACIDS:
             if amino_acide not in model:
                 raise ModelFormatError(f"Model '{model['name']}' in models.json must have a value for '{amino_acide}'")
         amino_acides = list(model.keys())
         amino_acides.remove('name')
         for amino_acide in amino_acides:
             # vérifie que l'acide aminé acide est valide
-            if amino_acide not in ['ALA', 'ARG', 'ASN', 'ASP', 'CYS', 'GLN', 'GLU', 'GLY', 'HIS', 'ILE', 'LEU', 'LYS',
-                                   'MET', 'PHE', 'PRO', 'SER', 'THR', 'TRP', 'TYR', 'VAL']:
+            if amino_acide not in AMINO_ACID_INDEX:
                 raise ModelFormatError(f"Amino acide '{amino_acide}' in model '{model['name']}' is not a valid amino "
                                        f"acide name")
             # vérifie que la valeur associée à l'acide aminé est un nombre
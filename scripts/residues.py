@@ -0,0 +1,149 @@
+"""
+Codage compact des séquences de résidus: un octet par résidu.
+
+Utilisation:
+    - RESIDUES contient les codes à trois lettres de tous les résidus connus: les 20 acides aminés standards (dans
+        l'ordre de AMINO_ACIDS, celui des tables des modèles) suivis des résidus non standards MSE, SEC, PYL, ASX, GLX
+        et UNK. Le code d'un résidu est son indice dans RESIDUES et ONE_LETTER contient le code à une lettre
+        correspondant
+    - Tout résidu absent de RESIDUES est codé comme UNK
+    - encode convertit une séquence de codes à trois lettres en un tableau NumPy d'octets, et encode_one_letter une
+        chaîne de codes à une lettre (M est lu comme MET et tout caractère inconnu comme UNK)
+    - sequence_hash retourne l'empreinte d'un tableau de codes, identique d'un processus et d'une exécution à l'autre
+    - extend_table complète une table de 20 valeurs (une par acide aminé standard) avec la valeur de chaque résidu non
+        standard, déduite des acides aminés standards équivalents (STANDARD_EQUIVALENTS)
+    - La classe EncodedSequence enveloppe un tableau de codes. Elle se comporte comme une liste de codes à trois
+        lettres (len, itération, indexation, comparaison avec une liste, ' '.join) et a les attributs et méthodes
+        suivants:
+        - codes: le tableau NumPy d'octets
+        - three_letter: retourne la liste des codes à trois lettres
+        - one_letter: retourne la séquence sous forme d'une chaîne de codes à une lettre
+"""
+
+import hashlib
+
+import numpy as np
+
+# acides aminés standards, dans l'ordre des tables de valeurs des modèles
+AMINO_ACIDS = ('ALA', 'ARG', 'ASN', 'ASP', 'CYS', 'GLN', 'GLU', 'GLY', 'HIS', 'ILE', 'LEU', 'LYS', 'MET', 'PHE', 'PRO',
+               'SER', 'THR', 'TRP', 'TYR', 'VAL')
+
+# acides aminés standards dont chaque résidu non standard prend la valeur (la moyenne s'il y en a plusieurs):
+# sélénométhionine, sélénocystéine, pyrrolysine, ASN ou ASP, GLN ou GLU, et résidu inconnu
+STANDARD_EQUIVALENTS = {
+    'MSE': ('MET',),
+    'SEC': ('CYS',),
+    'PYL': ('LYS',),
+    'ASX': ('ASN', 'ASP'),
+    'GLX': ('GLN', 'GLU'),
+    'UNK': AMINO_ACIDS,
+}
+
+# tous les résidus connus, indexés par leur code
+RESIDUES = AMINO_ACIDS + tuple(STANDARD_EQUIVALENTS)
+
+# code à une lettre de chaque résidu de RESIDUES
+ONE_LETTER = "ARNDCQEGHILKMFPSTWYV" + "MUOBZX"
+
+# code de chaque résidu connu
+RESIDUE_CODES = {residue: code for code, residue in enumerate(RESIDUES)}
+
+# code des résidus inconnus
+UNKNOWN_CODE = RESIDUE_CODES['UNK']
+
+# tables de conversion des codes vers les codes à trois et à une lettre
+_THREE_LETTER = np.array(RESIDUES)
+_ONE_LETTER = np.frombuffer(ONE_LETTER.encode('ascii'), dtype=np.uint8)
+
+# table de conversion des caractères (octets) vers les codes, le premier résidu de chaque lettre étant retenu
+_FROM_ONE_LETTER = np.full(256, UNKNOWN_CODE, dtype=np.uint8)
+for _code, _letter in reversed(list(enumerate(ONE_LETTER))):
+    _FROM_ONE_LETTER[ord(_letter)] = _code
+
+
+def encode(sequence) -> np.ndarray:
+    """
+    Convertit une séquence de codes à trois lettres en un tableau de codes (un octet par résidu). Les résidus inconnus
+    sont codés comme UNK.
+    """
+    return np.fromiter((RESIDUE_CODES.get(residue, UNKNOWN_CODE) for residue in sequence), dtype=np.uint8,
+                       count=len(sequence))
+
+
+def encode_one_letter(sequence: str) -> np.ndarray:
+    """
+    Convertit une chaîne de codes à une lettre (majuscules ou minuscules) en un tableau de codes.
+    """
+    return _FROM_ONE_LETTER[np.frombuffer(sequence.upper().encode('ascii', errors='replace'), dtype=np.uint8)]
+
+
+def sequence_hash(codes: np.ndarray) -> str:
+    """
+    Retourne l'empreinte (BLAKE2b de 128 bits, en hexadécimal) d'un tableau de codes.
+    """
+    return hashlib.blake2b(codes.tobytes(), digest_size=16).hexdigest()
+
+
+def extend_table(table: np.ndarray) -> np.ndarray:
+    """
+    Retourne une table de valeurs indexée par code de résidu à partir d'une table de 20 valeurs (dans l'ordre de
+    AMINO_ACIDS).
+    """
+    extended = np.empty(len(RESIDUES), dtype=table.dtype)
+    extended[:len(AMINO_ACIDS)] = table
+    for residue, equivalents in STANDARD_EQUIVALENTS.items():
+        extended[RESIDUE_CODES[residue]] = np.mean([table[RESIDUE_CODES[equivalent]] for equivalent in equivalents])
+    return extended
+
+
+class EncodedSequence:
+    __slots__ = ('codes',)
+
+    def __init__(self, codes: np.ndarray):
+        """
+        Séquence de résidus stockée sous forme de codes (un octet par résidu).
+        """
+        self.codes = codes
+
+    @classmethod
+    def from_residues(cls, sequence):
+        """
+        Crée une séquence à partir d'une séquence de codes à trois lettres.
+        """
+        return cls(encode(sequence))
+
+    def three_letter(self) -> list:
+        """
+        Retourne la liste des codes à trois lettres de la séquence.
+        """
+        return _THREE_LETTER[self.codes].tolist()
+
+    def one_letter(self) -> str:
+        """
+        Retourne la séquence sous forme d'une chaîne de codes à une lettre.
+        """
+        return _ONE_LETTER[self.codes].tobytes().decode('ascii')
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __iter__(self):
+        return iter(self.three_letter())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return EncodedSequence(self.codes[index])
+        return RESIDUES[self.codes[index]]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, EncodedSequence):
+            return np.array_equal(self.codes, other.codes)
+        if isinstance(other, (list, tuple)):
+            return self.three_letter() == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        """
+        Représentation de l'objet EncodedSequence.
+        """
+        return f"EncodedSequence({self.one_letter()!r})"
@@ -0,0 +1,375 @@
+"""
+Service HTTP local qui calcule des profils d'hydrophobicité pour d'autres programmes, sans interface graphique ni accès
+au réseau (il n'écoute que sur localhost par défaut).
+
+Utilisation (depuis la racine du projet):
+    python -m scripts.service [--host 127.0.0.1] [--port 8765] [--workers 2] [--batch-window 5] [--max-batch 64]
+
+Points d'accès:
+    - POST /profile?model=NOM|INDICE&window=4&edge=1.0&format=json|npz
+        Le corps est soit un fichier PDB (éventuellement compressé avec gzip), soit un objet JSON (Content-Type:
+        application/json) de la forme {"sequences": {"A": "MKTAYIAK...", "B": ["ALA", "GLY", ...]}}: chaque séquence
+        est une chaîne de codes à une lettre ou une liste de codes à trois lettres (un code inconnu est refusé avec le
+        code 400). La réponse contient le profil et les pics de chaque chaîne, en JSON ou dans un fichier .npz (mêmes
+        colonnes que le format columnar du mode batch).
+    - GET /models: noms des modèles disponibles
+    - GET /metrics: nombre de requêtes, percentiles de latence, profondeur de la file d'attente et taille moyenne des
+        lots
+
+Les séquences des requêtes simultanées sont regroupées en lots: les séquences d'un lot qui partagent les mêmes
+paramètres sont profilées en une seule convolution (HydrophobicityProfile.from_batch). Les modèles sont chargés au
+démarrage du service.
+"""
+
+import argparse
+import io
+import json
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from scripts.batch import ColumnarWriter, parse_model
+from scripts.parallel import ChainProfile, entry_id
+from scripts.pdb import PDBFile
+from scripts.profile_generation import MODEL_REGISTRY, HydrophobicityProfile
+from scripts.residues import ONE_LETTER, RESIDUE_CODES, encode, encode_one_letter
+
+# taille maximale (en octets) du corps d'une requête
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+# nombre de latences conservées pour le calcul des percentiles
+LATENCY_WINDOW = 10000
+
+
+class ScoringRequest:
+    __slots__ = ('codes', 'parameters', 'done', 'profile', 'error')
+
+    def __init__(self, codes: np.ndarray, parameters: tuple):
+        """
+        Séquence à profiler avec les paramètres (model_id, frame_size, edge_proportion), en attente dans la file.
+        """
+        self.codes = codes
+        self.parameters = parameters
+        self.done = threading.Event()
+        self.profile = None
+        self.error = None
+
+
+class ProfileBatcher:
+    def __init__(self, workers: int = 2, batch_window: float = 0.005, max_batch: int = 64):
+        """
+        Regroupe les séquences soumises par des requêtes simultanées. Chacun des workers threads attend une première
+        séquence, complète son lot pendant au plus batch_window secondes (ou jusqu'à max_batch séquences), puis profile
+        ensemble les séquences qui partagent les mêmes paramètres.
+        """
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.batched = 0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._threads = [threading.Thread(target=self._run, daemon=True) for _ in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def profile(self, sequences: list, model_id, frame_size: int, edge_proportion: float) -> list:
+        """
+        Soumet des séquences encodées et attend leurs profils.
+        """
+        requests = [ScoringRequest(codes, (model_id, frame_size, edge_proportion)) for codes in sequences]
+        for request in requests:
+            self._queue.put(request)
+        for request in requests:
+            request.done.wait()
+            if request.error is not None:
+                raise request.error
+        return [request.profile for request in requests]
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def _run(self) -> None:
+        """
+        Boucle d'un worker: constitue des lots et les profile.
+        """
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.batch_window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._score(batch)
+
+    def _score(self, batch: list) -> None:
+        """
+        Profile un lot: une seule convolution par groupe de séquences de mêmes paramètres.
+        """
+        groups = {}
+        for request in batch:
+            groups.setdefault(request.parameters, []).append(request)
+
+        for parameters, requests in groups.items():
+            try:
+                profiles = HydrophobicityProfile.from_batch([request.codes for request in requests], *parameters)
+                for request, profile in zip(requests, profiles):
+                    request.profile = profile
+            except Exception as e:
+                for request in requests:
+                    request.error = e
+            for request in requests:
+                request.done.set()
+
+        with self._lock:
+            self.batches += 1
+            self.batched += len(batch)
+
+
+class ServiceMetrics:
+    def __init__(self):
+        """
+        Compteurs de requêtes et latences récentes (en secondes) du service.
+        """
+        self.requests = 0
+        self.errors = 0
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, error: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            self.errors += error
+            self._latencies.append(latency)
+
+    def to_dict(self, batcher: ProfileBatcher) -> dict:
+        """
+        Retourne les métriques sous forme sérialisable en JSON.
+        """
+        with self._lock:
+            latencies = np.array(self._latencies)
+            requests, errors = self.requests, self.errors
+        percentiles = np.percentile(latencies, [50, 90, 99]) * 1000 if len(latencies) else [0, 0, 0]
+        return {
+            'requests': requests,
+            'errors': errors,
+            'latency_ms': {'p50': float(percentiles[0]), 'p90': float(percentiles[1]), 'p99': float(percentiles[2])},
+            'queue_depth': batcher.queue_depth(),
+            'batches': batcher.batches,
+            'mean_batch_size': batcher.batched / batcher.batches if batcher.batches else 0,
+        }
+
+
+class RequestError(Exception):
+    def __init__(self, status: int, message: str):
+        """
+        Erreur renvoyée au client avec le code HTTP status.
+        """
+        self.status = status
+        self.message = message
+        super().__init__(self.message)
+
+
+class ProfileServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # connexions en attente d'acceptation, pour absorber des rafales de requêtes simultanées
+    request_queue_size = 128
+
+    def __init__(self, address: tuple, batcher: ProfileBatcher):
+        """
+        Serveur HTTP qui traite chaque requête dans un thread et partage le batcher et les métriques.
+        """
+        super().__init__(address, ProfileRequestHandler)
+        self.batcher = batcher
+        self.metrics = ServiceMetrics()
+
+
+class ProfileRequestHandler(BaseHTTPRequestHandler):
+    server: ProfileServer
+
+    def do_GET(self) -> None:
+        path = urlparse(self.path).path
+        if path == '/metrics':
+            self._send_json(200, self.server.metrics.to_dict(self.server.batcher))
+        elif path == '/models':
+            self._send_json(200, {'models': HydrophobicityProfile.get_models_names()})
+        else:
+            self._send_json(404, {'error': f"Unknown path '{path}'"})
+
+    def do_POST(self) -> None:
+        start = time.perf_counter()
+        error = True
+        try:
+            url = urlparse(self.path)
+            if url.path != '/profile':
+                raise RequestError(404, f"Unknown path '{url.path}'")
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            parameters = self._parameters(query)
+            entry, sequences = self._read_sequences()
+
+            chains = list(sequences)
+            profiles = self.server.batcher.profile([sequences[chain] for chain in chains], *parameters)
+            results = [ChainProfile(None, entry, chain, profile) for chain, profile in zip(chains, profiles)]
+
+            if query.get('format', 'json') == 'npz':
+                self._send_npz(results)
+            else:
+                self._send_json(200, {
+                    'entry': entry,
+                    'model': MODEL_REGISTRY.get(parameters[0]).name,
+                    'window': parameters[1],
+                    'edge_proportion': parameters[2],
+                    'chains': [_chain_to_dict(result) for result in results],
+                })
+            error = False
+        except RequestError as e:
+            self._send_json(e.status, {'error': e.message})
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+        finally:
+            self.server.metrics.record(time.perf_counter() - start, error)
+
+    def _parameters(self, query: dict) -> tuple:
+        """
+        Lit et valide les paramètres du profil dans la chaîne de requête.
+        """
+        try:
+            model_id = parse_model(query.get('model', '0'))
+            MODEL_REGISTRY.get(model_id)
+            window = int(query.get('window', 4))
+            edge_proportion = float(query.get('edge', 1.0))
+        except (KeyError, IndexError, ValueError) as e:
+            raise RequestError(400, f"Invalid parameter: {e}")
+        if window < 1:
+            raise RequestError(400, "window must be greater than 0")
+        if not 0 <= edge_proportion <= 1:
+            raise RequestError(400, "edge must be between 0 and 1")
+        return model_id, window, edge_proportion
+
+    def _read_sequences(self) -> tuple:
+        """
+        Lit le corps de la requête et retourne l'identifiant de l'entrée et les séquences encodées de chaque chaîne.
+        """
+        length = int(self.headers.get('Content-Length', 0))
+        if length > MAX_BODY_BYTES:
+            raise RequestError(413, f"Request body larger than {MAX_BODY_BYTES} bytes")
+        body = self.rfile.read(length)
+
+        if self.headers.get('Content-Type', '').startswith('application/json'):
+            try:
+                sequences = json.loads(body)['sequences']
+            except (ValueError, KeyError, TypeError):
+                raise RequestError(400, "JSON body must contain a 'sequences' object")
+            if isinstance(sequences, list):
+                sequences = {str(index): sequence for index, sequence in enumerate(sequences)}
+            if not isinstance(sequences, dict):
+                raise RequestError(400, "'sequences' must be an object or a list")
+            encoded = {str(chain): _encode_json_sequence(str(chain), sequence) for chain, sequence in sequences.items()}
+            entry = 'request'
+        else:
+            # le fichier envoyé (éventuellement compressé avec gzip) est lu directement en mémoire
+            try:
+                pdb_file = PDBFile(io.BytesIO(body), sequence_only=True)
+                encoded = {chain: sequence.codes for chain, sequence in pdb_file.seqres.items()}
+                entry = entry_id(pdb_file, 'upload.pdb')
+            except (OSError, EOFError, UnicodeDecodeError, IndexError) as e:
+                raise RequestError(400, f"Invalid PDB file: {e}")
+
+        if not encoded:
+            raise RequestError(400, "No sequence to profile")
+        if any(len(codes) == 0 for codes in encoded.values()):
+            raise RequestError(400, "Sequences must not be empty")
+        return entry, encoded
+
+    def _send_json(self, status: int, data: dict) -> None:
+        self._send(status, json.dumps(data).encode(), 'application/json')
+
+    def _send_npz(self, results: list) -> None:
+        buffer = io.BytesIO()
+        writer = ColumnarWriter(buffer)
+        for result in results:
+            writer.write(result.entry, result.chain, result)
+        writer.close()
+        self._send(200, buffer.getvalue(), 'application/octet-stream')
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        # les requêtes ne sont pas journalisées une par une, voir /metrics
+        pass
+
+
+def _encode_json_sequence(chain: str, sequence) -> np.ndarray:
+    """
+    Valide et encode la séquence d'une chaîne reçue en JSON: une chaîne de codes à une lettre ou une liste de codes à
+    trois lettres. Lève RequestError (400) pour tout autre type ou pour un code inconnu.
+    """
+    if isinstance(sequence, str):
+        unknown = sorted(set(sequence.upper()) - set(ONE_LETTER))
+    elif isinstance(sequence, list) and all(isinstance(residue, str) for residue in sequence):
+        unknown = sorted(set(sequence) - RESIDUE_CODES.keys())
+    else:
+        raise RequestError(400, f"Sequence of chain '{chain}' must be a string or a list of strings")
+    if unknown:
+        raise RequestError(400, f"Unknown residue code '{unknown[0]}' in chain '{chain}'")
+    return encode_one_letter(sequence) if isinstance(sequence, str) else encode(sequence)
+
+
+def _chain_to_dict(result: ChainProfile) -> dict:
+    """
+    Retourne le profil et les pics d'une chaîne sous la forme utilisée par le format jsonl du mode batch.
+    """
+    return {
+        'chain': result.chain,
+        'first_position': result.first_position,
+        'scores': result.scores.tolist(),
+        'picks': [
+            {'start': pick.start, 'end': pick.start + pick.length, 'length': pick.length,
+             'minimum': pick.minimum, 'maximum': pick.maximum}
+            for pick in result.picks
+        ]
+    }
+
+
+def main(argv: list = None) -> int:
+    """
+    Point d'entrée du service.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1', help="adresse d'écoute (défaut: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8765, help="port d'écoute (défaut: 8765)")
+    parser.add_argument('--workers', type=int, default=2, help="nombre de threads de calcul (défaut: 2)")
+    parser.add_argument('--batch-window', type=float, default=5,
+                        help="durée maximale de constitution d'un lot en millisecondes (défaut: 5)")
+    parser.add_argument('--max-batch', type=int, default=64, help="nombre maximal de séquences par lot (défaut: 64)")
+    args = parser.parse_args(argv)
+
+    # charge et valide les modèles avant la première requête
+    HydrophobicityProfile.get_models_names()
+
+    batcher = ProfileBatcher(args.workers, args.batch_window / 1000, args.max_batch)
+    server = ProfileServer((args.host, args.port), batcher)
+    print(f"Serving hydrophobicity profiles on http://{args.host}:{server.server_port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
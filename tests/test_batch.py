@@ -0,0 +1,29 @@
+import glob
+
+import pytest
+
+from benchmarks.synthetic import write_pdb
+from scripts.batch import main
+
+
+@pytest.mark.parametrize('model', ['Nope', '99'])
+def test_unknown_model_is_rejected_before_writing(tmp_path, capsys, model):
+    path = str(tmp_path / "e0.pdb")
+    write_pdb(path, chains=1, chain_length=20, atoms_per_residue=1)
+    output = str(tmp_path / "out")
+
+    with pytest.raises(SystemExit) as exit_info:
+        main([path, '-o', output, '--model', model, '--no-cache'])
+    assert exit_info.value.code == 2
+    assert f"unknown --model '{model}'" in capsys.readouterr().err
+    assert glob.glob(f"{output}*") == []
+
+
+def test_valid_model_writes_profiles(tmp_path):
+    path = str(tmp_path / "e0.pdb")
+    write_pdb(path, chains=2, chain_length=20, atoms_per_residue=1)
+    output = str(tmp_path / "out")
+
+    assert main([path, '-o', output, '--model', '0', '--no-cache', '-j', '1']) == 0
+    with open(f"{output}_profiles.csv") as f:
+        assert len(f.readlines()) > 1
@@ -0,0 +1,31 @@
+import numpy as np
+
+from benchmarks.synthetic import write_pdb
+from scripts.cache import ResultCache
+from scripts.pdb import PDBFile
+from scripts.profile_generation import HydrophobicityProfile, encode_sequence
+
+
+def test_shared_profiles_are_stored_once(tmp_path):
+    pdb_path = str(tmp_path / "homodimer.pdb")
+    write_pdb(pdb_path, chains=3, chain_length=60, atoms_per_residue=1, distinct=2)
+    pdb_file = PDBFile(pdb_path, sequence_only=True)
+    shared = HydrophobicityProfile(encode_sequence(pdb_file.seqres['A']), 0, 4, 1.0)
+    other = HydrophobicityProfile(encode_sequence(pdb_file.seqres['B']), 0, 4, 1.0)
+
+    cache = ResultCache(str(tmp_path / "cache"))
+    file_hash = cache.hash_file(pdb_path)
+    cache.put(file_hash, 0, 4, 1.0, pdb_file, {'A': shared, 'B': other, 'C': shared})
+
+    entry_path = cache._entry_path(file_hash, 0, 4, 1.0)
+    with np.load(entry_path) as data:
+        assert sorted(name for name in data.files if name.startswith('scores_')) == ['scores_0', 'scores_1']
+
+    _, profiles = cache.get(file_hash, 0, 4, 1.0)
+    assert list(profiles) == ['A', 'B', 'C']
+    assert profiles['A'] is profiles['C']
+    assert profiles['A'] is not profiles['B']
+    np.testing.assert_array_equal(profiles['C'].scores, shared.scores)
+    np.testing.assert_array_equal(profiles['B'].scores, other.scores)
+    assert [(pick.start, pick.length) for pick in profiles['A'].picks] == [
+        (pick.start, pick.length) for pick in shared.picks]
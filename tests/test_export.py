@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from scripts.export import BinaryExport, BinaryWriter
+from scripts.parallel import ChainProfile
+from scripts.profile_generation import HydrophobicityProfile
+
+
+def make_profile(length: int, frame_size: int, seed: int) -> HydrophobicityProfile:
+    scores = np.random.default_rng(seed).normal(0.3, 1, length)
+    picks = [(frame_size + 2, 11, 0.5, 2.5), (frame_size + 20, 12, 0.6, 1.5)] if seed % 2 == 0 else []
+    return HydrophobicityProfile.from_arrays(scores, frame_size, length + 2 * frame_size, float(scores.min()),
+                                             float(scores.max()), picks)
+
+
+def test_round_trip(tmp_path):
+    output = str(tmp_path / "export")
+    chains = [("1ABC", "A", make_profile(50, 4, 0)), ("1ABC", "B", make_profile(30, 4, 1)),
+              ("2XYZ", "A", make_profile(80, 7, 2)), ("1ABC", "A", make_profile(10, 4, 3))]
+    writer = BinaryWriter(output)
+    for entry, chain, profile in chains:
+        writer.write(entry, chain, ChainProfile(f"{entry}.pdb", entry, chain, profile))
+    writer.close()
+
+    export = BinaryExport(output)
+    assert len(export) == 4
+    assert isinstance(export.scores, np.memmap) and isinstance(export.picks, np.memmap)
+    assert export.chains['entry'] == ["1ABC", "1ABC", "2XYZ", "1ABC"]
+    assert export.chains['first_position'] == [4, 4, 7, 4]
+    assert len(export.scores) == 170 and len(export.picks) == 4
+
+    # une chaîne exportée deux fois est retrouvée à sa première occurrence
+    for entry, chain, profile in chains[:3]:
+        np.testing.assert_array_equal(export.chain_scores(entry, chain), profile.scores)
+        picks = export.chain_picks(entry, chain)
+        assert picks['start'].tolist() == [pick.start for pick in profile.picks]
+        assert (picks['end'] - picks['start']).tolist() == picks['length'].tolist()
+        assert picks['length'].tolist() == [pick.length for pick in profile.picks]
+        assert picks['minimum'].tolist() == [pick.minimum for pick in profile.picks]
+        assert picks['maximum'].tolist() == [pick.maximum for pick in profile.picks]
+    with pytest.raises(KeyError):
+        export.row("2XYZ", "B")
+
+
+def test_empty_export(tmp_path):
+    output = str(tmp_path / "empty")
+    BinaryWriter(output).close()
+    export = BinaryExport(output)
+    assert len(export) == 0
+    assert export.scores.shape == (0,) and export.picks.shape == (0,)
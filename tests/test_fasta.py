@@ -0,0 +1,51 @@
+import functools
+import gzip
+import io
+
+import pytest
+
+from scripts import fasta
+from scripts.fasta import iter_fasta
+from scripts.pdb import read_lines
+
+FASTA = (
+    "preamble ignored\n"
+    ">sp|P69905|HBA_HUMAN Hemoglobin subunit alpha\n"
+    "MVLSPADKTNVKAAWGKVGAHAGEYGAEALERMFLSFPTTKTYFPHF\n"
+    "; comment\n"
+    "DLSHGSAQVKGHGKKVADALTNAVAHVDDMPNALSALSDLHAHKL*\n"
+    ">empty\n"
+    ">\n"
+    "mkuobzxj\n"
+    ">last no final newline\n"
+    "ACDEFGHIKL"
+)
+
+EXPECTED = [
+    ("sp|P69905|HBA_HUMAN", "MVLSPADKTNVKAAWGKVGAHAGEYGAEALERMFLSFPTTKTYFPHF"
+                            "DLSHGSAQVKGHGKKVADALTNAVAHVDDMPNALSALSDLHAHKL"),
+    ("empty", ""),
+    ("", "MKUOBZXX"),
+    ("last", "ACDEFGHIKL"),
+]
+
+
+def parse(source) -> list:
+    return [(identifier, sequence.one_letter()) for identifier, sequence in iter_fasta(source)]
+
+
+def test_records(tmp_path):
+    path = tmp_path / "sequences.fasta"
+    path.write_text(FASTA)
+    assert parse(str(path)) == EXPECTED
+
+
+@pytest.mark.parametrize('block_size', [1, 2, 3, 7, 16, 64])
+def test_records_split_across_blocks(monkeypatch, block_size):
+    monkeypatch.setattr(fasta, 'read_lines', functools.partial(read_lines, block_size=block_size,
+                                                               first_block_size=block_size))
+    assert parse(io.StringIO(FASTA)) == EXPECTED
+
+
+def test_gzip_stream():
+    assert parse(io.BytesIO(gzip.compress(FASTA.encode()))) == EXPECTED
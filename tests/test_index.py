@@ -0,0 +1,46 @@
+import os
+
+from benchmarks.synthetic import write_pdb
+from scripts.batch import iter_pdb_paths
+from scripts.index import MirrorIndex
+
+
+def write_mirror(root) -> list:
+    mirror = root / "mirror"
+    mirror.mkdir()
+    for name in ("e0", "e1", "e2"):
+        write_pdb(str(mirror / f"{name}.pdb"), chains=1, chain_length=20, atoms_per_residue=1)
+    return sorted(str(mirror / f"{name}.pdb") for name in ("e0", "e1", "e2"))
+
+
+def test_relative_paths_are_stored_as_absolute(tmp_path, monkeypatch):
+    expected = write_mirror(tmp_path)
+    index = MirrorIndex(str(tmp_path / "index.sqlite"))
+
+    monkeypatch.chdir(tmp_path)
+    stats = index.update(iter_pdb_paths(["mirror"]), workers=1)
+    assert (stats['indexed'], stats['removed']) == (3, 0)
+    assert index.select() == expected
+
+    # mise à jour depuis un autre répertoire, puis avec des chemins absolus: rien n'est retiré ni dupliqué
+    other = tmp_path / "other"
+    other.mkdir()
+    monkeypatch.chdir(other)
+    stats = index.update(iter_pdb_paths([str(tmp_path / "mirror")]), workers=1)
+    assert stats == {'indexed': 0, 'unchanged': 3, 'removed': 0, 'errors': 0}
+    stats = index.update([], workers=1)
+    assert stats['removed'] == 0
+    assert index.select() == expected
+    assert all(os.path.isabs(path) for path in index.select())
+
+
+def test_deleted_files_are_removed(tmp_path, monkeypatch):
+    expected = write_mirror(tmp_path)
+    index = MirrorIndex(str(tmp_path / "index.sqlite"))
+    monkeypatch.chdir(tmp_path)
+    index.update(iter_pdb_paths(["mirror"]), workers=1)
+
+    os.remove(expected[0])
+    monkeypatch.chdir(tmp_path / "mirror")
+    assert index.update([], workers=1)['removed'] == 1
+    assert index.select() == expected[1:]
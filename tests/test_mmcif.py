@@ -0,0 +1,84 @@
+import functools
+import io
+
+import pytest
+
+from benchmarks.streaming_readers import write_mmcif
+from scripts import mmcif
+from scripts.mmcif import iter_mmcif
+from scripts.pdb import read_lines
+
+MMCIF = """data_1ABC
+# commentaire
+_entry.id 1ABC
+_struct.title
+;Text field with loop_ and data_FAKE
+_atom_site.id 'quoted' # not a comment
+;
+#
+loop_
+_entity_poly.entity_id
+_entity_poly.type
+_entity_poly.pdbx_strand_id
+1 'polypeptide(L)' A,C
+2 "polypeptide(L)" B
+#
+loop_
+_entity_poly_seq.entity_id
+_entity_poly_seq.num
+_entity_poly_seq.mon_id
+_entity_poly_seq.hetero
+1 1 MET n
+1 2 ALA y
+1 2 GLY y
+1 3 MSE n
+2 1 TRP n
+2 2 UNK n
+#
+loop_
+_atom_site.group_PDB
+_atom_site.id
+ATOM 1
+ATOM 2
+#
+data_2XYZ
+loop_
+_pdbx_poly_seq_scheme.asym_id
+_pdbx_poly_seq_scheme.seq_id
+_pdbx_poly_seq_scheme.mon_id
+_pdbx_poly_seq_scheme.pdb_strand_id
+A 1 LYS X
+A 2 LEU X
+"""
+
+EXPECTED = [("1ABC", "A", "MAM"), ("1ABC", "C", "MAM"), ("1ABC", "B", "WX")]
+
+
+def parse(source, all_blocks: bool = False) -> list:
+    return [(entry, chain, sequence.one_letter()) for entry, chain, sequence in iter_mmcif(source, all_blocks)]
+
+
+def test_first_block():
+    assert parse(io.StringIO(MMCIF)) == EXPECTED
+
+
+def test_all_blocks():
+    assert parse(io.StringIO(MMCIF), all_blocks=True) == EXPECTED + [("2XYZ", "X", "KL")]
+
+
+@pytest.mark.parametrize('block_size', [1, 2, 5, 13, 64])
+def test_split_across_blocks(monkeypatch, block_size):
+    monkeypatch.setattr(mmcif, 'read_lines', functools.partial(read_lines, block_size=block_size,
+                                                               first_block_size=block_size))
+    assert parse(io.StringIO(MMCIF), all_blocks=True) == EXPECTED + [("2XYZ", "X", "KL")]
+
+
+def test_synthetic_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "synthetic.cif")
+    write_mmcif(path, chains=3, chain_length=200, atoms_per_residue=2)
+    expected = parse(path)
+    assert [(entry, chain, len(sequence)) for entry, chain, sequence in expected] == [
+        ("9SYN", "A", 200), ("9SYN", "B", 200), ("9SYN", "C", 200)]
+
+    monkeypatch.setattr(mmcif, 'read_lines', functools.partial(read_lines, block_size=97, first_block_size=11))
+    assert parse(path) == expected
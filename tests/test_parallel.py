@@ -0,0 +1,69 @@
+import os
+import tarfile
+
+from benchmarks.streaming_readers import write_mmcif
+from benchmarks.synthetic import write_pdb
+from scripts.cache import ResultCache
+from scripts.parallel import profile_files
+
+
+def _write_archive(path: str, members: list) -> None:
+    with tarfile.open(path, 'w:gz') as archive:
+        for member in members:
+            archive.add(member, arcname=os.path.basename(member))
+
+
+def test_cold_cache_counts_only_cacheable_files_as_misses(tmp_path):
+    pdb_path = str(tmp_path / "plain.pdb")
+    member_path = str(tmp_path / "member.pdb")
+    archive_path = str(tmp_path / "archive.tar.gz")
+    write_pdb(pdb_path, chains=2, chain_length=60, atoms_per_residue=1, seed=1)
+    write_pdb(member_path, chains=2, chain_length=60, atoms_per_residue=1, seed=2)
+    _write_archive(archive_path, [member_path])
+
+    cache = ResultCache(str(tmp_path / "cache"))
+    results = list(profile_files([pdb_path, archive_path], 0, 4, 1.0, workers=1, cache=cache))
+
+    assert all(result.error is None for result in results)
+    assert len(results) == 4
+    # le fichier PDB est absent du cache, le membre de l'archive n'est pas concerné par le cache
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_warm_cache_counts_hits(tmp_path):
+    pdb_path = str(tmp_path / "plain.pdb")
+    archive_path = str(tmp_path / "archive.tar.gz")
+    write_pdb(pdb_path, chains=2, chain_length=60, atoms_per_residue=1, seed=1)
+    _write_archive(archive_path, [pdb_path])
+    list(profile_files([pdb_path], 0, 4, 1.0, workers=1, cache=ResultCache(str(tmp_path / "cache"))))
+
+    cache = ResultCache(str(tmp_path / "cache"))
+    list(profile_files([pdb_path, archive_path], 0, 4, 1.0, workers=1, cache=cache))
+
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_mmcif_files_are_neither_hits_nor_misses(tmp_path):
+    cif_path = str(tmp_path / "entry.cif")
+    write_mmcif(cif_path, chains=2, chain_length=60, atoms_per_residue=1)
+
+    for _ in range(2):
+        cache = ResultCache(str(tmp_path / "cache"))
+        results = list(profile_files([cif_path], 0, 4, 1.0, workers=1, cache=cache))
+        assert [(result.entry, result.chain, result.error) for result in results] == [
+            ("9SYN", "A", None), ("9SYN", "B", None)]
+        assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_identical_chains_are_returned_in_file_order(tmp_path):
+    # A et C ont la même séquence, B une autre
+    pdb_path = str(tmp_path / "homodimer.pdb")
+    archive_path = str(tmp_path / "archive.tar")
+    write_pdb(pdb_path, chains=3, chain_length=60, atoms_per_residue=1, distinct=2)
+    _write_archive(archive_path, [pdb_path])
+
+    for workers in (1, 2):
+        results = list(profile_files([pdb_path, archive_path], 0, 4, 1.0, workers=workers, chunksize=1))
+        assert [(os.path.basename(result.path), result.chain) for result in results] == [
+            ("homodimer.pdb", "A"), ("homodimer.pdb", "B"), ("homodimer.pdb", "C")] * 2
+        assert results[0].profile is results[2].profile
@@ -0,0 +1,128 @@
+import functools
+import gc
+import gzip
+import io
+import threading
+
+import pytest
+
+from benchmarks.synthetic import write_pdb
+from scripts.fasta import iter_fasta
+from scripts import pdb
+from scripts.pdb import PDBFile, read_lines
+
+
+def _synthetic_lines(tmp_path) -> list:
+    path = str(tmp_path / "synthetic.pdb")
+    write_pdb(path, chains=2, chain_length=30, atoms_per_residue=2)
+    with open(path) as f:
+        return f.read().splitlines(keepends=True)
+
+
+def test_file_without_end_record(tmp_path):
+    path = tmp_path / "no_end.pdb"
+    lines = _synthetic_lines(tmp_path)
+    assert lines.pop() == "END\n"
+    path.write_text("".join(lines))
+
+    results = []
+    for source in (str(path), io.BytesIO(path.read_bytes())):
+        # la lecture se terminait auparavant par une boucle sans fin
+        thread = threading.Thread(target=lambda: results.append(PDBFile(source)), daemon=True)
+        thread.start()
+        thread.join(10)
+        assert not thread.is_alive()
+    assert [list(pdb_file.seqres) for pdb_file in results] == [['A', 'B'], ['A', 'B']]
+
+
+@pytest.mark.parametrize('record', ["MODEL        1", "ATOM  ", "HETATM"])
+def test_sequence_only_stops_at_first_coordinate_record(tmp_path, record):
+    lines = _synthetic_lines(tmp_path)
+    first_atom = next(i for i, line in enumerate(lines) if line.startswith("ATOM"))
+    if record != "ATOM  ":
+        lines.insert(first_atom, f"{record:<80}\n")
+    # un SEQRES placé après les coordonnées n'est lu qu'en lecture complète
+    lines.insert(-1, f"{'SEQRES   1 Z    2  ALA GLY':<80}\n")
+    path = tmp_path / "records.pdb"
+    path.write_text("".join(lines))
+
+    assert list(PDBFile(str(path), sequence_only=True).seqres) == ['A', 'B']
+    assert list(PDBFile(str(path)).seqres) == ['A', 'B', 'Z']
+
+
+@pytest.mark.parametrize('first_block_size, block_size', [(1, 1), (7, 7), (5, 64), (79, 200)])
+def test_read_lines_across_block_boundaries(first_block_size, block_size):
+    text = "".join(f"LINE {i:>4}{'x' * (i % 97)}\n" for i in range(300)) + "LAST WITHOUT NEWLINE"
+    lines = list(read_lines(io.StringIO(text), block_size=block_size, first_block_size=first_block_size))
+    assert lines == text.split("\n")
+
+
+def test_parse_with_small_blocks(tmp_path, monkeypatch):
+    path = str(tmp_path / "synthetic.pdb")
+    write_pdb(path, chains=3, chain_length=50, atoms_per_residue=1)
+    expected = PDBFile(path).to_dict()
+
+    monkeypatch.setattr(pdb, 'read_lines', functools.partial(read_lines, block_size=97, first_block_size=3))
+    assert PDBFile(path).to_dict() == expected
+    assert PDBFile(path, sequence_only=True).to_dict() == expected
+
+
+def _count_decodes(monkeypatch) -> list:
+    records = []
+    decode = PDBFile._decode
+
+    def counting_decode(self, record, handler):
+        records.append(record)
+        decode(self, record, handler)
+
+    monkeypatch.setattr(PDBFile, '_decode', counting_decode)
+    return records
+
+
+def test_memory_map_decodes_missing_header_once(tmp_path, monkeypatch):
+    path = tmp_path / "headerless.pdb"
+    write_pdb(str(path), chains=1, chain_length=20, atoms_per_residue=1)
+    path.write_text("".join(line for line in path.read_text().splitlines(keepends=True)
+                            if not line.startswith("HEADER")))
+    records = _count_decodes(monkeypatch)
+
+    pdb_file = PDBFile(str(path), memory_map=True)
+    assert pdb_file.header is None
+    assert pdb_file.header is None
+    assert records == ["HEADER"]
+
+
+def test_memory_map_header_matches_full_parse(tmp_path):
+    path = str(tmp_path / "synthetic.pdb")
+    write_pdb(path, chains=2, chain_length=20, atoms_per_residue=1)
+
+    assert vars(PDBFile(path, memory_map=True).header) == vars(PDBFile(path).header)
+    assert PDBFile(path).header.id == "9XYZ"
+
+
+@pytest.mark.parametrize('compress', [False, True])
+@pytest.mark.parametrize('stream_type', [io.BytesIO, io.FileIO, io.BufferedReader])
+def test_caller_streams_are_not_closed(tmp_path, compress, stream_type):
+    path = tmp_path / "synthetic.pdb"
+    write_pdb(str(path), chains=2, chain_length=20, atoms_per_residue=1)
+    data = path.read_bytes()
+    path.write_bytes(gzip.compress(data) if compress else data)
+
+    def open_stream():
+        if stream_type is io.BytesIO:
+            return io.BytesIO(path.read_bytes())
+        raw = io.FileIO(str(path))
+        return raw if stream_type is io.FileIO else io.BufferedReader(raw)
+
+    stream = open_stream()
+    pdb_file = PDBFile(stream)
+    gc.collect()
+    assert not stream.closed
+    assert list(pdb_file.seqres) == ['A', 'B']
+    stream.close()
+
+    stream = open_stream()
+    assert list(iter_fasta(stream)) == []
+    gc.collect()
+    assert not stream.closed
+    stream.close()
@@ -0,0 +1,154 @@
+import json
+
+import numpy as np
+import pytest
+
+from scripts.profile_generation import HydrophobicityProfile, Pick, detect_segments
+from scripts.residues import AMINO_ACIDS
+
+with open('data/models.json') as f:
+    MODELS = json.load(f)
+
+
+def baseline_scores(sequence: list, model: dict, frame_size: int, edge_proportion: float) -> list:
+    # boucle de calcul des fenêtres remplacée par compute_window_scores
+    hydrophobicity_values = [model[amino_acid] for amino_acid in sequence]
+    scores = []
+    for i in range(frame_size, len(hydrophobicity_values) - frame_size):
+        frame = hydrophobicity_values[i - frame_size:i + frame_size + 1]
+        for j in range(len(frame)):
+            frame[j] = frame[j] * (1 / frame_size * -(abs(j - frame_size) * (1 - edge_proportion)) + 1)
+        scores.append(sum(frame) / len(frame))
+    return scores
+
+
+def baseline_picks(scores, first_position: int) -> list:
+    # boucle de détection des pics remplacée par detect_segments
+    picks = []
+    previous_value = 0
+    for i, value in enumerate(scores.tolist(), start=first_position):
+        if value >= 0.5:
+            if previous_value < 0.5:
+                picks.append(Pick(i))
+            picks[-1].add(value)
+        else:
+            if previous_value > 0.5:
+                if picks[-1].length < 10:
+                    picks.pop()
+        previous_value = value
+    return [(pick.start, pick.length, pick.minimum, pick.maximum) for pick in picks]
+
+
+@pytest.mark.parametrize('frame_size, edge_proportion', [(1, 1.0), (4, 1.0), (4, 0.3), (7, 0.0), (12, 0.65)])
+@pytest.mark.parametrize('length', [300, 25, 8])
+def test_scores_match_baseline_loop(frame_size, edge_proportion, length):
+    rng = np.random.default_rng(length * 100 + frame_size)
+    sequence = [AMINO_ACIDS[code] for code in rng.integers(0, len(AMINO_ACIDS), length)]
+    for model_id, model in enumerate(MODELS):
+        profile = HydrophobicityProfile(sequence, model_id, frame_size, edge_proportion)
+        expected = baseline_scores(sequence, model, frame_size, edge_proportion)
+        np.testing.assert_allclose(profile.scores, expected, rtol=1e-12, atol=1e-12)
+        assert profile.positions.tolist() == list(range(frame_size, len(sequence) - frame_size))
+        values = [model[amino_acid] for amino_acid in sequence]
+        assert (profile.abscissa_axe.min_value, profile.abscissa_axe.max_value) == (frame_size, length - frame_size)
+        assert (profile.ordinate_axe.min_value, profile.ordinate_axe.max_value) == (min(values), max(values))
+
+
+def segment_rows(scores, first_position: int) -> list:
+    return detect_segments(scores, first_position=first_position).rows()
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_matches_baseline_loop(seed):
+    rng = np.random.default_rng(seed)
+    # profil lissé (runs de longueurs variées) terminé sous le seuil, sans valeur égale à 0.5
+    scores = np.convolve(rng.normal(0.3, 1, 2000), np.ones(9) / 9, mode='same')
+    scores[-1] = 0
+    scores[scores == 0.5] = 0.49
+    assert segment_rows(scores, 4) == baseline_picks(scores, 4)
+
+
+def test_to_picks_matches_rows():
+    scores = np.r_[np.zeros(3), np.linspace(0.6, 1.8, 12), np.zeros(2)]
+    segments = detect_segments(scores, first_position=4)
+    assert [(pick.start, pick.length, pick.minimum, pick.maximum) for pick in segments.to_picks()] == segments.rows()
+    assert segments.rows() == [(7, 11, 0.6, 1.8)]
+    assert segments.end.tolist() == [18]
+
+
+def test_short_trailing_run_is_dropped():
+    # divergence documentée: la boucle gardait un pic trop court atteignant la fin du profil
+    scores = np.r_[np.zeros(5), np.ones(4)]
+    assert baseline_picks(scores, 0) == [(5, 3, 1.0, 1.0)]
+    assert segment_rows(scores, 0) == []
+
+
+def test_short_run_ending_at_threshold_is_dropped():
+    # divergence documentée: un pic trop court dont la dernière valeur vaut exactement 0.5 n'était pas supprimé
+    scores = np.r_[np.zeros(2), np.ones(3), 0.5, np.zeros(2)]
+    assert baseline_picks(scores, 0) == [(2, 3, 0.5, 1.0)]
+    assert segment_rows(scores, 0) == []
+
+
+def test_nan_is_not_part_of_a_segment():
+    scores = np.r_[np.ones(12), np.nan, np.ones(12), 0]
+    assert [(start, length) for start, length, _, _ in segment_rows(scores, 0)] == [(0, 11), (13, 11)]
+
+
+def random_sequence(length: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    return [AMINO_ACIDS[code] for code in rng.integers(0, len(AMINO_ACIDS), length)]
+
+
+@pytest.mark.parametrize('length', [200, 9, 3])
+def test_sweep_matches_profiles(length):
+    sequence = random_sequence(length, length)
+    frame_sizes, edge_proportions = (1, 4, 7), (0.0, 0.4, 1.0)
+    sweep = HydrophobicityProfile.sweep(sequence, frame_sizes=frame_sizes, edge_proportions=edge_proportions)
+    assert sweep.scores.shape == (len(MODELS), 3, 3, length)
+    for model_id in range(len(MODELS)):
+        for frame_size in frame_sizes:
+            for edge_proportion in edge_proportions:
+                profile = HydrophobicityProfile(sequence, model_id, frame_size, edge_proportion)
+                positions, scores = sweep.get(model_id, frame_size, edge_proportion)
+                np.testing.assert_array_equal(positions, profile.positions)
+                np.testing.assert_allclose(scores, profile.scores, rtol=1e-12, atol=1e-12)
+
+
+def test_sweep_by_model_name():
+    sequence = random_sequence(60)
+    name = MODELS[1]['name']
+    sweep = HydrophobicityProfile.sweep(sequence, models=[name], frame_sizes=(4,), edge_proportions=(1.0,))
+    np.testing.assert_allclose(sweep.get(name, 4, 1.0)[1], HydrophobicityProfile(sequence, 1, 4, 1.0).scores)
+
+
+def assert_same_picks(profile: HydrophobicityProfile, expected: HydrophobicityProfile) -> None:
+    assert [(pick.start, pick.length) for pick in profile.picks] == [(pick.start, pick.length)
+                                                                     for pick in expected.picks]
+    np.testing.assert_allclose([(pick.minimum, pick.maximum) for pick in profile.picks],
+                               [(pick.minimum, pick.maximum) for pick in expected.picks], rtol=1e-12)
+
+
+@pytest.mark.parametrize('length, frame_size, edge_proportion', [(400, 4, 1.0), (400, 9, 0.25), (12, 4, 0.5),
+                                                                  (5, 4, 1.0)])
+def test_multi_scale_matches_profiles(length, frame_size, edge_proportion):
+    # séquence hydrophobe au milieu pour que chaque échelle ait des pics
+    sequence = random_sequence(length // 2, length) + ['LEU', 'ILE', 'VAL', 'PHE'] * (length // 16) + \
+        random_sequence(length - length // 2 - 4 * (length // 16), length + 1)
+    multi_scale = HydrophobicityProfile.multi_scale(sequence, frame_size, edge_proportion)
+    assert multi_scale.scores.shape == (len(MODELS), max(length - 2 * frame_size, 0))
+    for model_id in range(len(MODELS)):
+        expected = HydrophobicityProfile(sequence, model_id, frame_size, edge_proportion)
+        profile = multi_scale.profile(model_id)
+        np.testing.assert_array_equal(profile.positions, expected.positions)
+        np.testing.assert_allclose(profile.scores, expected.scores, rtol=1e-12, atol=1e-12)
+        assert vars(profile.abscissa_axe) == vars(expected.abscissa_axe)
+        assert vars(profile.ordinate_axe) == vars(expected.ordinate_axe)
+        assert_same_picks(profile, expected)
+
+
+def test_multi_scale_has_picks():
+    sequence = random_sequence(100) + ['LEU', 'ILE', 'VAL', 'PHE'] * 10 + random_sequence(100, 1)
+    multi_scale = HydrophobicityProfile.multi_scale(sequence, 4, 1.0, models=[0])
+    assert_same_picks(multi_scale.profile(0), HydrophobicityProfile(sequence, 0, 4, 1.0))
+    assert len(multi_scale.profile(0).picks) > 0
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from scripts.residues import (AMINO_ACIDS, ONE_LETTER, RESIDUE_CODES, RESIDUES, STANDARD_EQUIVALENTS, UNKNOWN_CODE,
+                              EncodedSequence, encode, encode_one_letter, extend_table)
+
+NON_STANDARD = ['MSE', 'SEC', 'PYL', 'ASX', 'GLX', 'UNK']
+
+
+def test_three_letter_round_trip():
+    residues = list(RESIDUES) + NON_STANDARD + ['ALA']
+    sequence = EncodedSequence.from_residues(residues)
+    assert sequence.three_letter() == residues
+    assert list(sequence) == residues
+    assert sequence == residues
+    assert sequence.one_letter() == ONE_LETTER + "MUOBZX" + "A"
+
+
+@pytest.mark.parametrize('residue, letter', list(zip(NON_STANDARD, "MUOBZX")))
+def test_non_standard_residues(residue, letter):
+    codes = encode([residue])
+    assert codes.tolist() == [RESIDUE_CODES[residue]]
+    assert EncodedSequence(codes).one_letter() == letter
+    assert EncodedSequence(codes)[0] == residue
+
+
+def test_one_letter_round_trip_keeps_first_residue_of_each_letter():
+    # M et X désignent d'abord MET et UNK: MSE devient MET, les autres codes non standards sont conservés
+    sequence = EncodedSequence(encode_one_letter("arndcqeghilkmfpstwyvUOBZX"))
+    assert sequence.three_letter() == list(AMINO_ACIDS) + ['SEC', 'PYL', 'ASX', 'GLX', 'UNK']
+    assert EncodedSequence(encode_one_letter(sequence.one_letter())) == sequence
+
+
+def test_unknown_codes_are_encoded_as_unk():
+    assert encode(['XYZ', 'ALA']).tolist() == [UNKNOWN_CODE, RESIDUE_CODES['ALA']]
+    assert encode_one_letter("J*é").tolist() == [UNKNOWN_CODE] * 3
+
+
+def test_extend_table_averages_standard_equivalents():
+    table = np.arange(len(AMINO_ACIDS), dtype=np.float64)
+    extended = extend_table(table)
+    for residue, equivalents in STANDARD_EQUIVALENTS.items():
+        assert extended[RESIDUE_CODES[residue]] == np.mean([table[AMINO_ACIDS.index(name)] for name in equivalents])
@@ -0,0 +1,119 @@
+import http.client
+import io
+import json
+import threading
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import write_pdb
+from scripts.service import MAX_BODY_BYTES, ProfileBatcher, ProfileServer
+
+
+@pytest.fixture(scope='module')
+def server():
+    server = ProfileServer(('127.0.0.1', 0), ProfileBatcher(workers=1, batch_window=0))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(server, method: str, path: str, body: bytes = None, content_type: str = 'application/json',
+            headers: dict = None, raw: bool = False) -> tuple:
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_port, timeout=10)
+    try:
+        headers = {**({'Content-Type': content_type} if body is not None else {}), **(headers or {})}
+        connection.request(method, path, body=body, headers=headers)
+        response = connection.getresponse()
+        data = response.read()
+        return response.status, data if raw else json.loads(data)
+    finally:
+        connection.close()
+
+
+def post_sequences(server, sequences) -> tuple:
+    return request(server, 'POST', '/profile?window=2', json.dumps({'sequences': sequences}).encode())
+
+
+def test_valid_sequences(server):
+    status, body = post_sequences(server, {'A': "MKTAYIAKQRQISFVKSHFSRQ", 'B': ["ALA", "MSE", "GLY", "LEU", "UNK"]})
+    assert status == 200
+    assert [chain['chain'] for chain in body['chains']] == ['A', 'B']
+
+
+@pytest.mark.parametrize('sequence', [5, None, {'residues': "MKT"}, ["ALA", 3], [None]])
+def test_malformed_sequence_is_rejected(server, sequence):
+    status, body = post_sequences(server, {'A': sequence})
+    assert status == 400
+    assert "must be a string or a list of strings" in body['error']
+
+
+@pytest.mark.parametrize('sequence, code', [("MKTJAYIA", 'J'), ("MKT AYIA", ' '), (["ALA", "XYZ", "GLY"], 'XYZ')])
+def test_unknown_residue_code_is_rejected(server, sequence, code):
+    status, body = post_sequences(server, {'A': sequence})
+    assert status == 400
+    assert body['error'] == f"Unknown residue code '{code}' in chain 'A'"
+
+
+def test_get_endpoints(server):
+    status, body = request(server, 'GET', '/models')
+    assert status == 200 and body['models']
+    status, body = request(server, 'GET', '/metrics')
+    assert status == 200
+
+
+@pytest.mark.parametrize('method, path', [('GET', '/profile'), ('POST', '/unknown')])
+def test_unknown_path(server, method, path):
+    body = json.dumps({'sequences': {'A': "MKT"}}).encode() if method == 'POST' else None
+    status, body = request(server, method, path, body)
+    assert status == 404
+    assert body['error'] == f"Unknown path '{path}'"
+
+
+@pytest.mark.parametrize('query, message', [
+    ('window=0', "window must be greater than 0"),
+    ('window=abc', "Invalid parameter"),
+    ('edge=1.5', "edge must be between 0 and 1"),
+    ('model=999', "Invalid parameter"),
+])
+def test_invalid_parameters(server, query, message):
+    status, body = request(server, 'POST', f'/profile?{query}', json.dumps({'sequences': ["MKTAYIAKQR"]}).encode())
+    assert status == 400
+    assert message in body['error']
+
+
+@pytest.mark.parametrize('body, message', [
+    (b"not json", "JSON body must contain a 'sequences' object"),
+    (b'{"chains": {}}', "JSON body must contain a 'sequences' object"),
+    (b'{"sequences": "MKT"}', "'sequences' must be an object or a list"),
+    (b'{"sequences": {}}', "No sequence to profile"),
+    (b'{"sequences": {"A": ""}}', "Sequences must not be empty"),
+])
+def test_invalid_json_body(server, body, message):
+    status, response = request(server, 'POST', '/profile', body)
+    assert status == 400
+    assert response['error'] == message
+
+
+def test_body_too_large(server):
+    status, body = request(server, 'POST', '/profile', b"", headers={'Content-Length': str(MAX_BODY_BYTES + 1)})
+    assert status == 413
+
+
+def test_pdb_upload(server, tmp_path):
+    path = tmp_path / "upload.pdb"
+    write_pdb(str(path), chains=2, chain_length=40, atoms_per_residue=1)
+    status, body = request(server, 'POST', '/profile', path.read_bytes(), content_type='chemical/x-pdb')
+    assert status == 200
+    assert body['entry'] == "9XYZ"
+    assert [chain['chain'] for chain in body['chains']] == ['A', 'B']
+
+
+def test_npz_format(server):
+    status, data = request(server, 'POST', '/profile?format=npz&window=2',
+                           json.dumps({'sequences': {'A': "MKTAYIAKQRQ"}}).encode(), raw=True)
+    assert status == 200
+    with np.load(io.BytesIO(data)) as columns:
+        assert set(columns['profiles_chain'].tolist()) == {'A'}